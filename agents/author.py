@@ -1,5 +1,8 @@
+import asyncio
 import logging
+from collections.abc import Callable
 from datetime import datetime
+from functools import cache
 
 import anthropic
 
@@ -10,9 +13,16 @@ from models import (
     ResearchContext,
     PipelineTrace,
     CritiqueIssue,
+    StageMetrics,
 )
 from sources.research import research_event
-from utils import extract_tool_input
+from utils import (
+    cached_text,
+    create_message,
+    extract_tool_input,
+    get_anthropic_client,
+    stream_message,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +32,14 @@ LANGUAGE_NOTES = {
     "ru": "Пиши на русском. Живой, современный русский — не канцелярит, не переводческий язык. Тон как у лучших текстов Афиши или Сигмы. Можно использовать англицизмы там, где они органичны (сет, перформанс, саунд), но не злоупотреблять. НАПОМИНАНИЕ: имена людей, названия мест, клубов, галерей, альбомов, фильмов — ВСЕГДА латиницей как в оригинале. Никогда не транслитерируй. Пиши 'Ryoji Ikeda', а не 'Рёдзи Икэда'. Пиши 'Berghain', а не 'Бергхайн'.",
 }
 
+MIN_WORDS = 400
+
 FEW_SHOT_PLACEHOLDER = "No example essays provided yet. Examples will be added here to anchor the style. You are SYNTSCH — write with your own voice."
 
+TITLE_DESCRIPTION = "Essay title: short, punchy, same language as the essay. No quotes, no period at the end. Like a Dazed headline."
+
+LEAD_DESCRIPTION = "Lede for the card/preview of the final essay: 1-2 sentences, same language as the essay, capturing both the event and the mood of the essay. Specific and sharp, no generic praise, no exclamation marks. Proper nouns stay in Latin script."
+
 CRITIC_TOOL = {
     "name": "submit_critique",
     "description": "Submit the editorial critique and revised essay",
@@ -61,14 +77,31 @@ CRITIC_TOOL = {
             },
             "title": {
                 "type": "string",
-                "description": "Essay title: short, punchy, same language as the essay. No quotes, no period at the end. Like a Dazed headline.",
+                "description": TITLE_DESCRIPTION,
+            },
+            "lead": {
+                "type": "string",
+                "description": LEAD_DESCRIPTION,
             },
             "revised_text": {
                 "type": "string",
                 "description": "The full revised essay WITHOUT the title, complete and publishable",
             },
         },
-        "required": ["overall_assessment", "issues", "title", "revised_text"],
+        "required": ["overall_assessment", "issues", "title", "lead", "revised_text"],
+    },
+}
+
+HEADLINE_TOOL = {
+    "name": "submit_headline",
+    "description": "Submit the title and lede for the essay",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": TITLE_DESCRIPTION},
+            "lead": {"type": "string", "description": LEAD_DESCRIPTION},
+        },
+        "required": ["title", "lead"],
     },
 }
 
@@ -78,6 +111,7 @@ async def write_article(
     language: str | None = None,
     skip_research: bool = False,
     context: ResearchContext | None = None,
+    on_prefix_cached: Callable[[], None] | None = None,
 ) -> ArticleOutput:
     language = language or config.ARTICLE_LANGUAGE
 
@@ -87,10 +121,13 @@ async def write_article(
         else:
             context = await research_event(event)
 
-    system_prompt = _load_author_prompt(language)
-    user_message = _build_user_message(event, context)
+    system_prompt = [cached_text(_load_author_prompt())]
+    user_content = [
+        cached_text(_build_user_message(event, context)),
+        {"type": "text", "text": _build_language_instructions(language)},
+    ]
 
-    client = anthropic.Anthropic(max_retries=3)
+    client = get_anthropic_client()
 
     trace = PipelineTrace(
         research_sources_count=len(context.raw_sources),
@@ -98,46 +135,95 @@ async def write_article(
     )
 
     logger.info("Writing draft for '%s' [%s]", event.name, language)
-    draft_response = client.messages.create(
-        model=config.AUTHOR_MODEL,
-        max_tokens=4096,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_message}],
-    )
+    try:
+        draft_response, metrics = await stream_message(
+            client,
+            "draft",
+            on_first_token=on_prefix_cached,
+            model=config.AUTHOR_MODEL,
+            max_tokens=4096,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_content}],
+        )
+    finally:
+        if on_prefix_cached is not None:
+            on_prefix_cached()
+    _record_stage(trace, metrics)
     draft = draft_response.content[0].text
     trace.draft_text = draft
     trace.draft_word_count = len(draft.split())
 
+    # Expansion only depends on the draft, so a short draft starts it
+    # alongside the critic; it is cancelled once the streamed revision
+    # reaches the minimum length.
+    expansion = None
+    if trace.draft_word_count < MIN_WORDS:
+        logger.warning(
+            "Draft too short (%d words), expanding alongside the critic",
+            trace.draft_word_count,
+        )
+        expansion = asyncio.create_task(
+            _expand(client, system_prompt, user_content, draft, language)
+        )
+
+    counter = _StreamedWordCount("revised_text")
+
+    def on_critique_delta(chunk: str):
+        if expansion is None or expansion.done():
+            return
+        if counter.feed(chunk) >= MIN_WORDS:
+            logger.info("Revision reached %d words, cancelling expansion", MIN_WORDS)
+            expansion.cancel()
+
     logger.info("Sending to critic (draft: %d words)", trace.draft_word_count)
-    title, revised_text, critique_assessment, critique_issues = _critique_and_revise(
-        client, draft, event, context, language
-    )
+    try:
+        (
+            title,
+            lead,
+            revised_text,
+            critique_assessment,
+            critique_issues,
+        ) = await _critique_and_revise(
+            client, draft, event, context, trace, on_critique_delta
+        )
+    except BaseException:
+        if expansion is not None:
+            expansion.cancel()
+        raise
     trace.critique_assessment = critique_assessment
     trace.critique_issues = critique_issues
     trace.revised_text = revised_text
     trace.revision_changed = revised_text != draft
     word_count = len(revised_text.split())
 
-    if word_count < 400:
-        logger.warning("Essay too short (%d words), requesting expansion", word_count)
-        final_response = client.messages.create(
-            model=config.AUTHOR_MODEL,
-            max_tokens=4096,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_message},
-                {"role": "assistant", "content": draft},
-                {
-                    "role": "user",
-                    "content": "The essay is too short. Please expand it to 800-1200 words while maintaining the same voice and quality. Don't pad — add more depth, more context, more specific details.",
-                },
-            ],
-        )
+    if word_count < MIN_WORDS:
+        logger.warning("Essay too short (%d words), using expansion", word_count)
+        if expansion is None or expansion.cancelled():
+            expansion = asyncio.create_task(
+                _expand(client, system_prompt, user_content, draft, language)
+            )
+        final_response, metrics = await expansion
+        _record_stage(trace, metrics)
         revised_text = final_response.content[0].text
         word_count = len(revised_text.split())
         trace.expanded = True
+        lead = ""
+    elif expansion is not None:
+        expansion.cancel()
+        try:
+            final_response, metrics = await expansion
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning("Unneeded expansion failed, ignoring: %s", e)
+        else:
+            # It finished before it could be cancelled; its tokens were paid for.
+            metrics.stage = "expansion_discarded"
+            _record_stage(trace, metrics)
 
-    lead = _generate_lead(client, event, title, revised_text, language)
+    title, lead = await _finish_headline(
+        client, event, title, lead, revised_text, language, trace
+    )
 
     logger.info("Article complete: '%s' (%d words)", title, word_count)
 
@@ -154,18 +240,46 @@ async def write_article(
     )
 
 
-def _critique_and_revise(
-    client: anthropic.Anthropic,
+async def _expand(
+    client: anthropic.AsyncAnthropic,
+    system_prompt: list[dict],
+    user_content: list[dict],
+    draft: str,
+    language: str,
+):
+    return await stream_message(
+        client,
+        "expansion",
+        model=config.AUTHOR_MODEL,
+        max_tokens=4096,
+        system=system_prompt,
+        messages=[
+            {"role": "user", "content": user_content},
+            {"role": "assistant", "content": draft},
+            {
+                "role": "user",
+                "content": "The essay is too short. Please expand it to 800-1200 words while maintaining the same voice and quality. Don't pad — add more depth, more context, more specific details.",
+            },
+        ],
+    )
+
+
+async def _critique_and_revise(
+    client: anthropic.AsyncAnthropic,
     draft: str,
     event: EventCandidate,
     context: ResearchContext,
-    language: str,
-) -> tuple[str, str, str, list[CritiqueIssue]]:
-    critic_prompt = _load_critic_prompt()
+    trace: PipelineTrace,
+    on_delta: Callable[[str], None] | None = None,
+) -> tuple[str, str, str, str, list[CritiqueIssue]]:
+    critic_prompt = [cached_text(_load_critic_prompt())]
     critic_message = _build_critic_message(draft, event, context)
 
     try:
-        response = client.messages.create(
+        response, metrics = await stream_message(
+            client,
+            "critique",
+            on_delta=on_delta,
             model=config.CRITIC_MODEL,
             max_tokens=8192,
             system=critic_prompt,
@@ -174,6 +288,7 @@ def _critique_and_revise(
             messages=[{"role": "user", "content": critic_message}],
         )
 
+        _record_stage(trace, metrics)
         tool_input = extract_tool_input(response, "submit_critique")
 
         raw_issues = tool_input.get("issues", [])
@@ -195,37 +310,97 @@ def _critique_and_revise(
             critical_count,
         )
 
-        title = tool_input.get("title", "").strip().strip('"').strip("'")
+        title = _clean_title(tool_input.get("title", ""))
+        lead = tool_input.get("lead", "").strip()
         revised = tool_input["revised_text"]
 
         if len(revised) > 200:
-            if not title:
-                title = _generate_title(client, event, revised, language)
-            return title, revised, assessment, critique_issues
+            return title, lead, revised, assessment, critique_issues
 
         logger.warning(
             "Critic returned too-short revised_text (%d chars), using draft",
             len(revised),
         )
-        return (
-            _generate_title(client, event, draft, language),
-            draft,
-            assessment,
-            critique_issues,
-        )
+        return "", "", draft, assessment, critique_issues
 
     except Exception as e:
         logger.error("Critic failed: %s — using original draft", e)
-        return _generate_title(client, event, draft, language), draft, "", []
+        return "", "", draft, "", []
 
 
-def _build_critic_message(
-    draft: str, event: EventCandidate, context: ResearchContext
-) -> str:
+async def _finish_headline(
+    client: anthropic.AsyncAnthropic,
+    event: EventCandidate,
+    title: str,
+    lead: str,
+    body: str,
+    language: str,
+    trace: PipelineTrace,
+) -> tuple[str, str]:
+    if title and lead:
+        return title, lead
+    if title:
+        return title, await _generate_lead(client, event, title, body, language, trace)
+    return await _generate_headline(client, event, body, language, trace)
+
+
+class _StreamedWordCount:
+    def __init__(self, field: str):
+        self.marker = f'"{field}"'
+        self.pending = ""
+        self.started = False
+        self.finished = False
+        self.escaped = False
+        self.in_word = False
+        self.words = 0
+
+    def feed(self, chunk: str) -> int:
+        if self.finished:
+            return self.words
+        if not self.started:
+            self.pending += chunk
+            found = self.pending.find(self.marker)
+            if found < 0:
+                self.pending = self.pending[-len(self.marker) :]
+                return 0
+            quote = self.pending.find('"', found + len(self.marker))
+            if quote < 0:
+                self.pending = self.pending[found:]
+                return 0
+            chunk = self.pending[quote + 1 :]
+            self.pending = ""
+            self.started = True
+
+        # Count only the new chunk; a word split across chunks is counted once
+        # and the closing quote ends the field.
+        for char in chunk:
+            if self.escaped:
+                self.escaped = False
+                if char in "nrt":
+                    char = " "
+            elif char == "\\":
+                self.escaped = True
+                continue
+            elif char == '"':
+                self.finished = True
+                break
+            if char.isspace():
+                self.in_word = False
+            elif not self.in_word:
+                self.in_word = True
+                self.words += 1
+        return self.words
+
+
+def _record_stage(trace: PipelineTrace, metrics: StageMetrics):
+    trace.stages.append(metrics)
+    trace.cache_read_tokens += metrics.cache_read_tokens
+    trace.cache_write_tokens += metrics.cache_write_tokens
+
+
+def _build_critic_sources(event: EventCandidate, context: ResearchContext) -> str:
     parts = [
-        "## Essay draft to review\n",
-        draft,
-        "\n\n## Source material for fact-checking\n",
+        "## Source material for fact-checking\n",
         f"Event: {event.name}",
         f"Date: {event.start_date}",
         f"Venue: {event.venue}",
@@ -244,17 +419,29 @@ def _build_critic_message(
     return "\n".join(parts)
 
 
-def _generate_lead(
-    client: anthropic.Anthropic,
+def _build_critic_message(
+    draft: str, event: EventCandidate, context: ResearchContext
+) -> list[dict]:
+    return [
+        cached_text(_build_critic_sources(event, context)),
+        {"type": "text", "text": f"## Essay draft to review\n\n{draft}"},
+    ]
+
+
+async def _generate_lead(
+    client: anthropic.AsyncAnthropic,
     event: EventCandidate,
     title: str,
     body: str,
     language: str,
+    trace: PipelineTrace,
 ) -> str:
     lang_names = {"en": "English", "de": "German", "ru": "Russian"}
     lang_name = lang_names.get(language, "English")
 
-    response = client.messages.create(
+    response, metrics = await create_message(
+        client,
+        "lede",
         model=config.LEAD_MODEL,
         max_tokens=512,
         system=(
@@ -283,66 +470,80 @@ def _generate_lead(
             }
         ],
     )
+    _record_stage(trace, metrics)
     return response.content[0].text.strip()
 
 
-def _generate_title(
-    client: anthropic.Anthropic,
+async def _generate_headline(
+    client: anthropic.AsyncAnthropic,
     event: EventCandidate,
     body: str,
     language: str,
-) -> str:
+    trace: PipelineTrace,
+) -> tuple[str, str]:
     lang_names = {"en": "English", "de": "German", "ru": "Russian"}
     lang_name = lang_names.get(language, "English")
 
-    response = client.messages.create(
+    response, metrics = await create_message(
+        client,
+        "headline",
         model=config.LEAD_MODEL,
-        max_tokens=128,
+        max_tokens=640,
         system=(
-            "You write headlines for SYNTSCH, an AI-native cultural publication. "
+            "You write headlines and lede lines for SYNTSCH, an AI-native cultural publication. "
+            "The lede goes on a card/preview, so it must hook the reader instantly.\n\n"
             "Rules:\n"
-            "- One short, punchy headline. No subtitle.\n"
+            "- Title: one short, punchy headline. No subtitle, no quotes, no period at the end.\n"
+            "- Lede: 1-2 sentences capturing both the event and the mood of the essay.\n"
             "- Same language as the essay.\n"
-            "- No quotes around the title.\n"
-            "- No period at the end.\n"
-            "- Proper nouns stay in Latin script, always.\n"
-            "- Return ONLY the title text, nothing else."
+            "- Be specific and sharp. No generic praise.\n"
+            "- No exclamation marks.\n"
+            "- Proper nouns stay in Latin script, always."
         ),
+        tools=[HEADLINE_TOOL],
+        tool_choice={"type": "tool", "name": "submit_headline"},
         messages=[
             {
                 "role": "user",
                 "content": (
-                    f"Write a title in {lang_name} for this essay.\n\n"
+                    f"Write a title and a lede in {lang_name} for this essay.\n\n"
                     f"Event: {event.name} @ {event.venue}, {event.city}\n"
-                    f"Category: {event.category}\n\n"
-                    f"Essay:\n{body[:2000]}"
+                    f"Category: {event.category}\n"
+                    f"Date: {event.start_date}\n\n"
+                    f"Essay:\n{body}"
                 ),
             }
         ],
     )
-    return response.content[0].text.strip().strip('"').strip("'")
+    _record_stage(trace, metrics)
+    tool_input = extract_tool_input(response, "submit_headline")
+    return _clean_title(tool_input.get("title", "")), tool_input.get("lead", "").strip()
 
 
-def _load_author_prompt(language: str) -> str:
-    prompt_path = config.PROMPTS_DIR / "author_system.md"
-    template = prompt_path.read_text(encoding="utf-8")
+def _clean_title(title: str) -> str:
+    return title.strip().strip('"').strip("'")
 
-    lang_notes = LANGUAGE_NOTES.get(language, LANGUAGE_NOTES["en"])
-    lang_names = {"en": "English", "de": "German", "ru": "Russian"}
-    lang_name = lang_names.get(language, "English")
 
-    return (
-        template.replace("{language}", lang_name)
-        .replace("{language_specific_notes}", lang_notes)
-        .replace("{few_shot_placeholder}", FEW_SHOT_PLACEHOLDER)
-    )
+@cache
+def _load_author_prompt() -> str:
+    prompt_path = config.PROMPTS_DIR / "author_system.md"
+    template = prompt_path.read_text(encoding="utf-8")
+    return template.replace("{few_shot_placeholder}", FEW_SHOT_PLACEHOLDER)
 
 
+@cache
 def _load_critic_prompt() -> str:
     prompt_path = config.PROMPTS_DIR / "critic_system.md"
     return prompt_path.read_text(encoding="utf-8")
 
 
+def _build_language_instructions(language: str) -> str:
+    lang_notes = LANGUAGE_NOTES.get(language, LANGUAGE_NOTES["en"])
+    lang_names = {"en": "English", "de": "German", "ru": "Russian"}
+    lang_name = lang_names.get(language, "English")
+    return f"## Language instructions\n\nWrite in {lang_name}.\n\n{lang_notes}"
+
+
 def _build_user_message(event: EventCandidate, context: ResearchContext) -> str:
     parts = [
         "Write an essay about this upcoming cultural event.",
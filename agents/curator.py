@@ -2,12 +2,10 @@ import json
 import logging
 from datetime import datetime
 
-import anthropic
-
 import config
 from models import CuratorResult
-from storage import EventStorage
-from utils import extract_tool_input
+from storage import open_storage
+from utils import extract_tool_input, get_anthropic_client
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +57,11 @@ CURATOR_TOOL = {
                 "type": "string",
                 "description": "2-3 sentences explaining the choice",
             },
+            "shortlist": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": f"UUIDs of your top {config.CURATOR_SHORTLIST} events, best first, starting with the chosen one",
+            },
         },
         "required": ["chosen_event_id", "why_chosen"],
     },
@@ -69,7 +72,12 @@ async def curate_event(
     city: str | None = None, languages: list[str] | None = None
 ) -> CuratorResult:
     city = city or config.CITY
-    storage = EventStorage(config.DATA_DIR)
+    storage = open_storage(
+        config.DATA_DIR,
+        config.STORAGE_BACKEND,
+        config.STORAGE_LAYOUT,
+        config.TRACE_COMPRESSION,
+    )
 
     if languages:
         seen = set()
@@ -115,7 +123,7 @@ async def curate_event(
         "Curating from %d available events (recent: %s)", len(available), recent_str
     )
 
-    client = anthropic.AsyncAnthropic(max_retries=3)
+    client = get_anthropic_client()
     response = await client.messages.create(
         model=config.CURATOR_MODEL,
         max_tokens=1024,
@@ -135,8 +143,17 @@ async def curate_event(
 
     logger.info("Curator chose: %s (%s)", row["name"], row["category"])
 
+    offered = {ev["id"] for ev in available}
+    shortlist = [chosen_id]
+    for event_id in tool_input.get("shortlist", []):
+        if len(shortlist) >= config.CURATOR_SHORTLIST:
+            break
+        if event_id in offered and event_id not in shortlist:
+            shortlist.append(event_id)
+
     return CuratorResult(
         chosen_event_id=chosen_id,
         why_chosen=tool_input["why_chosen"],
         curated_at=datetime.now(),
+        shortlist=shortlist,
     )
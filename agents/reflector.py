@@ -1,14 +1,16 @@
+import asyncio
 import logging
 import re
-import statistics
 from collections import Counter
 from datetime import datetime, timedelta
 
 import anthropic
 
 import config
+from analytics import bucket_stages, median_words
 from models import ReflectionOutput
 from storage import EventStorage
+from utils import get_anthropic_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,40 +21,89 @@ LANGUAGE_NOTES = {
 }
 
 
+MAX_LISTED_ARTICLES = 40
+
+
 async def write_reflection(
     storage: EventStorage,
     language: str,
     days_back: int = 7,
 ) -> ReflectionOutput:
-    end_date = datetime.now().strftime("%Y-%m-%d")
-    start_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    [(_, _, result)] = await write_reflections(storage, [language], [days_back])
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+async def write_reflections(
+    storage: EventStorage,
+    languages: list[str],
+    windows: list[int] | None = None,
+) -> list[tuple[str, int, ReflectionOutput | BaseException]]:
+    windows = windows or [7]
+    now = datetime.now()
+    end_date = now.strftime("%Y-%m-%d")
+    start_dates = {
+        days: (now - timedelta(days=days)).strftime("%Y-%m-%d") for days in windows
+    }
+
+    # One pass over the longest window; shorter windows are subsets of it.
+    articles: dict[str, list] = {lang: [] for lang in languages}
+    for a in storage.iter_articles(since=min(start_dates.values()), until=end_date):
+        if a.get("language") in articles:
+            articles[a["language"]].append(a)
+
+    jobs = []
+    for days in windows:
+        start_date = start_dates[days]
+        stats = storage.get_period_stats_by_language(start_date, end_date)
+        previous = storage.get_latest_reflections(languages, days)
+        for lang in languages:
+            in_window = [a for a in articles[lang] if a["written_at"] >= start_date]
+            jobs.append(
+                (lang, days, start_date, in_window, stats.get(lang), previous[lang])
+            )
+
+    client = get_anthropic_client()
+    results = await asyncio.gather(
+        *(
+            _write_one(client, lang, start_date, end_date, window, stats, previous)
+            for lang, _, start_date, window, stats, previous in jobs
+        ),
+        return_exceptions=True,
+    )
+    return [(lang, days, r) for (lang, days, *_), r in zip(jobs, results)]
 
-    articles = storage.get_articles_in_period(start_date, end_date, language)
 
-    if not articles:
+async def _write_one(
+    client: anthropic.AsyncAnthropic,
+    language: str,
+    start_date: str,
+    end_date: str,
+    articles: list,
+    stats: dict | None,
+    previous: dict | None,
+) -> ReflectionOutput:
+    if not stats or not stats["article_count"]:
         raise ValueError(
             f"No articles found for {language} in period {start_date} — {end_date}"
         )
 
-    previous = storage.get_latest_reflection(language)
-
-    analysis = _compute_analysis(articles, storage, start_date, end_date, previous)
+    analysis = _compute_analysis(stats, start_date, end_date, previous)
 
     system_prompt = _load_reflector_prompt(language)
     user_message = _build_user_message(
-        articles, analysis, start_date, end_date, language, previous
+        _listed_articles(articles), analysis, start_date, end_date, language, previous
     )
 
-    client = anthropic.Anthropic(max_retries=3)
-
     logger.info(
         "Writing reflection for %s (%d articles, %s — %s)",
         language,
-        len(articles),
+        analysis["article_count"],
         start_date,
         end_date,
     )
-    body_response = client.messages.create(
+    body_response = await client.messages.create(
         model=config.AUTHOR_MODEL,
         max_tokens=4096,
         system=system_prompt,
@@ -60,7 +111,7 @@ async def write_reflection(
     )
     body = _strip_leading_heading(body_response.content[0].text)
 
-    title = _generate_title(client, body, language, start_date, end_date)
+    title = await _generate_title(client, body, language, start_date, end_date)
 
     word_count = len(body.split())
     logger.info("Reflection complete: '%s' (%d words)", title, word_count)
@@ -78,30 +129,23 @@ async def write_reflection(
     )
 
 
+def _listed_articles(articles: list) -> list:
+    if len(articles) <= MAX_LISTED_ARTICLES:
+        return articles
+    step = (len(articles) - 1) / (MAX_LISTED_ARTICLES - 1)
+    return [articles[round(i * step)] for i in range(MAX_LISTED_ARTICLES)]
+
+
 def _compute_analysis(
-    articles: list[dict],
-    storage: EventStorage,
+    stats: dict,
     start_date: str,
     end_date: str,
     previous: dict | None = None,
 ) -> dict:
-    categories = Counter()
-    venues = Counter()
-    total_words = 0
-    word_counts: list[int] = []
-
-    for a in articles:
-        event = a.get("event", {})
-        cat = event.get("category", "unknown")
-        categories[cat] += 1
-        venue = event.get("venue", "")
-        if venue:
-            venues[venue] += 1
-        wc = a.get("word_count", 0) or 0
-        total_words += wc
-        word_counts.append(wc)
-
-    n = len(articles)
+    categories = Counter(stats["categories"])
+    venues = Counter(stats["venues"])
+    n = stats["article_count"]
+    total_words = stats["total_words"]
     avg_words = round(total_words / n) if n else 0
 
     days_in_period = max(
@@ -113,28 +157,6 @@ def _compute_analysis(
     )
     words_per_day = round(total_words / days_in_period, 1)
 
-    median_words = int(statistics.median(word_counts)) if word_counts else 0
-
-    sorted_by_wc = sorted(articles, key=lambda a: a.get("word_count", 0) or 0)
-    longest = sorted_by_wc[-1] if sorted_by_wc else None
-    shortest = sorted_by_wc[0] if sorted_by_wc else None
-
-    longest_article = None
-    if longest:
-        longest_article = {
-            "title": longest.get("title", ""),
-            "slug": longest.get("slug", ""),
-            "word_count": longest.get("word_count", 0) or 0,
-        }
-
-    shortest_article = None
-    if shortest:
-        shortest_article = {
-            "title": shortest.get("title", ""),
-            "slug": shortest.get("slug", ""),
-            "word_count": shortest.get("word_count", 0) or 0,
-        }
-
     dominant_category = None
     if categories:
         top_cat, top_count = categories.most_common(1)[0]
@@ -176,7 +198,7 @@ def _compute_analysis(
             "category_shifts": category_shifts,
         }
 
-    process_stats = _compute_process_stats(articles, storage)
+    process_stats = _compute_process_stats(stats)
 
     result = {
         "article_count": n,
@@ -184,10 +206,10 @@ def _compute_analysis(
         "avg_words": avg_words,
         "categories": dict(categories.most_common()),
         "venues": dict(venues.most_common(10)),
-        "longest_article": longest_article,
-        "shortest_article": shortest_article,
+        "longest_article": stats["longest"],
+        "shortest_article": stats["shortest"],
         "words_per_day": words_per_day,
-        "median_words": median_words,
+        "median_words": median_words(stats["word_counts"]),
         "dominant_category": dominant_category,
         "missing_categories": missing_categories,
         "unique_venues_count": unique_venues_count,
@@ -202,46 +224,38 @@ def _compute_analysis(
     return result
 
 
-def _compute_process_stats(articles: list[dict], storage: EventStorage) -> dict | None:
-    issues_counts = []
-    expanded_count = 0
-    word_growths = []
-    total_sources = 0
-    traced = 0
-
-    for a in articles:
-        slug = a.get("slug", "")
-        if not slug:
-            continue
-        trace = storage.get_trace(slug)
-        if not trace:
-            continue
-        traced += 1
-        critique_issues = trace.get("critique_issues", [])
-        issues_counts.append(len(critique_issues))
-        if trace.get("expanded"):
-            expanded_count += 1
-        draft_wc = trace.get("draft_word_count", 0)
-        final_wc = a.get("word_count", 0) or 0
-        if draft_wc and final_wc:
-            word_growths.append(round((final_wc - draft_wc) / draft_wc * 100, 1))
-        total_sources += trace.get("research_sources_count", 0)
-
+def _compute_process_stats(stats: dict) -> dict | None:
+    traced = stats["traced"]
     if not traced:
         return None
 
-    return {
-        "avg_critique_issues": round(statistics.mean(issues_counts), 1)
-        if issues_counts
-        else 0,
-        "expanded_pct": round(expanded_count / traced * 100) if traced else 0,
-        "avg_word_growth_pct": round(statistics.mean(word_growths), 1)
-        if word_growths
+    growths = stats["word_growth_count"]
+    result = {
+        "avg_critique_issues": round(stats["critique_issues"] / traced, 1),
+        "expanded_pct": round(stats["expanded"] / traced * 100),
+        "avg_word_growth_pct": round(stats["word_growth_sum"] / growths, 1)
+        if growths
         else 0,
-        "total_research_sources": total_sources,
+        "total_research_sources": stats["research_sources"],
         "articles_with_traces": traced,
     }
 
+    stage_totals = bucket_stages(stats)
+    if stage_totals:
+        for totals in stage_totals.values():
+            totals["avg_seconds"] = round(totals["seconds"] / totals["count"], 2)
+            totals["seconds"] = round(totals["seconds"], 1)
+            totals["cost_usd"] = round(totals["cost_usd"], 4)
+        result["stages"] = stage_totals
+        result["total_seconds"] = round(
+            sum(t["seconds"] for t in stage_totals.values()), 1
+        )
+        result["total_cost_usd"] = round(
+            sum(t["cost_usd"] for t in stage_totals.values()), 4
+        )
+
+    return result
+
 
 def _load_reflector_prompt(language: str) -> str:
     prompt_path = config.PROMPTS_DIR / "reflector_system.md"
@@ -285,6 +299,10 @@ def _build_user_message(
 
     parts.append("")
     parts.append("## Articles written")
+    if len(articles) < analysis["article_count"]:
+        parts.append(
+            f"A spread of {len(articles)} of {analysis['article_count']}, oldest first."
+        )
     parts.append("")
 
     for a in articles:
@@ -318,8 +336,8 @@ def _strip_leading_heading(text: str) -> str:
     return re.sub(r"^#{1,3}\s+.+\n+", "", text.lstrip())
 
 
-def _generate_title(
-    client: anthropic.Anthropic,
+async def _generate_title(
+    client: anthropic.AsyncAnthropic,
     body: str,
     language: str,
     start_date: str,
@@ -328,7 +346,7 @@ def _generate_title(
     lang_names = {"en": "English", "de": "German", "ru": "Russian"}
     lang_name = lang_names.get(language, "English")
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model=config.LEAD_MODEL,
         max_tokens=128,
         system=(
@@ -1,15 +1,18 @@
 import json
 import logging
 import os
-from datetime import datetime
-
-import anthropic
+from datetime import date, datetime
 
 import config
 from models import EventCandidate, ScoutResult
+from sources.candidate_filter import (
+    candidate_dates,
+    candidate_payload,
+    select_candidates,
+)
 from sources.tavily_search import TavilyEventSource
-from storage import EventStorage
-from utils import extract_tool_input
+from storage import open_storage
+from utils import extract_tool_input, get_anthropic_client
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +130,16 @@ SCOUT_TOOL = {
 }
 
 
+def _known_dates(candidate: EventCandidate) -> tuple[str, str]:
+    if candidate.start_date:
+        return candidate.start_date, candidate.end_date or ""
+    today = date.today()
+    upcoming = [d for d in candidate_dates(candidate, today) if d >= today]
+    if not upcoming:
+        return "", ""
+    return upcoming[0].isoformat(), upcoming[-1].isoformat()
+
+
 async def scout_event(
     city: str | None = None,
     days_ahead: int | None = None,
@@ -136,13 +149,14 @@ async def scout_event(
 
     tavily_key = os.environ.get("TAVILY_API_KEY", "")
     source = TavilyEventSource(api_key=tavily_key)
-    storage = EventStorage(config.DATA_DIR)
+    storage = open_storage(
+        config.DATA_DIR,
+        config.STORAGE_BACKEND,
+        config.STORAGE_LAYOUT,
+        config.TRACE_COMPRESSION,
+    )
 
-    pool_categories = [
-        ev.get("category", "")
-        for ev in storage._load_all_events()
-        if ev.get("category")
-    ]
+    pool_categories = storage.get_all_event_categories()
     candidates = await source.fetch_events(
         city, days_ahead, pool_categories=pool_categories
     )
@@ -156,6 +170,20 @@ async def scout_event(
         if not storage.is_already_covered(c.name, c.venue, c.start_date)
         and not storage.event_exists(c.name)
     ]
+    distinct, near_duplicates = [], []
+    for c in filtered:
+        start, end = _known_dates(c)
+        if storage.find_similar_event(c.name, start, end):
+            near_duplicates.append(c)
+        else:
+            distinct.append(c)
+    if near_duplicates:
+        logger.info(
+            "Dropping %d candidates similar to pool events: %s",
+            len(near_duplicates),
+            ", ".join(c.name for c in near_duplicates),
+        )
+        filtered = distinct
 
     if not filtered:
         logger.warning(
@@ -163,7 +191,15 @@ async def scout_event(
         )
         filtered = candidates
 
-    existing_names = storage.get_all_event_names()
+    selected = select_candidates(filtered, days_ahead)
+    if not selected:
+        logger.warning("Pre-filter rejected every candidate, sending them unranked")
+        selected = filtered[: config.SCOUT_MAX_CANDIDATES]
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    existing_names = [
+        ev["name"] for ev in storage.iter_events(active_on=today) if ev.get("name")
+    ]
     if existing_names:
         names_list = "\n".join(f"- {n}" for n in existing_names)
         existing_pool_block = (
@@ -174,8 +210,7 @@ async def scout_event(
         existing_pool_block = ""
 
     events_json = json.dumps(
-        [c.model_dump() for c in filtered],
-        indent=2,
+        [candidate_payload(c) for c in selected],
         ensure_ascii=False,
     )
 
@@ -185,10 +220,10 @@ async def scout_event(
         existing_pool_block=existing_pool_block,
     )
 
-    logger.info("Sending %d candidates to scout LLM", len(filtered))
+    logger.info("Sending %d candidates to scout LLM", len(selected))
 
-    client = anthropic.Anthropic(max_retries=3)
-    response = client.messages.create(
+    client = get_anthropic_client()
+    response = await client.messages.create(
         model=config.SCOUT_MODEL,
         max_tokens=4096,
         tools=[SCOUT_TOOL],
@@ -199,9 +234,18 @@ async def scout_event(
     tool_input = extract_tool_input(response, "submit_events")
     events = [EventCandidate(**e) for e in tool_input["events"]]
 
-    logger.info("Scout selected %d events", len(events))
+    logger.info(
+        "Scout selected %d events (%d input tokens, %d output tokens)",
+        len(events),
+        response.usage.input_tokens,
+        response.usage.output_tokens,
+    )
 
     return ScoutResult(
         events=events,
         searched_at=datetime.now(),
+        candidates_found=len(candidates),
+        candidates_sent=len(selected),
+        input_tokens=response.usage.input_tokens,
+        output_tokens=response.usage.output_tokens,
     )
@@ -0,0 +1,182 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
+STATS_VERSION = 2
+
+
+def empty_bucket() -> dict:
+    return {
+        "slugs": [],
+        "article_count": 0,
+        "total_words": 0,
+        "word_counts": {},
+        "categories": {},
+        "venues": {},
+        "longest": None,
+        "shortest": None,
+        "traced": 0,
+        "critique_issues": 0,
+        "expanded": 0,
+        "word_growth_sum": 0.0,
+        "word_growth_count": 0,
+        "research_sources": 0,
+        "stages": {},
+        "research": {},
+    }
+
+
+def _article_ref(article: Mapping, word_count: int) -> dict:
+    return {
+        "title": article.get("title", ""),
+        "slug": article.get("slug", ""),
+        "word_count": word_count,
+    }
+
+
+def _bump(counts: dict, key: str, n: int = 1):
+    counts[key] = counts.get(key, 0) + n
+
+
+def add_article(bucket: dict, article: Mapping, trace: Mapping | None):
+    event = article.get("event")
+    if event is None:
+        event = {}
+    wc = article.get("word_count", 0) or 0
+    bucket["slugs"].append(article.get("slug", ""))
+    bucket["article_count"] += 1
+    bucket["total_words"] += wc
+    _bump(bucket["word_counts"], str(wc))
+    _bump(bucket["categories"], event.get("category", "unknown"))
+    venue = event.get("venue", "")
+    if venue:
+        _bump(bucket["venues"], venue)
+    # Ties go to the later article for the longest and the earlier one for
+    # the shortest, as a stable sort over written_at would pick them.
+    if bucket["longest"] is None or wc >= bucket["longest"]["word_count"]:
+        bucket["longest"] = _article_ref(article, wc)
+    if bucket["shortest"] is None or wc < bucket["shortest"]["word_count"]:
+        bucket["shortest"] = _article_ref(article, wc)
+
+    if not trace or not article.get("slug"):
+        return
+    bucket["traced"] += 1
+    bucket["critique_issues"] += len(trace.get("critique_issues", []))
+    if trace.get("expanded"):
+        bucket["expanded"] += 1
+    draft_wc = trace.get("draft_word_count", 0)
+    if draft_wc and wc:
+        bucket["word_growth_sum"] += round((wc - draft_wc) / draft_wc * 100, 1)
+        bucket["word_growth_count"] += 1
+    bucket["research_sources"] += trace.get("research_sources_count", 0)
+
+    for stage in trace.get("stages", []):
+        add_stage(bucket["stages"], stage)
+    # Research is shared by every language of an event; it is kept per event
+    # so that merged windows count it once.
+    research = (trace.get("research_context") or {}).get("stages", [])
+    event_id = article.get("event_id")
+    if research and event_id not in bucket["research"]:
+        totals = {}
+        for stage in research:
+            add_stage(totals, stage)
+        bucket["research"][event_id] = totals
+
+
+def _stage_totals() -> dict:
+    return {
+        "count": 0,
+        "seconds": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "retries": 0,
+        "cost_usd": 0.0,
+    }
+
+
+def add_stage(stage_totals: dict[str, dict], stage: Mapping):
+    name = stage.get("stage", "").split(":")[0]
+    totals = stage_totals.setdefault(name, _stage_totals())
+    totals["count"] += 1
+    totals["seconds"] += stage.get("seconds", 0.0)
+    totals["input_tokens"] += stage.get("input_tokens", 0) + stage.get(
+        "cache_write_tokens", 0
+    )
+    totals["output_tokens"] += stage.get("output_tokens", 0)
+    totals["cache_read_tokens"] += stage.get("cache_read_tokens", 0)
+    totals["retries"] += stage.get("retries", 0)
+    totals["cost_usd"] += stage.get("cost_usd", 0.0)
+
+
+def _merge_stages(into: dict[str, dict], stages: dict[str, dict]):
+    for name, totals in stages.items():
+        target = into.setdefault(name, _stage_totals())
+        for key, value in totals.items():
+            target[key] += value
+
+
+def merge_buckets(buckets: Iterable[dict]) -> dict:
+    merged = empty_bucket()
+    categories, venues, word_counts = Counter(), Counter(), Counter()
+    for bucket in buckets:
+        merged["slugs"].extend(bucket["slugs"])
+        for key in (
+            "article_count",
+            "total_words",
+            "traced",
+            "critique_issues",
+            "expanded",
+            "word_growth_sum",
+            "word_growth_count",
+            "research_sources",
+        ):
+            merged[key] += bucket[key]
+        categories.update(bucket["categories"])
+        venues.update(bucket["venues"])
+        word_counts.update(bucket["word_counts"])
+
+        longest, shortest = bucket["longest"], bucket["shortest"]
+        if longest and (
+            merged["longest"] is None
+            or longest["word_count"] >= merged["longest"]["word_count"]
+        ):
+            merged["longest"] = longest
+        if shortest and (
+            merged["shortest"] is None
+            or shortest["word_count"] < merged["shortest"]["word_count"]
+        ):
+            merged["shortest"] = shortest
+
+        _merge_stages(merged["stages"], bucket["stages"])
+        for event_id, totals in bucket["research"].items():
+            merged["research"].setdefault(event_id, totals)
+
+    merged["categories"] = dict(categories)
+    merged["venues"] = dict(venues)
+    merged["word_counts"] = dict(word_counts)
+    return merged
+
+
+def median_words(word_counts: dict[str, int]) -> int:
+    n = sum(word_counts.values())
+    if not n:
+        return 0
+    lo, hi = (n - 1) // 2, n // 2
+    values = []
+    seen = 0
+    for wc in sorted(int(k) for k in word_counts):
+        count = word_counts[str(wc)]
+        while len(values) < 2 and seen + count > (lo if not values else hi):
+            values.append(wc)
+        seen += count
+        if len(values) == 2:
+            break
+    return int((values[0] + values[1]) / 2)
+
+
+def bucket_stages(bucket: dict) -> dict[str, dict]:
+    totals: dict[str, dict] = {}
+    _merge_stages(totals, bucket["stages"])
+    for research in bucket["research"].values():
+        _merge_stages(totals, research)
+    return totals
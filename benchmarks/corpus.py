@@ -0,0 +1,282 @@
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from storage import EventStorage, generate_slug  # noqa: E402
+
+LANGUAGES = ("en", "de", "ru")
+_WORD = re.compile(r"\w[\w'’-]*")
+
+
+def load_profile(data_dir: Path) -> dict:
+    storage = EventStorage(data_dir)
+    events = list(storage.iter_events())
+    articles = list(storage.iter_articles())
+
+    title_words: dict[str, list[str]] = {lang: [] for lang in LANGUAGES}
+    body_words: dict[str, list[str]] = {lang: [] for lang in LANGUAGES}
+    word_counts = []
+    for record in articles:
+        lang = record.get("language", "en")
+        if lang not in title_words:
+            continue
+        title_words[lang].extend(_WORD.findall(record.get("title", "")))
+        if len(body_words[lang]) < 20000:
+            body_words[lang].extend(_WORD.findall(record["body"]))
+        if record.get("word_count"):
+            word_counts.append(record["word_count"])
+
+    covered = {a.get("event_id") for a in articles}
+    return {
+        "categories": Counter(e.get("category", "") for e in events),
+        "venues": Counter(e.get("venue", "") for e in events if e.get("venue")),
+        "languages": Counter(a.get("language", "en") for a in articles),
+        "articles_per_event": len(articles) / max(1, len(covered)),
+        "covered_share": len(covered) / max(1, len(events)),
+        "word_count_mean": statistics.mean(word_counts) if word_counts else 1000,
+        "word_count_stdev": statistics.pstdev(word_counts) if word_counts else 200,
+        "title_words": {k: v or ["Berlin"] for k, v in title_words.items()},
+        "body_words": {k: v or ["Berlin"] for k, v in body_words.items()},
+    }
+
+
+def _weighted(rng: random.Random, counter: Counter):
+    items = list(counter)
+    return rng.choices(items, weights=[counter[i] for i in items])[0]
+
+
+def _words(rng: random.Random, vocab: list[str], n: int) -> str:
+    return " ".join(rng.choices(vocab, k=n))
+
+
+def _write(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(data, indent=2, ensure_ascii=False, default=str), encoding="utf-8"
+    )
+
+
+def _trace(rng: random.Random, body: str, word_count: int, event: dict) -> dict:
+    stages = []
+    for stage, model, seconds, out in [
+        ("draft", config.AUTHOR_MODEL, 60.0, 1800),
+        ("critique", config.CRITIC_MODEL, 90.0, 2600),
+    ]:
+        stages.append(
+            {
+                "stage": stage,
+                "model": model,
+                "seconds": round(rng.uniform(0.7, 1.3) * seconds, 3),
+                "time_to_first_token": round(rng.uniform(1.0, 4.0), 3),
+                "input_tokens": rng.randint(3000, 9000),
+                "output_tokens": out,
+                "cache_read_tokens": rng.choice([0, 4000]),
+                "cache_write_tokens": 0,
+                "tokens_per_second": round(rng.uniform(30, 80), 1),
+                "retries": rng.choice([0, 0, 0, 1]),
+                "cached": False,
+                "cost_usd": round(rng.uniform(0.05, 0.2), 6),
+            }
+        )
+    issues = [
+        {
+            "type": rng.choice(["ai_tell", "fact", "voice", "structure"]),
+            "severity": rng.choice(["minor", "major", "critical"]),
+            "location": "paragraph",
+            "fix": "Tighten it.",
+        }
+        for _ in range(rng.randint(0, 6))
+    ]
+    return {
+        "draft_text": body,
+        "draft_word_count": max(1, int(word_count * rng.uniform(0.8, 1.1))),
+        "critique_assessment": rng.choice(["publishable", "needs_revision"]),
+        "critique_issues": issues,
+        "revised_text": body,
+        "revision_changed": True,
+        "research_sources_count": rng.randint(5, 20),
+        "research_context": {
+            "artist_background": event["description"][:500],
+            "raw_sources": [],
+        },
+        "expanded": rng.random() < 0.05,
+        "stages": stages,
+    }
+
+
+def generate_corpus(
+    target: Path,
+    articles: int,
+    years: float = 3.0,
+    layout: str = "flat",
+    trace_share: float = 0.5,
+    body_scale: float = 1.0,
+    reflections: bool = True,
+    seed: int = 0,
+    profile: dict | None = None,
+    today: date | None = None,
+) -> dict:
+    rng = random.Random(seed)
+    profile = profile or load_profile(config.DATA_DIR)
+    today = today or date.today()
+    storage = EventStorage(target, layout=layout)
+
+    per_event = profile["articles_per_event"]
+    covered_events = max(1, round(articles / per_event))
+    total_events = max(covered_events, round(covered_events / profile["covered_share"]))
+    span = int(years * 365)
+
+    events = []
+    for _ in range(total_events):
+        start = today + timedelta(days=rng.randint(-span, 30))
+        end = start + timedelta(days=rng.choice([0, 0, 0, 1, 2, 14, 30, 60]))
+        ev = {
+            "id": str(uuid.uuid4()),
+            "name": _words(
+                rng, profile["title_words"]["en"], rng.randint(2, 6)
+            ).title(),
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "venue": _weighted(rng, profile["venues"]),
+            "city": config.CITY,
+            "category": _weighted(rng, profile["categories"]),
+            "description": _words(rng, profile["body_words"]["en"], 40),
+            "source_url": "https://example.org/event",
+            "event_url": "",
+            "scouted_at": datetime.combine(
+                start - timedelta(days=rng.randint(1, 14)), datetime.min.time()
+            ).isoformat(),
+        }
+        events.append(ev)
+        _write(storage._event_path(ev), ev)
+
+    # Covered events get two or three distinct languages, matching the
+    # real articles-per-event ratio.
+    three = min(1.0, max(0.0, per_event - 2))
+    assignments = []
+    uncovered = rng.sample(events, len(events))
+    while len(assignments) < articles:
+        ev = uncovered.pop() if uncovered else rng.choice(events)
+        k = 3 if rng.random() < three else 2
+        assignments.extend((ev, lang) for lang in rng.sample(LANGUAGES, k))
+
+    slugs = set()
+    written = 0
+    for ev, language in assignments[:articles]:
+        word_count = max(
+            200,
+            int(
+                rng.gauss(profile["word_count_mean"], profile["word_count_stdev"])
+                * body_scale
+            ),
+        )
+        body = _words(rng, profile["body_words"][language], word_count)
+        title = _words(rng, profile["title_words"][language], rng.randint(3, 9))
+        base = generate_slug(title) or f"article-{written}"
+        slug, n = base, 2
+        while slug in slugs:
+            slug, n = f"{base}-{n}", n + 1
+        slugs.add(slug)
+        written_at = datetime.fromisoformat(ev["start_date"]) - timedelta(
+            days=rng.randint(0, 10)
+        )
+        data = {
+            "id": str(uuid.uuid4()),
+            "event_id": ev["id"],
+            "title": title,
+            "slug": slug,
+            "lead": _words(rng, profile["body_words"][language], 30),
+            "body": body,
+            "language": language,
+            "word_count": word_count,
+            "model_used": config.AUTHOR_MODEL,
+            "written_at": written_at.isoformat(),
+            "event": ev,
+        }
+        path = storage._new_article_path(data)
+        _write(path, data)
+        if rng.random() < trace_share:
+            storage._write_trace(path, _trace(rng, body, word_count, ev), body)
+        written += 1
+
+    reflection_count = 0
+    if reflections:
+        weeks = span // 7
+        for week in range(weeks):
+            period_end = today - timedelta(days=7 * week)
+            for language in LANGUAGES:
+                title = _words(rng, profile["title_words"][language], 6)
+                slug = f"{generate_slug(title) or 'reflection'}-{week}"
+                _write(
+                    storage.reflections_dir / f"{slug}.json",
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": title,
+                        "slug": slug,
+                        "body": _words(rng, profile["body_words"][language], 900),
+                        "language": language,
+                        "period_start": (period_end - timedelta(days=7)).isoformat(),
+                        "period_end": period_end.isoformat(),
+                        "analysis": {},
+                        "word_count": 900,
+                        "model_used": config.AUTHOR_MODEL,
+                        "written_at": datetime.combine(
+                            period_end, datetime.min.time()
+                        ).isoformat(),
+                    },
+                )
+                reflection_count += 1
+
+    return {
+        "events": total_events,
+        "covered_events": len({ev["id"] for ev, _ in assignments[:articles]}),
+        "articles": written,
+        "reflections": reflection_count,
+        "years": years,
+        "layout": layout,
+        "seed": seed,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic data/ corpus shaped like the real one"
+    )
+    parser.add_argument("target", type=Path)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--layout", choices=["flat", "partitioned"], default="flat")
+    parser.add_argument("--trace-share", type=float, default=0.5)
+    parser.add_argument("--body-scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--archive", action="store_true", help="Compact expired events")
+    args = parser.parse_args(argv)
+
+    summary = generate_corpus(
+        args.target,
+        args.articles,
+        years=args.years,
+        layout=args.layout,
+        trace_share=args.trace_share,
+        body_scale=args.body_scale,
+        seed=args.seed,
+    )
+    if args.archive:
+        summary["archived"] = EventStorage(
+            args.target, layout=args.layout
+        ).compact_events()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
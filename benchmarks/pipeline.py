@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cli  # noqa: E402
+import config  # noqa: E402
+import utils  # noqa: E402
+from agents.curator import curate_event  # noqa: E402
+from agents.reflector import write_reflections  # noqa: E402
+from agents.scout import scout_event  # noqa: E402
+from benchmarks.replay import (  # noqa: E402
+    Cassette,
+    IOCounter,
+    LoopMonitor,
+    RecordingAnthropic,
+    ReplayAnthropic,
+    ReplayTavily,
+    recording_tavily,
+)
+from sources import research, search_cache, tavily_search  # noqa: E402
+from storage import open_storage  # noqa: E402
+
+DEFAULT_CASSETTE = Path(__file__).parent / "cassettes" / "pipeline.json"
+
+
+class _Run:
+    def __init__(self, data_dir: Path, anthropic, monitor: LoopMonitor):
+        self.data_dir = data_dir
+        self.anthropic = anthropic
+        self.monitor = monitor
+        self.io = IOCounter(data_dir)
+        self.phases: dict[str, dict] = {}
+
+    def _llm_calls(self) -> int:
+        calls = getattr(self.anthropic, "calls", None)
+        return sum(calls.values()) if calls else 0
+
+    @contextlib.asynccontextmanager
+    async def phase(self, name: str):
+        io_before = self.io.snapshot()
+        llm_before = self._llm_calls()
+        search_before = ReplayTavily.calls
+        blocked_before = self.monitor.blocked_seconds
+        started = time.perf_counter()
+        yield
+        io_after = self.io.snapshot()
+        self.phases[name] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "llm_calls": self._llm_calls() - llm_before,
+            "search_calls": ReplayTavily.calls - search_before,
+            "loop_blocked_seconds": round(
+                self.monitor.blocked_seconds - blocked_before, 4
+            ),
+            "storage_io": {
+                k: io_after.get(k, 0) - io_before.get(k, 0)
+                for k in io_after
+                if io_after.get(k, 0) - io_before.get(k, 0)
+            },
+        }
+
+
+async def _pipeline(run: _Run, languages: list[str], concurrency: int):
+    storage = open_storage(
+        config.DATA_DIR,
+        config.STORAGE_BACKEND,
+        config.STORAGE_LAYOUT,
+        config.TRACE_COMPRESSION,
+    )
+
+    async with run.phase("scout"):
+        scouted = await scout_event()
+        storage.save_events(scouted.events)
+
+    async with run.phase("curate"):
+        curated = await curate_event(languages=languages)
+
+    async with run.phase("author"):
+        event_id = curated.chosen_event_id
+        event = storage.event_to_candidate(storage.get_event(event_id))
+        await cli._write_curated(
+            storage,
+            event_id,
+            event,
+            languages,
+            curated.shortlist,
+            concurrency=concurrency,
+        )
+
+    async with run.phase("reflect"):
+        for _, _, reflection in await write_reflections(storage, languages, [7]):
+            if isinstance(reflection, BaseException):
+                raise reflection
+            storage.save_reflection(reflection)
+
+
+async def run_benchmark(
+    cassette: Cassette,
+    languages: list[str],
+    latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+    search_latency: float = 0.0,
+    concurrency: int | None = None,
+    backend: str = "json",
+    layout: str = "flat",
+    record_to: Path | None = None,
+) -> dict:
+    with contextlib.ExitStack() as stack:
+        workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        data_dir = workdir / "data"
+
+        if record_to is not None:
+            anthropic = RecordingAnthropic(utils.get_anthropic_client(), cassette)
+            tavily_class = recording_tavily(research.AsyncTavilyClient, cassette)
+        else:
+            anthropic = ReplayAnthropic(cassette, latency, tokens_per_second)
+            ReplayTavily.configure(cassette, search_latency)
+            tavily_class = ReplayTavily
+            stack.enter_context(
+                mock.patch.dict(os.environ, {"TAVILY_API_KEY": "replay"})
+            )
+
+        for target, name, value in [
+            (config, "DATA_DIR", data_dir),
+            (config, "STORAGE_BACKEND", backend),
+            (config, "STORAGE_LAYOUT", layout),
+            (config, "SEARCH_CACHE_DIR", workdir / "search-cache"),
+            (config, "TELEGRAM_BOT_TOKEN", ""),
+            (config, "RESEND_API_KEY", ""),
+            (utils, "_anthropic_client", anthropic),
+            (search_cache, "_cache", None),
+            (research, "AsyncTavilyClient", tavily_class),
+            (tavily_search, "AsyncTavilyClient", tavily_class),
+        ]:
+            stack.enter_context(mock.patch.object(target, name, value))
+
+        monitor = LoopMonitor()
+        run = _Run(data_dir, anthropic, monitor)
+        run.io.install()
+        run.io.active = True
+        monitor.start()
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                await _pipeline(
+                    run, languages, concurrency or config.AUTHOR_CONCURRENCY
+                )
+        finally:
+            total = time.perf_counter() - started
+            run.io.active = False
+            await monitor.stop()
+            await anthropic.close()
+
+    if record_to is not None:
+        cassette.save(record_to)
+
+    return {
+        "settings": {
+            "languages": languages,
+            "latency": latency,
+            "tokens_per_second": tokens_per_second,
+            "search_latency": search_latency,
+            "concurrency": concurrency or config.AUTHOR_CONCURRENCY,
+            "backend": backend,
+            "layout": layout,
+            "python": platform.python_version(),
+        },
+        "total_seconds": round(total, 4),
+        "event_loop": monitor.report(),
+        "storage_io": run.io.snapshot(),
+        "llm_calls": dict(getattr(anthropic, "calls", {})),
+        "search_calls": ReplayTavily.calls,
+        "phases": run.phases,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Replay recorded LLM/Tavily responses through the pipeline"
+    )
+    parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    parser.add_argument(
+        "--language", nargs="+", default=["en", "de", "ru"], dest="languages"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Seconds before first token"
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--search-latency", type=float, default=0.8)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--layout", choices=["flat", "partitioned"], default="flat")
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        help="Run against the live APIs and write a new cassette here",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    cassette = Cassette() if args.record else Cassette.load(args.cassette)
+    report = asyncio.run(
+        run_benchmark(
+            cassette,
+            args.languages,
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            search_latency=args.search_latency,
+            concurrency=args.concurrency,
+            backend=args.backend,
+            layout=args.layout,
+            record_to=args.record,
+        )
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
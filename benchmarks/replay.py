@@ -0,0 +1,352 @@
+import asyncio
+import inspect
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from anthropic.types import Message
+
+STREAM_CHUNK_CHARS = 40
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_EVENT_ID = re.compile(r'"id": "([0-9a-f-]{36})"')
+
+
+def request_key(kwargs: dict) -> str:
+    tool_choice = kwargs.get("tool_choice") or {}
+    if tool_choice.get("name"):
+        return tool_choice["name"]
+    return f"text:{kwargs.get('max_tokens', 0)}"
+
+
+class Cassette:
+    def __init__(self, data: dict | None = None):
+        data = data or {}
+        self.recorded_at = data.get("recorded_at", date.today().isoformat())
+        self.anthropic: dict[str, list[dict]] = data.get("anthropic", {})
+        self.tavily: list[dict] = data.get("tavily", [])
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path):
+        data = {
+            "recorded_at": self.recorded_at,
+            "anthropic": self.anthropic,
+            "tavily": self.tavily,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+
+
+def _shift_dates(value, days: int):
+    if isinstance(value, dict):
+        return {k: _shift_dates(v, days) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shift_dates(v, days) for v in value]
+    if isinstance(value, str) and _DATE.match(value):
+        shifted = date.fromisoformat(value) + timedelta(days=days)
+        return shifted.isoformat()
+    return value
+
+
+def _prompt_text(kwargs: dict) -> str:
+    parts = []
+    for message in kwargs.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content)
+    return "\n".join(parts)
+
+
+class _ReplayStream:
+    def __init__(self, client: "ReplayAnthropic", message: Message):
+        self.client = client
+        self.message = message
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.client.latency)
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def __aiter__(self):
+        block = self.message.content[0]
+        if block.type == "text":
+            raw, field, kind = block.text, "text", "text_delta"
+        else:
+            raw, field = json.dumps(block.input, ensure_ascii=False), "partial_json"
+            kind = "input_json_delta"
+        delay = self.client.generation_seconds(STREAM_CHUNK_CHARS)
+        for i in range(0, len(raw), STREAM_CHUNK_CHARS):
+            await asyncio.sleep(delay)
+            chunk = raw[i : i + STREAM_CHUNK_CHARS]
+            yield SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type=kind, **{field: chunk}),
+            )
+
+    async def get_final_message(self) -> Message:
+        return self.message
+
+
+class _RawResponse:
+    def __init__(self, message: Message):
+        self._message = message
+        self.retries_taken = 0
+
+    def parse(self) -> Message:
+        return self._message
+
+
+class ReplayAnthropic:
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        today: date | None = None,
+    ):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.calls: Counter[str] = Counter()
+        self.messages = self
+        self.with_raw_response = SimpleNamespace(create=self._create_raw)
+
+        today = today or date.today()
+        shift = (today - date.fromisoformat(cassette.recorded_at)).days
+        self._responses = {
+            key: itertools.cycle(_shift_dates(responses, shift))
+            for key, responses in cassette.anthropic.items()
+        }
+
+    def generation_seconds(self, chars: int) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return chars / 4 / self.tokens_per_second
+
+    def _next(self, kwargs: dict) -> Message:
+        key = request_key(kwargs)
+        if key not in self._responses:
+            raise KeyError(f"Cassette has no recorded response for '{key}'")
+        self.calls[key] += 1
+        data = next(self._responses[key])
+
+        if key == "choose_event":
+            # Event ids are fresh uuids on every run; point the recorded
+            # choice at the first event actually offered.
+            offered = _EVENT_ID.findall(_prompt_text(kwargs))
+            chosen = data["content"][0]["input"]["chosen_event_id"]
+            if offered and chosen not in offered:
+                data = json.loads(json.dumps(data))
+                data["content"][0]["input"]["chosen_event_id"] = offered[0]
+        return Message.model_validate(data)
+
+    async def create(self, **kwargs) -> Message:
+        message = self._next(kwargs)
+        output = message.usage.output_tokens if message.usage else 0
+        await asyncio.sleep(self.latency + self.generation_seconds(output * 4))
+        return message
+
+    async def _create_raw(self, **kwargs) -> _RawResponse:
+        return _RawResponse(await self.create(**kwargs))
+
+    def stream(self, **kwargs) -> _ReplayStream:
+        return _ReplayStream(self, self._next(kwargs))
+
+    async def close(self):
+        return None
+
+
+class ReplayTavily:
+    cassette: Cassette
+    latency = 0.0
+    calls = 0
+    _responses = None
+
+    def __init__(self, api_key: str = ""):
+        self.api_key = api_key
+
+    @classmethod
+    def configure(cls, cassette: Cassette, latency: float = 0.0):
+        cls.cassette = cassette
+        cls.latency = latency
+        cls.calls = 0
+        cls._responses = itertools.cycle([e["response"] for e in cassette.tavily])
+
+    async def search(self, **params) -> dict:
+        await asyncio.sleep(type(self).latency)
+        type(self).calls += 1
+        return json.loads(json.dumps(next(type(self)._responses)))
+
+
+class _RecordingStream:
+    def __init__(self, recorder: "RecordingAnthropic", kwargs: dict):
+        self.recorder = recorder
+        self.kwargs = kwargs
+        self._manager = recorder.client.messages.stream(**kwargs)
+
+    async def __aenter__(self):
+        self._stream = await self._manager.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._manager.__aexit__(*exc)
+
+    async def __aiter__(self):
+        async for event in self._stream:
+            yield event
+
+    @property
+    def response(self):
+        return self._stream.response
+
+    async def get_final_message(self):
+        message = await self._stream.get_final_message()
+        self.recorder.record(self.kwargs, message)
+        return message
+
+
+class RecordingAnthropic:
+    def __init__(self, client, cassette: Cassette):
+        self.client = client
+        self.cassette = cassette
+        self.messages = self
+        self.with_raw_response = SimpleNamespace(create=self._create_raw)
+
+    def record(self, kwargs: dict, message):
+        self.cassette.anthropic.setdefault(request_key(kwargs), []).append(
+            message.model_dump(mode="json", exclude_none=True)
+        )
+
+    async def create(self, **kwargs):
+        message = await self.client.messages.create(**kwargs)
+        self.record(kwargs, message)
+        return message
+
+    async def _create_raw(self, **kwargs):
+        raw = await self.client.messages.with_raw_response.create(**kwargs)
+        recorder = self
+
+        class _Raw:
+            retries_taken = raw.retries_taken
+
+            async def parse(self):
+                message = raw.parse()
+                if inspect.isawaitable(message):
+                    message = await message
+                recorder.record(kwargs, message)
+                return message
+
+        return _Raw()
+
+    def stream(self, **kwargs) -> _RecordingStream:
+        return _RecordingStream(self, kwargs)
+
+    async def close(self):
+        await self.client.close()
+
+
+def recording_tavily(client_class, cassette: Cassette):
+    class RecordingTavily(client_class):
+        async def search(self, **params):
+            response = await super().search(**params)
+            cassette.tavily.append({"params": params, "response": response})
+            return response
+
+    return RecordingTavily
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.005, threshold: float = 0.01):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.stalls += 1
+                self.blocked_seconds += lag
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def report(self) -> dict:
+        return {
+            "blocked_seconds": round(self.blocked_seconds, 4),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+        }
+
+
+class IOCounter:
+    _installed: "IOCounter | None" = None
+
+    def __init__(self, root: Path):
+        self.root = os.path.abspath(root)
+        self.counts: Counter[str] = Counter()
+        self.active = False
+
+    def install(self):
+        if IOCounter._installed is None:
+            sys.addaudithook(_audit)
+        IOCounter._installed = self
+
+    def _under_root(self, path) -> bool:
+        try:
+            return os.path.abspath(os.fsdecode(path)).startswith(self.root)
+        except (TypeError, ValueError):
+            return False
+
+    def observe(self, event: str, args: tuple):
+        if event == "open":
+            path, mode, flags = args
+            if not self._under_root(path):
+                return
+            writing = (mode and any(c in mode for c in "wax+")) or (
+                mode is None and flags & 0o3
+            )
+            self.counts["writes" if writing else "reads"] += 1
+        elif event in ("os.rename", "os.remove", "os.scandir", "os.listdir"):
+            if args and self._under_root(args[0]):
+                self.counts[event.split(".")[1]] += 1
+        elif event == "sqlite3.connect":
+            self.counts["sqlite_connects"] += 1
+
+    def snapshot(self) -> dict:
+        return dict(self.counts)
+
+
+def _audit(event: str, args: tuple):
+    counter = IOCounter._installed
+    if counter is not None and counter.active:
+        counter.observe(event, args)
@@ -0,0 +1,291 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cli  # noqa: E402
+import config  # noqa: E402
+from agents.reflector import _compute_analysis  # noqa: E402
+from benchmarks.corpus import generate_corpus, load_profile  # noqa: E402
+from models import ArticleOutput, EventCandidate, ReflectionOutput  # noqa: E402
+from storage import open_storage  # noqa: E402
+
+
+def _timed(fn, repeat: int = 1) -> dict:
+    runs = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - started)
+    stats = {
+        "seconds": round(min(runs), 6),
+        "mean_seconds": round(statistics.mean(runs), 6),
+        "runs": repeat,
+    }
+    if isinstance(result, (int, list)):
+        stats["result_size"] = result if isinstance(result, int) else len(result)
+    return stats
+
+
+def _disk_bytes(root: Path) -> int:
+    total = 0
+    for dirpath, _, files in os.walk(root):
+        total += sum(os.path.getsize(os.path.join(dirpath, f)) for f in files)
+    return total
+
+
+def _quiet(fn):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+
+    return run
+
+
+def _bench_size(
+    workdir: Path,
+    articles: int,
+    backend: str,
+    layout: str,
+    years: float,
+    repeat: int,
+    profile: dict,
+    seed: int,
+) -> dict:
+    data_dir = workdir / f"data-{articles}"
+    started = time.perf_counter()
+    corpus = generate_corpus(
+        data_dir, articles, years=years, layout=layout, profile=profile, seed=seed
+    )
+    corpus["generate_seconds"] = round(time.perf_counter() - started, 3)
+    corpus["disk_bytes"] = _disk_bytes(data_dir)
+
+    today = date.today()
+    today_str = today.isoformat()
+    week_ago = (today - timedelta(days=7)).isoformat()
+    year_ago = (today - timedelta(days=365)).isoformat()
+
+    results = {}
+    results["open_cold"] = _timed(
+        lambda: len(open_storage(data_dir, backend, layout).catalog.events)
+    )
+    results["daily_stats_build"] = _timed(
+        lambda: len(open_storage(data_dir, backend, layout).daily_stats)
+    )
+    storage = open_storage(data_dir, backend, layout)
+    results["open_warm"] = _timed(
+        lambda: len(open_storage(data_dir, backend, layout).catalog.events), repeat
+    )
+
+    sample_event = next(storage.iter_events())
+    sample_article = next(storage.iter_article_meta())
+    sample_slug = sample_article["slug"]
+    sample_name = sample_event["name"]
+
+    reads = {
+        "find_existing_event": lambda: storage.find_existing_event(
+            sample_name, sample_event["venue"], sample_event["start_date"]
+        ),
+        "find_existing_event_miss": lambda: storage.find_existing_event(
+            "No Such Event", "Nowhere", today_str
+        ),
+        "event_exists": lambda: storage.event_exists(sample_name),
+        "find_similar_event": lambda: storage.find_similar_event(
+            sample_name + " Live", sample_event["start_date"]
+        ),
+        "get_all_event_names": storage.get_all_event_names,
+        "get_all_event_categories": storage.get_all_event_categories,
+        "is_already_covered": lambda: storage.is_already_covered(
+            sample_name, sample_event["venue"], sample_event["start_date"]
+        ),
+        "has_article_in_language": lambda: storage.has_article_in_language(
+            sample_article["event_id"], "en"
+        ),
+        "get_event": lambda: storage.get_event(sample_event["id"]),
+        "event_to_candidate": lambda: storage.event_to_candidate(sample_event),
+        "iter_events": lambda: list(storage.iter_events()),
+        "iter_events_active": lambda: list(storage.iter_events(active_on=today_str)),
+        "iter_articles_en": lambda: list(storage.iter_articles(language="en")),
+        "iter_articles_week": lambda: list(
+            storage.iter_articles(since=week_ago, until=today_str)
+        ),
+        "iter_article_meta": lambda: list(storage.iter_article_meta()),
+        "get_available_events": storage.get_available_events,
+        "get_recent_categories": storage.get_recent_categories,
+        "get_articles_in_period": lambda: storage.get_articles_in_period(
+            week_ago, today_str, "en"
+        ),
+        "get_article": lambda: storage.get_article(sample_slug),
+        "get_trace": lambda: storage.get_trace(sample_slug),
+        "get_latest_reflection": lambda: storage.get_latest_reflection("en"),
+        "get_period_stats_year": lambda: storage.get_period_stats(
+            year_ago, today_str, "en"
+        ),
+        "reflector_compute_analysis_week": lambda: _compute_analysis(
+            storage.get_period_stats(week_ago, today_str, "en"),
+            week_ago,
+            today_str,
+            storage.get_latest_reflection("en"),
+        ),
+        "reflector_compute_analysis_year": lambda: _compute_analysis(
+            storage.get_period_stats(year_ago, today_str, "en"),
+            year_ago,
+            today_str,
+        ),
+    }
+    for name, fn in reads.items():
+        results[name] = _timed(fn, repeat)
+
+    event = EventCandidate(
+        name="Benchmark Event",
+        start_date=today_str,
+        venue="Benchmark Venue",
+        category="music",
+        description="Synthetic",
+    )
+    batch = [
+        event.model_copy(update={"name": f"Benchmark Batch {i}", "venue": f"V{i}"})
+        for i in range(50)
+    ]
+    saved_id = None
+
+    def save_event():
+        nonlocal saved_id
+        saved_id = storage.save_event(event)
+        return saved_id
+
+    results["save_event"] = _timed(save_event)
+    results["save_events_50"] = _timed(lambda: storage.save_events(batch))
+    article = ArticleOutput(
+        title="Benchmark Article",
+        body="word " * 1000,
+        event=event,
+        language="en",
+        word_count=1000,
+        model_used="benchmark",
+        generated_at=today,
+    )
+    results["save_article"] = _timed(lambda: storage.save_article(saved_id, article))
+    reflection = ReflectionOutput(
+        title="Benchmark Reflection",
+        body="word " * 900,
+        language="en",
+        period_start=week_ago,
+        period_end=today_str,
+        analysis={},
+        word_count=900,
+        model_used="benchmark",
+        generated_at=today,
+    )
+    results["save_reflection"] = _timed(lambda: storage.save_reflection(reflection))
+    if hasattr(storage, "close"):
+        storage.close()
+
+    with contextlib.ExitStack() as stack:
+        for name, value in [
+            ("DATA_DIR", data_dir),
+            ("STORAGE_BACKEND", backend),
+            ("STORAGE_LAYOUT", layout),
+        ]:
+            stack.enter_context(mock.patch.object(config, name, value))
+
+        if backend == "sqlite":
+            results["cli_db_import"] = _timed(
+                _quiet(lambda: cli.cmd_db(Namespace(action="import")))
+            )
+        results["cli_compact"] = _timed(
+            _quiet(lambda: cli.cmd_compact(Namespace(before=None)))
+        )
+        archived = open_storage(data_dir, backend, layout)
+        results["iter_archived_events"] = _timed(
+            lambda: list(archived.iter_archived_events()), repeat
+        )
+        results["event_exists_archived"] = _timed(
+            lambda: archived.event_exists(sample_name), repeat
+        )
+        if hasattr(archived, "close"):
+            archived.close()
+        other = "partitioned" if layout == "flat" else "flat"
+        results["cli_migrate_layout"] = _timed(
+            _quiet(lambda: cli.cmd_migrate_layout(Namespace(layout=other)))
+        )
+
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return {"corpus": corpus, "results": results}
+
+
+def run(
+    sizes: list[int],
+    backend: str = "json",
+    layout: str = "flat",
+    years: float = 3.0,
+    repeat: int = 3,
+    seed: int = 0,
+) -> dict:
+    profile = load_profile(config.DATA_DIR)
+    report = {
+        "settings": {
+            "sizes": sizes,
+            "backend": backend,
+            "layout": layout,
+            "years": years,
+            "repeat": repeat,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            report["sizes"][str(size)] = _bench_size(
+                Path(tmp), size, backend, layout, years, repeat, profile, seed
+            )
+    return report
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Time EventStorage and CLI storage paths on synthetic corpora"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000], help="Article counts"
+    )
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--layout", choices=["flat", "partitioned"], default="flat")
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.sizes,
+        backend=args.backend,
+        layout=args.layout,
+        years=args.years,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,19 +18,27 @@ logging.basicConfig(
 import config  # noqa: E402
 from agents.author import write_article  # noqa: E402
 from agents.curator import curate_event  # noqa: E402
-from agents.reflector import write_reflection  # noqa: E402
+from agents.reflector import write_reflections  # noqa: E402
 from agents.scout import scout_event  # noqa: E402
 from models import EventCandidate, ResearchContext  # noqa: E402
-from sources.research import research_event  # noqa: E402
+from sources.research import get_event_research, prefetch_research  # noqa: E402
 from notifiers.telegram import send_article_to_telegram  # noqa: E402
 from notifiers.email import send_article_email  # noqa: E402
-from storage import EventStorage  # noqa: E402
+from notifiers.http import close_http_client, get_http_client  # noqa: E402
+from sqlite_storage import SqliteEventStorage  # noqa: E402
+from storage import EventStorage, open_storage  # noqa: E402
+from utils import close_anthropic_client  # noqa: E402
 
 ALL_LANGUAGES = ["en", "de", "ru"]
 
 
 def _get_storage() -> EventStorage:
-    return EventStorage(config.DATA_DIR)
+    return open_storage(
+        config.DATA_DIR,
+        config.STORAGE_BACKEND,
+        config.STORAGE_LAYOUT,
+        config.TRACE_COMPRESSION,
+    )
 
 
 async def cmd_scout(args):
@@ -43,26 +51,24 @@ async def cmd_scout(args):
 
     storage = _get_storage()
 
-    new_count = 0
-    event_ids = []
-    for event in result.events:
-        existed = storage.find_existing_event(event.name, event.venue, event.start_date)
-        eid = storage.save_event(event)
-        event_ids.append((eid, existed is not None))
-        if existed is None:
-            new_count += 1
+    saved = storage.save_events(result.events)
+    new_count = sum(1 for _, was_existing in saved if not was_existing)
 
     print(
         f"\nFound {len(result.events)} events ({new_count} new, {len(result.events) - new_count} already in pool):"
     )
 
-    for (eid, was_existing), event in zip(event_ids, result.events):
+    for (eid, was_existing), event in zip(saved, result.events):
         tag = " (existing)" if was_existing else ""
         print(
             f"  [{event.category}] {event.name} @ {event.venue} ({event.start_date}){tag}"
         )
 
     print(f"\nSaved {new_count} new events to data/events/")
+    print(
+        f"Scout LLM: {result.candidates_sent}/{result.candidates_found} candidates, "
+        f"{result.input_tokens} tokens in, {result.output_tokens} out"
+    )
 
 
 async def cmd_curate(args):
@@ -91,48 +97,134 @@ async def cmd_curate(args):
     print(f"\nWhy: {result.why_chosen}")
 
 
+async def _write_language(
+    storage: EventStorage,
+    event_id: str,
+    event: EventCandidate,
+    lang: str,
+    context: ResearchContext,
+    semaphore: asyncio.Semaphore,
+    prefix_cached: asyncio.Event,
+    primes_cache: bool = False,
+):
+    if not primes_cache:
+        await prefix_cached.wait()
+    try:
+        async with semaphore:
+            print(f"  [{lang}] Writing article...")
+            article = await write_article(
+                event=event,
+                language=lang,
+                context=context,
+                on_prefix_cached=prefix_cached.set,
+            )
+    finally:
+        prefix_cached.set()
+    article_id, slug = storage.save_article(event_id, article)
+    print(f'  [{lang}] "{article.title}" ({article.word_count} words) → #{article_id}')
+
+    if lang == "ru" and config.TELEGRAM_BOT_TOKEN:
+        await send_article_to_telegram(article.title, article.lead, slug)
+
+    if config.RESEND_API_KEY:
+        await send_article_email(
+            title=article.title,
+            lead=article.lead,
+            slug=slug,
+            language=lang,
+            category=event.category,
+            venue=event.venue,
+            start_date=event.start_date,
+        )
+
+
 async def _write_for_languages(
     storage: EventStorage,
     event_id: str,
     event: EventCandidate,
     languages: list[str],
     skip_research: bool = False,
+    concurrency: int | None = None,
+    refresh_research: bool = False,
 ):
+    pending = []
+    for lang in languages:
+        if storage.has_article_in_language(event_id, lang):
+            print(f"  [{lang}] Already exists, skipping")
+        else:
+            pending.append(lang)
+    if not pending:
+        return
+
     if skip_research:
         context = ResearchContext()
     else:
         print("Researching event...")
-        context = await research_event(event)
+        context = await get_event_research(
+            storage, event_id, event, refresh=refresh_research
+        )
 
-    for lang in languages:
-        if storage.has_article_in_language(event_id, lang):
-            print(f"  [{lang}] Already exists, skipping")
-            continue
+    semaphore = asyncio.Semaphore(concurrency or config.AUTHOR_CONCURRENCY)
+    # The first draft writes the shared prompt cache; the other languages
+    # start once it begins streaming so they read it instead of writing it again.
+    prefix_cached = asyncio.Event()
+    results = await asyncio.gather(
+        *(
+            _write_language(
+                storage,
+                event_id,
+                event,
+                lang,
+                context,
+                semaphore,
+                prefix_cached,
+                primes_cache=i == 0,
+            )
+            for i, lang in enumerate(pending)
+        ),
+        return_exceptions=True,
+    )
 
-        print(f"  [{lang}] Writing article...")
-        article = await write_article(
-            event=event,
-            language=lang,
-            context=context,
-        )
-        article_id, slug = storage.save_article(event_id, article)
-        print(
-            f'  [{lang}] "{article.title}" ({article.word_count} words) → #{article_id}'
-        )
+    failed = [
+        (lang, r) for lang, r in zip(pending, results) if isinstance(r, Exception)
+    ]
+    for lang, error in failed:
+        print(f"  [{lang}] Failed: {error}", file=sys.stderr)
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(pending)} languages failed")
 
-        if lang == "ru" and config.TELEGRAM_BOT_TOKEN:
-            await send_article_to_telegram(article.title, article.lead, slug)
 
-        if config.RESEND_API_KEY:
-            await send_article_email(
-                title=article.title,
-                lead=article.lead,
-                slug=slug,
-                language=lang,
-                category=event.category,
-                venue=event.venue,
-                start_date=event.start_date,
-            )
+async def _write_curated(
+    storage: EventStorage,
+    event_id: str,
+    event: EventCandidate,
+    languages: list[str],
+    shortlist: list[str],
+    skip_research: bool = False,
+    concurrency: int | None = None,
+    refresh_research: bool = False,
+    prefetch: int | None = None,
+):
+    # The runners-up are researched alongside the chosen event's articles so
+    # that a later run picking one of them finds its research already stored.
+    if prefetch is None:
+        prefetch = config.RESEARCH_PREFETCH
+    runners_up = [e for e in shortlist if e != event_id][: max(0, prefetch)]
+    if skip_research:
+        runners_up = []
+    prefetched = asyncio.create_task(prefetch_research(storage, runners_up))
+    try:
+        await _write_for_languages(
+            storage,
+            event_id,
+            event,
+            languages,
+            skip_research,
+            concurrency,
+            refresh_research,
+        )
+    finally:
+        await prefetched
 
 
 async def cmd_author(args):
@@ -151,8 +243,16 @@ async def cmd_author(args):
         print(f"Why: {result.why_chosen}")
         print(f"Languages: {', '.join(languages)}\n")
 
-        await _write_for_languages(
-            storage, event_id, event, languages, args.skip_research
+        await _write_curated(
+            storage,
+            event_id,
+            event,
+            languages,
+            result.shortlist,
+            args.skip_research,
+            args.concurrency,
+            args.refresh_research,
+            args.prefetch,
         )
 
     elif args.event_id:
@@ -169,7 +269,13 @@ async def cmd_author(args):
         print(f"Languages: {', '.join(languages)}\n")
 
         await _write_for_languages(
-            storage, event_id, event, languages, args.skip_research
+            storage,
+            event_id,
+            event,
+            languages,
+            args.skip_research,
+            args.concurrency,
+            args.refresh_research,
         )
 
     else:
@@ -182,24 +288,41 @@ async def cmd_author(args):
         print(f"Languages: {', '.join(languages)}\n")
 
         await _write_for_languages(
-            storage, event_id, event, languages, args.skip_research
+            storage,
+            event_id,
+            event,
+            languages,
+            args.skip_research,
+            args.concurrency,
+            args.refresh_research,
         )
 
 
 async def cmd_reflect(args):
     storage = _get_storage()
     languages = args.language
-
-    for lang in languages:
-        print(f"Writing reflection for [{lang}] (last {args.days} days)...")
-        try:
-            reflection = await write_reflection(storage, lang, days_back=args.days)
-            reflection_id, slug = storage.save_reflection(reflection)
+    windows = ", ".join(str(days) for days in args.days)
+
+    print(f"Writing reflections for {', '.join(languages)} (last {windows} days)...")
+    results = await write_reflections(storage, languages, args.days)
+    for lang, days, result in results:
+        if isinstance(result, ValueError):
+            print(f"  [{lang}] Skipped: {result}")
+        elif isinstance(result, Exception):
+            print(f"  [{lang}] Failed ({days} days): {result}", file=sys.stderr)
+        else:
+            reflection_id, slug = storage.save_reflection(result)
             print(
-                f'  [{lang}] "{reflection.title}" ({reflection.word_count} words) → {slug}'
+                f'  [{lang}] "{result.title}" ({days} days, {result.word_count} words) → {slug}'
             )
-        except ValueError as e:
-            print(f"  [{lang}] Skipped: {e}")
+
+    failed = [
+        r
+        for _, _, r in results
+        if isinstance(r, Exception) and not isinstance(r, ValueError)
+    ]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} reflections failed")
 
 
 async def cmd_notify(args):
@@ -210,11 +333,11 @@ async def cmd_notify(args):
 
     articles = []
     for slug in slugs:
-        path = storage.articles_dir / f"{slug}.json"
-        if not path.exists():
+        article = storage.get_article(slug)
+        if article is None:
             print(f"Article not found: {slug}", file=sys.stderr)
             continue
-        articles.append(json.loads(path.read_text(encoding="utf-8")))
+        articles.append(article)
 
     if not articles:
         print("No articles to notify about.", file=sys.stderr)
@@ -223,18 +346,18 @@ async def cmd_notify(args):
     if args.wait:
         print(f"Waiting for deploy (polling URLs, timeout {args.timeout}s)...")
         url = f"{config.SITE_URL}/{articles[0]['language']}/article/{articles[0]['slug']}/"
-        async with httpx.AsyncClient() as client:
-            for i in range(args.timeout // 5):
-                try:
-                    resp = await client.get(url, follow_redirects=True)
-                    if resp.status_code == 200:
-                        print(f"  Deploy live after ~{i * 5}s")
-                        break
-                except httpx.RequestError:
-                    pass
-                await asyncio.sleep(5)
-            else:
-                print(f"  Timeout after {args.timeout}s, sending anyway")
+        client = get_http_client()
+        for i in range(args.timeout // 5):
+            try:
+                resp = await client.get(url, follow_redirects=True)
+                if resp.status_code == 200:
+                    print(f"  Deploy live after ~{i * 5}s")
+                    break
+            except httpx.RequestError:
+                pass
+            await asyncio.sleep(5)
+        else:
+            print(f"  Timeout after {args.timeout}s, sending anyway")
 
     for i, article in enumerate(articles):
         lang = article["language"]
@@ -261,6 +384,44 @@ async def cmd_notify(args):
             print(f"  [{lang}] Email sent")
 
 
+def cmd_db(args):
+    storage = SqliteEventStorage(
+        config.DATA_DIR,
+        sync=False,
+        layout=config.STORAGE_LAYOUT,
+        trace_compression=config.TRACE_COMPRESSION,
+    )
+    try:
+        if args.action == "import":
+            print(
+                f"Imported {storage.import_json()} changed files into {storage.db_path}"
+            )
+        else:
+            print(f"Exported {storage.export_json()} files to {config.DATA_DIR}")
+    finally:
+        storage.close()
+
+
+def cmd_migrate_layout(args):
+    storage = _get_storage()
+    moved = storage.migrate_layout(args.layout)
+    print(f"Moved {moved} files to the {args.layout} layout")
+    if args.layout != config.STORAGE_LAYOUT:
+        print(f"Set STORAGE_LAYOUT={args.layout} so new files follow it")
+
+
+def cmd_pack_traces(args):
+    storage = _get_storage()
+    packed = storage.pack_traces()
+    print(f"Packed {packed} traces ({storage.trace_compression})")
+
+
+def cmd_compact(args):
+    storage = _get_storage()
+    archived = storage.compact_events(args.before)
+    print(f"Archived {archived} expired events to {storage.archive_dir}")
+
+
 async def cmd_pipeline(args):
     storage = _get_storage()
     languages = args.language
@@ -272,12 +433,8 @@ async def cmd_pipeline(args):
         days_ahead=args.days,
     )
 
-    new_count = 0
-    for event in scout_result.events:
-        existed = storage.find_existing_event(event.name, event.venue, event.start_date)
-        storage.save_event(event)
-        if existed is None:
-            new_count += 1
+    saved = storage.save_events(scout_result.events)
+    new_count = sum(1 for _, was_existing in saved if not was_existing)
 
     print(f"Scouted {len(scout_result.events)} events ({new_count} new)")
 
@@ -295,11 +452,30 @@ async def cmd_pipeline(args):
 
     print(f"\n=== AUTHOR: writing in {', '.join(languages)} ===")
 
-    await _write_for_languages(storage, event_id, event, languages)
+    await _write_curated(
+        storage,
+        event_id,
+        event,
+        languages,
+        curator_result.shortlist,
+        concurrency=args.concurrency,
+        prefetch=args.prefetch,
+    )
 
     print("\nDone.")
 
 
+def _run(coro):
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+            await close_anthropic_client()
+
+    return asyncio.run(runner())
+
+
 def main():
     parser = argparse.ArgumentParser(description="syntsch — autonomous cultural digest")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -326,9 +502,32 @@ def main():
         help="Languages to write (default: all)",
     )
     p_author.add_argument("--skip-research", action="store_true")
+    p_author.add_argument(
+        "--refresh-research",
+        action="store_true",
+        help="Search again even if stored research is still fresh",
+    )
+    p_author.add_argument(
+        "--prefetch",
+        type=int,
+        default=config.RESEARCH_PREFETCH,
+        help="Curator runners-up to research in the background (0 = none)",
+    )
+    p_author.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.AUTHOR_CONCURRENCY,
+        help="Languages written in parallel (1 = one after another)",
+    )
 
     p_reflect = sub.add_parser("reflect", help="Write a reflection on recent coverage")
-    p_reflect.add_argument("--days", type=int, default=7)
+    p_reflect.add_argument(
+        "--days",
+        type=int,
+        nargs="+",
+        default=[7],
+        help="Window lengths in days, one reflection per language each",
+    )
     p_reflect.add_argument(
         "--language",
         nargs="+",
@@ -347,6 +546,26 @@ def main():
         "--timeout", type=int, default=300, help="Max seconds to wait for deploy"
     )
 
+    p_db = sub.add_parser("db", help="Sync the SQLite index with data/ JSON files")
+    p_db.add_argument("action", choices=["import", "export"])
+
+    p_migrate = sub.add_parser(
+        "migrate-layout", help="Move data/ files between flat and partitioned layouts"
+    )
+    p_migrate.add_argument("layout", choices=["flat", "partitioned"])
+
+    sub.add_parser(
+        "pack-traces",
+        help="Rewrite old .trace.json files as diffs with shared research context",
+    )
+
+    p_compact = sub.add_parser(
+        "compact", help="Archive expired, unwritten events out of data/events/"
+    )
+    p_compact.add_argument(
+        "--before", help="Archive events that ended before this date (default: today)"
+    )
+
     p_pipeline = sub.add_parser(
         "pipeline", help="Full pipeline: scout → curate → author"
     )
@@ -359,16 +578,32 @@ def main():
         choices=ALL_LANGUAGES,
         help="Languages to write (default: all)",
     )
+    p_pipeline.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.AUTHOR_CONCURRENCY,
+        help="Languages written in parallel (1 = one after another)",
+    )
+    p_pipeline.add_argument(
+        "--prefetch",
+        type=int,
+        default=config.RESEARCH_PREFETCH,
+        help="Curator runners-up to research in the background (0 = none)",
+    )
 
     args = parser.parse_args()
 
     handlers = {
-        "scout": lambda a: asyncio.run(cmd_scout(a)),
-        "curate": lambda a: asyncio.run(cmd_curate(a)),
-        "author": lambda a: asyncio.run(cmd_author(a)),
-        "reflect": lambda a: asyncio.run(cmd_reflect(a)),
-        "notify": lambda a: asyncio.run(cmd_notify(a)),
-        "pipeline": lambda a: asyncio.run(cmd_pipeline(a)),
+        "scout": lambda a: _run(cmd_scout(a)),
+        "curate": lambda a: _run(cmd_curate(a)),
+        "author": lambda a: _run(cmd_author(a)),
+        "reflect": lambda a: _run(cmd_reflect(a)),
+        "notify": lambda a: _run(cmd_notify(a)),
+        "pipeline": lambda a: _run(cmd_pipeline(a)),
+        "db": cmd_db,
+        "migrate-layout": cmd_migrate_layout,
+        "pack-traces": cmd_pack_traces,
+        "compact": cmd_compact,
     }
 
     try:
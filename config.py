@@ -14,6 +14,9 @@ RESEND_SEGMENT_RU = os.environ.get("RESEND_SEGMENT_RU", "")
 
 CITY = "Berlin"
 DAYS_AHEAD = 14
+SCOUT_TOKEN_BUDGET = 12000
+SCOUT_MAX_CANDIDATES = 30
+AUTHOR_CONCURRENCY = int(os.environ.get("AUTHOR_CONCURRENCY", "3"))
 ARTICLE_LANGUAGE = "en"
 
 SCOUT_MODEL = "claude-sonnet-4-5-20250929"
@@ -22,6 +25,14 @@ AUTHOR_MODEL = "claude-opus-4-6"
 CRITIC_MODEL = "claude-opus-4-6"
 LEAD_MODEL = "claude-opus-4-6"
 
+# USD per million input / output tokens; cache writes cost 1.25x input,
+# cache reads 0.1x input.
+MODEL_PRICES = {
+    "claude-opus-4-6": (5.0, 25.0),
+    "claude-sonnet-4-5-20250929": (3.0, 15.0),
+}
+TAVILY_SEARCH_PRICES = {"basic": 0.008, "advanced": 0.016}
+
 CATEGORIES = [
     "music",
     "cinema",
@@ -91,4 +102,26 @@ CATEGORY_SOURCES = {
 }
 
 DATA_DIR = BASE_DIR / "data"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+STORAGE_LAYOUT = os.environ.get("STORAGE_LAYOUT", "flat")
+TRACE_COMPRESSION = os.environ.get("TRACE_COMPRESSION", "none")
 PROMPTS_DIR = BASE_DIR / "prompts"
+
+# Stored research for an event is reused by later author runs until it is
+# this old.
+RESEARCH_MAX_AGE_DAYS = 14
+# The curator ranks this many events. Research for up to RESEARCH_PREFETCH
+# runners-up is fetched in the background so a later run that picks one
+# starts warm; each costs four advanced Tavily searches unless cached.
+CURATOR_SHORTLIST = 3
+RESEARCH_PREFETCH = int(os.environ.get("RESEARCH_PREFETCH", "2"))
+
+SEARCH_CACHE_DIR = BASE_DIR / ".cache" / "search"
+SEARCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SEARCH_CACHE_TTLS = {
+    "scout": 6 * 3600,
+    "artist": 30 * 86400,
+    "venue": 30 * 86400,
+    "cultural": 7 * 86400,
+    "related": 86400,
+}
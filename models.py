@@ -18,12 +18,32 @@ class EventCandidate(BaseModel):
 class ScoutResult(BaseModel):
     events: list[EventCandidate]
     searched_at: datetime
+    candidates_found: int = 0
+    candidates_sent: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
 
 
 class CuratorResult(BaseModel):
     chosen_event_id: str
     why_chosen: str
     curated_at: datetime
+    shortlist: list[str] = []
+
+
+class StageMetrics(BaseModel):
+    stage: str
+    model: str = ""
+    seconds: float = 0.0
+    time_to_first_token: float | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    tokens_per_second: float = 0.0
+    retries: int = 0
+    cached: bool = False
+    cost_usd: float = 0.0
 
 
 class ResearchContext(BaseModel):
@@ -32,6 +52,7 @@ class ResearchContext(BaseModel):
     cultural_context: str = ""
     related_works: str = ""
     raw_sources: list[str] = []
+    stages: list[StageMetrics] = []
 
 
 class CritiqueIssue(BaseModel):
@@ -51,6 +72,9 @@ class PipelineTrace(BaseModel):
     research_sources_count: int = 0
     research_context: ResearchContext | None = None
     expanded: bool = False
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    stages: list[StageMetrics] = []
 
 
 class ArticleOutput(BaseModel):
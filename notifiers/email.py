@@ -3,6 +3,7 @@ import logging
 import httpx
 
 import config
+from notifiers.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -182,6 +183,7 @@ async def send_article_email(
     category: str,
     venue: str = "",
     start_date: str = "",
+    client: httpx.AsyncClient | None = None,
 ):
     api_key = config.RESEND_API_KEY
     if not api_key:
@@ -198,30 +200,30 @@ async def send_article_email(
     subject = SUBJECTS.get(language, SUBJECTS["en"]).format(title=title)
     html = _build_html(title, lead, url, language, category, venue, start_date)
 
+    client = client or get_http_client()
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                "https://api.resend.com/broadcasts",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "audience_id": segment_id,
-                    "from": "Syntsch <hi@syntsch.de>",
-                    "subject": subject,
-                    "html": html,
-                },
-            )
-            resp.raise_for_status()
-            broadcast_id = resp.json().get("id")
-
-            await client.post(
-                f"https://api.resend.com/broadcasts/{broadcast_id}/send",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
+        resp = await client.post(
+            "https://api.resend.com/broadcasts",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "audience_id": segment_id,
+                "from": "Syntsch <hi@syntsch.de>",
+                "subject": subject,
+                "html": html,
+            },
+        )
+        resp.raise_for_status()
+        broadcast_id = resp.json().get("id")
+
+        await client.post(
+            f"https://api.resend.com/broadcasts/{broadcast_id}/send",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+        )
     except Exception as e:
         logger.warning("Email notification failed for [%s]: %s", language, e)
@@ -3,39 +3,46 @@ import logging
 import httpx
 
 import config
+from notifiers.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
 async def send_article_to_telegram(
-    title: str, lead: str, slug: str, language: str = "ru"
+    title: str,
+    lead: str,
+    slug: str,
+    language: str = "ru",
+    client: httpx.AsyncClient | None = None,
 ):
     url = f"{config.SITE_URL}/{language}/article/{slug}/"
     text = f'<b>{title}</b>\n\n{lead}\n\n<a href="{url}">Читать →</a>'
-    await _send_telegram_message(text, url)
+    await _send_telegram_message(text, url, client)
 
 
-async def _send_telegram_message(text: str, preview_url: str):
+async def _send_telegram_message(
+    text: str, preview_url: str, client: httpx.AsyncClient | None = None
+):
     token = config.TELEGRAM_BOT_TOKEN
     chat_id = config.TELEGRAM_CHAT_ID
 
     if not token or not chat_id:
         return
 
+    client = client or get_http_client()
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"https://api.telegram.org/bot{token}/sendMessage",
-                json={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": "HTML",
-                    "link_preview_options": {
-                        "url": preview_url,
-                        "prefer_large_media": True,
-                    },
+        resp = await client.post(
+            f"https://api.telegram.org/bot{token}/sendMessage",
+            json={
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": "HTML",
+                "link_preview_options": {
+                    "url": preview_url,
+                    "prefer_large_media": True,
                 },
-            )
-            resp.raise_for_status()
+            },
+        )
+        resp.raise_for_status()
     except Exception as e:
         logger.warning("Telegram notification failed: %s", e)
@@ -0,0 +1,73 @@
+import re
+import unicodedata
+from collections import Counter
+
+NEAR_DUPLICATE_THRESHOLD = 0.55
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[\W_]+", " ", text).split())
+
+
+def trigrams(text: str) -> frozenset[str]:
+    text = normalize_text(text)
+    if not text:
+        return frozenset()
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TrigramIndex:
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._grams: dict[str, frozenset[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, key: str, text: str):
+        self.remove(key)
+        grams = trigrams(text)
+        if not grams:
+            return
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str):
+        for gram in self._grams.pop(key, ()):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def query(self, text: str) -> list[tuple[str, float]]:
+        grams = trigrams(text)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        # Jaccard >= t needs at least t * max(|A|, |B|) shared trigrams, so
+        # candidates sharing fewer than t * |A| can be skipped without scoring.
+        min_shared = self.threshold * len(grams)
+        matches = []
+        for key, count in shared.items():
+            if count < min_shared:
+                continue
+            score = jaccard(grams, self._grams[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
@@ -0,0 +1,242 @@
+import json
+import logging
+import re
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+import config
+from models import EventCandidate
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    "january": 1,
+    "jan": 1,
+    "januar": 1,
+    "jän": 1,
+    "february": 2,
+    "feb": 2,
+    "februar": 2,
+    "march": 3,
+    "mar": 3,
+    "märz": 3,
+    "maerz": 3,
+    "mär": 3,
+    "april": 4,
+    "apr": 4,
+    "may": 5,
+    "mai": 5,
+    "june": 6,
+    "jun": 6,
+    "juni": 6,
+    "july": 7,
+    "jul": 7,
+    "juli": 7,
+    "august": 8,
+    "aug": 8,
+    "september": 9,
+    "sep": 9,
+    "sept": 9,
+    "october": 10,
+    "oct": 10,
+    "oktober": 10,
+    "okt": 10,
+    "november": 11,
+    "nov": 11,
+    "december": 12,
+    "dec": 12,
+    "dezember": 12,
+    "dez": 12,
+}
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+_ISO_DATE = re.compile(r"\b(20\d{2})-(\d{1,2})-(\d{1,2})\b")
+_DOTTED_DATE = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.((?:20)?\d{2})?(?!\d)")
+_DAY_MONTH = re.compile(
+    rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\.?\s+({_MONTH})\b\.?(?:,?\s+(20\d{{2}}))?",
+    re.IGNORECASE,
+)
+_MONTH_DAY = re.compile(
+    rf"\b({_MONTH})\b\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s+(20\d{{2}}))?",
+    re.IGNORECASE,
+)
+
+NON_EVENT_DOMAINS = (
+    "wikipedia.org",
+    "youtube.com",
+    "tripadvisor.",
+    "booking.com",
+    "yelp.",
+    "reddit.com",
+    "linkedin.com",
+    "amazon.",
+)
+
+NON_EVENT_PATH_PARTS = (
+    "/news/",
+    "/jobs",
+    "/karriere",
+    "/careers",
+    "/restaurant",
+    "/hotel",
+    "/shop/",
+    "/impressum",
+    "/privacy",
+    "/datenschutz",
+    "/login",
+)
+
+_BOILERPLATE_LINE = re.compile(
+    r"\b(?:cookies?|newsletter|subscribe|abonnieren|sign in|log in|anmelden|"
+    r"privacy|datenschutz|impressum|all rights reserved|skip to|"
+    r"share on|teilen|follow us|folge uns|menu|menü)\b|©",
+    re.IGNORECASE,
+)
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_BARE_URL = re.compile(r"https?://\S+")
+
+
+def _make_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _resolve_year(year: str | None, month: int, day: int, today: date) -> date | None:
+    if year:
+        full = int(year) if len(year) == 4 else 2000 + int(year)
+        return _make_date(full, month, day)
+    found = _make_date(today.year, month, day)
+    if found and found < today - timedelta(days=180):
+        found = _make_date(today.year + 1, month, day)
+    return found
+
+
+def extract_dates(text: str, today: date) -> list[date]:
+    found = []
+    for year, month, day in _ISO_DATE.findall(text):
+        found.append(_make_date(int(year), int(month), int(day)))
+    for day, month, year in _DOTTED_DATE.findall(text):
+        found.append(_resolve_year(year, int(month), int(day), today))
+    for day, month, year in _DAY_MONTH.findall(text):
+        found.append(_resolve_year(year, MONTHS[month.lower()], int(day), today))
+    for month, day, year in _MONTH_DAY.findall(text):
+        found.append(_resolve_year(year, MONTHS[month.lower()], int(day), today))
+    return sorted({d for d in found if d is not None})
+
+
+def _domain(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host.removeprefix("www.")
+
+
+def _matches_domain(host: str, domains: list[str]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+def is_non_event(url: str) -> bool:
+    host = _domain(url)
+    if any(d in host for d in NON_EVENT_DOMAINS):
+        return True
+    path = urlparse(url).path.lower()
+    return any(part in path for part in NON_EVENT_PATH_PARTS)
+
+
+def source_credibility(url: str) -> float:
+    host = _domain(url)
+    if any(_matches_domain(host, d) for d in config.CATEGORY_SOURCES.values()):
+        return 2.0
+    if _matches_domain(host, config.GENERAL_SOURCES):
+        return 1.0
+    return 0.0
+
+
+def strip_boilerplate(markdown: str) -> str:
+    text = _MARKDOWN_IMAGE.sub("", markdown)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+    text = _BARE_URL.sub("", text)
+
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip().strip("#*|>-").strip()
+        if not line or line in seen:
+            continue
+        if len(line) < 80 and _BOILERPLATE_LINE.search(line):
+            continue
+        if len(line) < 4:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def candidate_payload(candidate: EventCandidate) -> dict:
+    return candidate.model_dump(exclude_defaults=True, exclude={"city"})
+
+
+def candidate_dates(candidate: EventCandidate, today: date) -> list[date]:
+    return extract_dates(
+        f"{candidate.name}\n{candidate.description}\n{candidate.raw_snippet}", today
+    )
+
+
+def select_candidates(
+    candidates: list[EventCandidate],
+    days_ahead: int,
+    token_budget: int | None = None,
+    max_candidates: int | None = None,
+    today: date | None = None,
+) -> list[EventCandidate]:
+    token_budget = token_budget or config.SCOUT_TOKEN_BUDGET
+    max_candidates = max_candidates or config.SCOUT_MAX_CANDIDATES
+    today = today or date.today()
+    window_end = today + timedelta(days=days_ahead + 1)
+
+    ranked = []
+    non_events = past = 0
+    for position, candidate in enumerate(candidates):
+        if is_non_event(candidate.source_url):
+            non_events += 1
+            continue
+        dates = candidate_dates(candidate, today)
+        upcoming = [d for d in dates if today <= d <= window_end]
+        if dates and dates[-1] < today:
+            past += 1
+            continue
+
+        score = source_credibility(candidate.source_url)
+        if upcoming:
+            score += 1.5
+        ranked.append((-score, position, candidate))
+    ranked.sort(key=lambda r: (r[0], r[1]))
+
+    selected = []
+    used = 0
+    for _, _, candidate in ranked:
+        if len(selected) >= max_candidates:
+            break
+        tokens = estimate_tokens(
+            json.dumps(candidate_payload(candidate), ensure_ascii=False)
+        )
+        if used + tokens > token_budget:
+            continue
+        selected.append(candidate)
+        used += tokens
+
+    logger.info(
+        "Pre-filter kept %d/%d candidates (~%d tokens; dropped %d non-events, %d past)",
+        len(selected),
+        len(candidates),
+        used,
+        non_events,
+        past,
+    )
+    return selected
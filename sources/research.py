@@ -1,18 +1,25 @@
 import asyncio
 import logging
 import os
+import time
 
 from tavily import AsyncTavilyClient
 
-from models import EventCandidate, ResearchContext
+import config
+from models import EventCandidate, ResearchContext, StageMetrics
+from sources.search_cache import get_search_cache
+from storage import EventStorage
 
 logger = logging.getLogger(__name__)
 
 
 async def _search_one(client: AsyncTavilyClient, field: str, query: str) -> dict:
+    started = time.monotonic()
     for attempt in range(3):
         try:
-            response = await client.search(
+            response, cached = await get_search_cache().fetch(
+                client,
+                field,
                 query=query,
                 max_results=5,
                 search_depth="advanced",
@@ -22,7 +29,11 @@ async def _search_one(client: AsyncTavilyClient, field: str, query: str) -> dict
             snippets = [r.get("content", "") for r in results]
             urls = [r.get("url", "") for r in results]
             logger.debug("Research '%s': %d results", field, len(results))
-            return {"text": "\n\n".join(snippets[:3]), "urls": urls}
+            return {
+                "text": "\n\n".join(snippets[:3]),
+                "urls": urls,
+                "metrics": _search_metrics(field, started, attempt, cached),
+            }
         except Exception as e:
             logger.warning(
                 "Research attempt %d/3 failed for '%s': %s", attempt + 1, field, e
@@ -31,7 +42,24 @@ async def _search_one(client: AsyncTavilyClient, field: str, query: str) -> dict
                 await asyncio.sleep(1.0 * (attempt + 1))
 
     logger.error("All retries exhausted for research query '%s'", field)
-    return {"text": "", "urls": []}
+    return {
+        "text": "",
+        "urls": [],
+        "metrics": _search_metrics(field, started, 2, False),
+    }
+
+
+def _search_metrics(
+    field: str, started: float, retries: int, cached: bool
+) -> StageMetrics:
+    return StageMetrics(
+        stage=f"research:{field}",
+        model="tavily",
+        seconds=round(time.monotonic() - started, 3),
+        retries=retries,
+        cached=cached,
+        cost_usd=0.0 if cached else config.TAVILY_SEARCH_PRICES["advanced"],
+    )
 
 
 async def research_event(event: EventCandidate) -> ResearchContext:
@@ -50,6 +78,8 @@ async def research_event(event: EventCandidate) -> ResearchContext:
         *(_search_one(client, f, queries[f]) for f in fields)
     )
 
+    logger.info("Search cache: %s", get_search_cache().stats())
+
     results = dict(zip(fields, responses))
     raw_sources = []
     for r in responses:
@@ -61,7 +91,51 @@ async def research_event(event: EventCandidate) -> ResearchContext:
         cultural_context=results["cultural"]["text"],
         related_works=results["related"]["text"],
         raw_sources=[s for s in raw_sources if s],
+        stages=[r["metrics"] for r in responses],
+    )
+
+
+async def get_event_research(
+    storage: EventStorage,
+    event_id: str,
+    event: EventCandidate,
+    refresh: bool = False,
+) -> ResearchContext:
+    if not refresh:
+        context = storage.get_research(event_id, config.RESEARCH_MAX_AGE_DAYS)
+        if context is not None:
+            logger.info("Reusing stored research for event #%s", event_id)
+            return context
+
+    context = await research_event(event)
+    if context.raw_sources:
+        storage.save_research(event_id, context)
+    return context
+
+
+async def prefetch_research(storage: EventStorage, event_ids: list[str]) -> int:
+    events = []
+    for event_id in event_ids:
+        row = storage.get_event(event_id)
+        if row and storage.get_research(event_id, config.RESEARCH_MAX_AGE_DAYS) is None:
+            events.append((event_id, storage.event_to_candidate(row)))
+    if not events:
+        return 0
+
+    logger.info(
+        "Prefetching research for %d shortlisted events (up to $%.3f)",
+        len(events),
+        sum(len(_build_queries(event)) for _, event in events)
+        * config.TAVILY_SEARCH_PRICES["advanced"],
+    )
+    results = await asyncio.gather(
+        *(get_event_research(storage, event_id, event) for event_id, event in events),
+        return_exceptions=True,
     )
+    for (event_id, _), result in zip(events, results):
+        if isinstance(result, Exception):
+            logger.warning("Research prefetch failed for #%s: %s", event_id, result)
+    return sum(1 for r in results if not isinstance(r, Exception))
 
 
 def _build_queries(event: EventCandidate) -> dict[str, str]:
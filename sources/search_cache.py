@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+
+def cache_key(params: dict) -> str:
+    key = dict(params)
+    key["query"] = normalize_query(key.get("query", ""))
+    if key.get("include_domains"):
+        key["include_domains"] = sorted(key["include_domains"])
+    encoded = json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SearchCache:
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttls: dict[str, int] | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.ttls = ttls or {}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, kind: str, params: dict) -> dict | None:
+        path = self._path(cache_key(params))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        ttl = self.ttls.get(kind, 0)
+        if time.time() - entry.get("stored_at", 0) > ttl:
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, kind: str, params: dict, response: dict):
+        path = self._path(cache_key(params))
+        content = json.dumps(
+            {"kind": kind, "stored_at": time.time(), "response": response},
+            ensure_ascii=False,
+        )
+        current = self.size()
+        try:
+            previous = path.stat().st_size if path.exists() else 0
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write search cache entry: %s", e)
+            return
+
+        self._size = current + path.stat().st_size - previous
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json"))
+        return self._size
+
+    def _evict(self):
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.8
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+    async def fetch(self, client, kind: str, **params) -> tuple[dict, bool]:
+        cached = self.get(kind, params)
+        if cached is not None:
+            logger.debug(
+                "Search cache hit (%s): %s", kind, params.get("query", "")[:80]
+            )
+            return cached, True
+        response = await client.search(**params)
+        self.put(kind, params, response)
+        return response, False
+
+    async def search(self, client, kind: str, **params) -> dict:
+        response, _ = await self.fetch(client, kind, **params)
+        return response
+
+
+_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    global _cache
+    if _cache is None:
+        _cache = SearchCache(
+            config.SEARCH_CACHE_DIR,
+            config.SEARCH_CACHE_TTLS,
+            config.SEARCH_CACHE_MAX_BYTES,
+        )
+    return _cache
@@ -9,6 +9,8 @@ from tavily import AsyncTavilyClient
 import config
 from models import EventCandidate
 from sources.base import EventSource
+from sources.candidate_filter import strip_boilerplate
+from sources.search_cache import get_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +52,9 @@ class TavilyEventSource(EventSource):
 
         for attempt in range(3):
             try:
-                response = await self.client.search(**kwargs)
+                response = await get_search_cache().search(
+                    self.client, "scout", **kwargs
+                )
                 results = response.get("results", [])
                 logger.debug("Query '%s': %d results", query[:80], len(results))
                 return results
@@ -182,6 +186,7 @@ class TavilyEventSource(EventSource):
             tasks.append(self._search_one(q, include_domains=domains))
 
         batches = await asyncio.gather(*tasks)
+        logger.info("Search cache: %s", get_search_cache().stats())
 
         seen_urls = set()
         candidates = []
@@ -192,7 +197,7 @@ class TavilyEventSource(EventSource):
                     continue
                 seen_urls.add(url)
 
-                raw_content = result.get("raw_content") or ""
+                raw_content = strip_boilerplate(result.get("raw_content") or "")
                 snippet = result.get("content") or ""
 
                 candidates.append(
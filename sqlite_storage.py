@@ -0,0 +1,474 @@
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from similarity import TrigramIndex
+from storage import ArticleRecord, EventStorage, _norm, _period_days, _scan_json
+
+SCHEMA_VERSION = 2
+
+ARTICLE_META = "json_remove(doc, '$.body', '$.event.description')"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    name_norm TEXT NOT NULL,
+    venue_norm TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    scouted_at TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_name ON events (name_norm);
+CREATE INDEX IF NOT EXISTS events_venue_date ON events (venue_norm, start_date);
+CREATE INDEX IF NOT EXISTS events_start ON events (start_date);
+CREATE INDEX IF NOT EXISTS events_end ON events (end_date);
+
+CREATE TABLE IF NOT EXISTS articles (
+    slug TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    event_id TEXT,
+    language TEXT NOT NULL,
+    written_at TEXT NOT NULL,
+    event_name_norm TEXT NOT NULL,
+    event_venue_norm TEXT NOT NULL,
+    event_start_date TEXT,
+    category TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_event_language ON articles (event_id, language);
+CREATE INDEX IF NOT EXISTS articles_language_written ON articles (language, written_at);
+CREATE INDEX IF NOT EXISTS articles_written ON articles (written_at);
+CREATE INDEX IF NOT EXISTS articles_event_name ON articles (event_name_norm);
+CREATE INDEX IF NOT EXISTS articles_event_venue_date
+    ON articles (event_venue_norm, event_start_date);
+
+CREATE TABLE IF NOT EXISTS reflections (
+    slug TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    language TEXT NOT NULL,
+    written_at TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reflections_language_written
+    ON reflections (language, written_at);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+class SqliteEventStorage(EventStorage):
+    def __init__(
+        self,
+        data_dir: Path,
+        db_path: Path | None = None,
+        sync: bool = True,
+        layout: str = "flat",
+        trace_compression: str = "none",
+    ):
+        super().__init__(data_dir, layout=layout, trace_compression=trace_compression)
+        self._name_index: TrigramIndex | None = None
+        self.db_path = db_path or data_dir / ".storage.db"
+        self.db = sqlite3.connect(self.db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            self.db.executescript(
+                """
+                DROP TABLE IF EXISTS events;
+                DROP TABLE IF EXISTS articles;
+                DROP TABLE IF EXISTS reflections;
+                DROP TABLE IF EXISTS files;
+                """
+            )
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+        if sync:
+            self.import_json()
+
+    def close(self):
+        self.db.close()
+
+    def import_json(self) -> int:
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.db.execute(
+                "SELECT path, size, mtime_ns FROM files"
+            )
+        }
+        seen = set()
+        changed = 0
+        self._name_index = None
+        with self.db:
+            for kind, directory in (
+                ("events", self.events_dir),
+                ("articles", self.articles_dir),
+                ("reflections", self.reflections_dir),
+            ):
+                for entry in _scan_json(directory):
+                    path = Path(entry.path)
+                    rel = self._rel(path)
+                    seen.add(rel)
+                    stat = entry.stat()
+                    if known.get(rel) == (stat.st_size, stat.st_mtime_ns):
+                        continue
+                    self._upsert(kind, self._read_json(path), rel)
+                    self._record_file(rel, path)
+                    changed += 1
+
+            for rel in known.keys() - seen:
+                kind = rel.split("/", 1)[0]
+                self.db.execute(f"DELETE FROM {kind} WHERE path = ?", (rel,))
+                self.db.execute("DELETE FROM files WHERE path = ?", (rel,))
+                changed += 1
+        return changed
+
+    def export_json(self) -> int:
+        written = 0
+        for kind, locate in (
+            ("events", self._event_path),
+            ("articles", self._new_article_path),
+            ("reflections", lambda r: self.reflections_dir / f"{r['slug']}.json"),
+        ):
+            rows = self.db.execute(f"SELECT path, doc FROM {kind}").fetchall()
+            for rel, doc in rows:
+                data = json.loads(doc)
+                path = self.data_dir / rel
+                if not path.exists():
+                    path = locate(data)
+                if path.exists() and self._read_json(path) == data:
+                    continue
+                self._write_json(path, data)
+                self._saved(kind, path, data)
+                written += 1
+        return written
+
+    def _record_file(self, rel: str, path: Path):
+        stat = path.stat()
+        self.db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+            (rel, stat.st_size, stat.st_mtime_ns),
+        )
+
+    def _upsert(self, kind: str, data: dict, rel: str):
+        doc = json.dumps(data, ensure_ascii=False, default=str)
+        if kind == "events":
+            self.db.execute(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    data["id"],
+                    rel,
+                    _norm(data.get("name")),
+                    _norm(data.get("venue")),
+                    data.get("start_date") or "",
+                    data.get("end_date") or "",
+                    data.get("category") or "",
+                    data.get("scouted_at") or "",
+                    doc,
+                ),
+            )
+        elif kind == "articles":
+            event = data.get("event") or {}
+            self.db.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    data["slug"],
+                    rel,
+                    data.get("event_id"),
+                    data.get("language") or "",
+                    data.get("written_at") or "",
+                    _norm(event.get("name")),
+                    _norm(event.get("venue")),
+                    event.get("start_date"),
+                    event.get("category") or "",
+                    doc,
+                ),
+            )
+        else:
+            self.db.execute(
+                "INSERT OR REPLACE INTO reflections VALUES (?, ?, ?, ?, ?)",
+                (
+                    data["slug"],
+                    rel,
+                    data.get("language") or "",
+                    data.get("written_at") or "",
+                    doc,
+                ),
+            )
+
+    def _saved(self, kind: str, path: Path, data: dict):
+        rel = self._rel(path)
+        with self.db:
+            self._upsert(kind, data, rel)
+            self._record_file(rel, path)
+
+    def _events_saved(self, saved: list[tuple[Path, dict]]):
+        with self.db:
+            for path, data in saved:
+                rel = self._rel(path)
+                self._upsert("events", data, rel)
+                self._record_file(rel, path)
+        if self._name_index is not None:
+            for _, data in saved:
+                self._name_index.add(data["id"], _norm(data.get("name")))
+
+    def _article_saved(self, path: Path, data: dict):
+        self._saved("articles", path, data)
+
+    def _reflection_saved(self, path: Path, data: dict):
+        self._saved("reflections", path, data)
+
+    def _events_archived(self, paths: list[Path]):
+        super()._events_archived(paths)
+        self._name_index = None
+        with self.db:
+            for path in paths:
+                rel = self._rel(path)
+                self.db.execute("DELETE FROM events WHERE path = ?", (rel,))
+                self.db.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+    def _event_file(self, event_id: str) -> Path:
+        (rel,) = self.db.execute(
+            "SELECT path FROM events WHERE id = ?", (event_id,)
+        ).fetchone()
+        return self.data_dir / rel
+
+    def _article_path(self, slug: str) -> Path:
+        row = self.db.execute(
+            "SELECT path FROM articles WHERE slug = ?", (slug,)
+        ).fetchone()
+        if row:
+            return self.data_dir / row[0]
+        return self.articles_dir / f"{slug}.json"
+
+    def migrate_layout(self, layout: str) -> int:
+        moved = super().migrate_layout(layout)
+        self.import_json()
+        return moved
+
+    def _article_slug_taken(self, slug: str) -> bool:
+        row = self.db.execute("SELECT 1 FROM articles WHERE slug = ?", (slug,))
+        return row.fetchone() is not None
+
+    def _reflection_slug_taken(self, slug: str) -> bool:
+        row = self.db.execute("SELECT 1 FROM reflections WHERE slug = ?", (slug,))
+        return row.fetchone() is not None
+
+    def find_existing_event(self, name: str, venue: str, start_date: str) -> str | None:
+        row = self.db.execute(
+            "SELECT id FROM events WHERE name_norm = ? AND name_norm != '' LIMIT 1",
+            (_norm(name),),
+        ).fetchone()
+        if row:
+            return row[0]
+        venue_norm = _norm(venue)
+        if venue_norm and start_date:
+            row = self.db.execute(
+                "SELECT id FROM events WHERE venue_norm = ? AND start_date = ? LIMIT 1",
+                (venue_norm, start_date),
+            ).fetchone()
+            if row:
+                return row[0]
+        return self.archive_keys.find(name, venue, start_date)
+
+    def event_exists(self, name: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM events WHERE name_norm = ? AND name_norm != '' LIMIT 1",
+            (_norm(name),),
+        )
+        return row.fetchone() is not None or self.archive_keys.has_name(name)
+
+    @property
+    def event_name_index(self) -> TrigramIndex:
+        if self._name_index is None:
+            index = TrigramIndex()
+            for event_id, name_norm in self.db.execute(
+                "SELECT id, name_norm FROM events"
+            ):
+                index.add(event_id, name_norm)
+            self._name_index = index
+        return self._name_index
+
+    def get_all_event_names(self) -> list[str]:
+        rows = self.db.execute("SELECT json_extract(doc, '$.name') FROM events")
+        return [name for (name,) in rows if name]
+
+    def get_all_event_categories(self) -> list[str]:
+        rows = self.db.execute("SELECT category FROM events WHERE category != ''")
+        return [category for (category,) in rows]
+
+    def is_already_covered(
+        self, name: str, venue: str, start_date: str, language: str = ""
+    ) -> bool:
+        row = self.db.execute(
+            """
+            SELECT 1 FROM articles
+            WHERE (event_name_norm = ?
+                   OR (event_venue_norm = ? AND event_start_date IS ?))
+              AND (? = '' OR language = ?)
+            LIMIT 1
+            """,
+            (_norm(name), _norm(venue), start_date, language, language),
+        )
+        return row.fetchone() is not None
+
+    def has_article_in_language(self, event_id: str, language: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM articles WHERE event_id = ? AND language = ? LIMIT 1",
+            (event_id, language),
+        )
+        return row.fetchone() is not None
+
+    def get_available_events(
+        self, today: str | None = None, language: str = ""
+    ) -> list[dict]:
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        rows = self.db.execute(
+            """
+            SELECT doc FROM events e
+            WHERE (end_date >= ?1 OR start_date >= ?1
+                   OR (start_date = '' AND end_date = ''))
+              AND NOT EXISTS (
+                  SELECT 1 FROM articles a
+                  WHERE a.event_id = e.id AND (?2 = '' OR a.language = ?2)
+              )
+            ORDER BY scouted_at DESC
+            """,
+            (today, language),
+        )
+        return [json.loads(doc) for (doc,) in rows]
+
+    def get_recent_categories(self, days: int = 7) -> list[str]:
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        rows = self.db.execute(
+            """
+            SELECT category FROM articles
+            WHERE written_at > ? AND category != ''
+            ORDER BY written_at DESC
+            """,
+            (cutoff,),
+        )
+        return [category for (category,) in rows]
+
+    def get_event(self, event_id: str) -> dict | None:
+        row = self.db.execute(
+            "SELECT doc FROM events WHERE id = ?", (event_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_events(
+        self, active_on: str | None = None, category: str | None = None
+    ) -> Iterator[dict]:
+        clauses, params = [], []
+        if active_on:
+            clauses.append(
+                "(end_date >= ? OR start_date >= ? OR (start_date = '' AND end_date = ''))"
+            )
+            params.extend([active_on, active_on])
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        for (doc,) in self.db.execute(f"SELECT doc FROM events {where}", params):
+            yield json.loads(doc)
+
+    def iter_articles(
+        self,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        event_id: str | None = None,
+    ) -> Iterator[ArticleRecord]:
+        clauses, params = [], []
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+        if since:
+            clauses.append("written_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("written_at < ?")
+            params.append(until + "\uffff")
+        if event_id is not None:
+            clauses.append("event_id = ?")
+            params.append(event_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(
+            f"SELECT slug, {ARTICLE_META} FROM articles {where} ORDER BY written_at",
+            params,
+        )
+        for slug, meta in rows:
+            yield self._article_record(slug, json.loads(meta))
+
+    def iter_article_meta(
+        self, fields: Iterable[str] | None = None
+    ) -> Iterator[ArticleRecord]:
+        rows = self.db.execute(
+            f"SELECT slug, {ARTICLE_META} FROM articles ORDER BY written_at"
+        )
+        for slug, meta in rows:
+            yield self._article_record(slug, json.loads(meta), fields)
+
+    def _article_record(
+        self, slug: str, meta: dict, fields: Iterable[str] | None = None
+    ) -> ArticleRecord:
+        if fields is not None:
+            meta = {k: meta[k] for k in fields if k in meta}
+        return ArticleRecord(
+            meta,
+            lambda: self._article_doc(slug),
+            lambda: self.get_trace(slug),
+        )
+
+    def _article_doc(self, slug: str) -> dict:
+        row = self.db.execute(
+            "SELECT doc FROM articles WHERE slug = ?", (slug,)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def get_latest_reflection(self, language: str) -> dict | None:
+        row = self.db.execute(
+            """
+            SELECT doc FROM reflections WHERE language = ?
+            ORDER BY written_at DESC LIMIT 1
+            """,
+            (language,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_latest_reflections(
+        self, languages: Iterable[str], days: int | None = None
+    ) -> dict[str, dict | None]:
+        latest: dict[str, str | None] = dict.fromkeys(languages)
+        rows = self.db.execute(
+            """
+            SELECT language, slug,
+                   json_extract(doc, '$.period_start'),
+                   json_extract(doc, '$.period_end')
+            FROM reflections ORDER BY written_at DESC
+            """
+        )
+        for lang, slug, start, end in rows:
+            if lang not in latest or latest[lang] is not None:
+                continue
+            period = {"period_start": start, "period_end": end}
+            if not days or _period_days(period) == days:
+                latest[lang] = slug
+        docs = {}
+        for lang, slug in latest.items():
+            row = None
+            if slug is not None:
+                row = self.db.execute(
+                    "SELECT doc FROM reflections WHERE slug = ?", (slug,)
+                ).fetchone()
+            docs[lang] = json.loads(row[0]) if row else None
+        return docs
@@ -1,13 +1,24 @@
+import bisect
+import gzip
+import hashlib
 import json
+import logging
 import os
 import re
+import subprocess
 import tempfile
 import unicodedata
 import uuid
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from models import EventCandidate, ArticleOutput, ReflectionOutput
+from analytics import STATS_VERSION, add_article, empty_bucket, merge_buckets
+from models import EventCandidate, ArticleOutput, ReflectionOutput, ResearchContext
+from similarity import TrigramIndex
+from traces import TRACE_FORMAT, pack_trace, research_key, unpack_trace
+
+logger = logging.getLogger(__name__)
 
 
 _CYRILLIC_TRANSLIT = {
@@ -56,75 +67,840 @@ def generate_slug(text: str) -> str:
     return text.strip("-")
 
 
+INDEX_VERSION = 1
+ARCHIVE_KEYS_VERSION = 1
+
+LAYOUTS = ("flat", "partitioned")
+TRACE_COMPRESSIONS = ("gzip", "none")
+TRACE_SUFFIXES = (".trace.json.gz", ".trace.json")
+UNDATED_PARTITION = "undated"
+
+_ARTICLE_EVENT_FIELDS = ("id", "name", "start_date", "end_date", "venue", "category")
+
+
+def _article_meta(article: dict) -> dict:
+    meta = {k: v for k, v in article.items() if k not in ("body", "event")}
+    event = article.get("event") or {}
+    meta["event"] = {k: event[k] for k in _ARTICLE_EVENT_FIELDS if k in event}
+    return meta
+
+
+def _reflection_meta(reflection: dict) -> dict:
+    return {k: v for k, v in reflection.items() if k not in ("body", "analysis")}
+
+
+class LazyRecord(Mapping):
+    def __init__(self, fields: dict, load: Callable[[], dict]):
+        self._fields = fields
+        self._load = load
+        self._document: dict | None = None
+
+    def _full(self) -> dict:
+        if self._document is None:
+            self._document = self._load()
+        return self._document
+
+    def __getitem__(self, key):
+        if self._document is not None or key not in self._fields:
+            return self._full()[key]
+        value = self._fields[key]
+        if isinstance(value, dict):
+            return LazyRecord(value, lambda: self._full().get(key) or {})
+        return value
+
+    def __iter__(self):
+        return iter(self._full())
+
+    def __len__(self) -> int:
+        return len(self._full())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._fields!r})"
+
+
+class ArticleRecord(LazyRecord):
+    def __init__(
+        self,
+        fields: dict,
+        load: Callable[[], dict],
+        load_trace: Callable[[], dict | None],
+    ):
+        super().__init__(fields, load)
+        self._load_trace = load_trace
+
+    @property
+    def trace(self) -> dict | None:
+        return self._load_trace()
+
+
+def _is_active(ev: dict, today: str) -> bool:
+    end = ev.get("end_date") or ""
+    start = ev.get("start_date") or ""
+    if end and end >= today:
+        return True
+    if start and start >= today:
+        return True
+    return not start and not end
+
+
+def _date_range(start: str | None, end: str | None) -> tuple[str, str]:
+    start = start or end or ""
+    end = end or start
+    if len(end) < 10:
+        end += "\uffff"
+    return start, end
+
+
+def _dates_overlap(a: tuple[str, str], b: tuple[str, str]) -> bool:
+    a_start, a_end = _date_range(*a)
+    b_start, b_end = _date_range(*b)
+    if not a_start or not b_start:
+        return False
+    return a_start <= b_end and b_start <= a_end
+
+
+def _month_partition(value: str | None) -> str:
+    value = value or ""
+    if re.match(r"\d{4}-\d{2}", value):
+        return f"{value[:4]}/{value[5:7]}"
+    return UNDATED_PARTITION
+
+
+def _event_partition(ev: dict) -> str:
+    return _month_partition(max(ev.get("start_date") or "", ev.get("end_date") or ""))
+
+
+def _article_partition(article: dict) -> str:
+    return _month_partition(article.get("written_at"))
+
+
+def _scan_json(directory: Path) -> Iterator[os.DirEntry]:
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            yield from _scan_json(Path(entry.path))
+        elif entry.name.endswith(".json") and not entry.name.endswith(".trace.json"):
+            yield entry
+
+
+def _blob_id(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _git_blob_ids(root: Path) -> dict[str, str]:
+    # A fresh checkout gives every file a new mtime, so unmodified tracked
+    # files are recognised by the blob id git already knows instead.
+    def ls_files(*args: str) -> list[str]:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", *args, "--", "."],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+        return [line for line in result.stdout.decode().split("\0") if line]
+
+    try:
+        staged = ls_files("--stage")
+        modified = set(ls_files("--modified"))
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    blobs = {}
+    for line in staged:
+        info, path = line.split("\t", 1)
+        if path not in modified:
+            blobs[path] = info.split()[1]
+    return blobs
+
+
+def _period_days(reflection: Mapping) -> int | None:
+    try:
+        start = datetime.strptime(reflection.get("period_start") or "", "%Y-%m-%d")
+        end = datetime.strptime(reflection.get("period_end") or "", "%Y-%m-%d")
+    except ValueError:
+        return None
+    return (end - start).days
+
+
+def _fsync_dir(directory: Path):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _norm(text: str | None) -> str:
+    return (text or "").strip().lower()
+
+
+def _archive_key(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+
+
+class _ArchiveKeys:
+    def __init__(self, names: dict | None = None, venue_dates: dict | None = None):
+        self.names: dict[str, str] = names or {}
+        self.venue_dates: dict[str, str] = venue_dates or {}
+
+    def add(self, ev: dict):
+        name = _norm(ev.get("name"))
+        if name:
+            self.names.setdefault(_archive_key(name), ev["id"])
+        venue = _norm(ev.get("venue"))
+        start_date = ev.get("start_date") or ""
+        if venue and start_date:
+            self.venue_dates.setdefault(_archive_key(venue, start_date), ev["id"])
+
+    def has_name(self, name: str) -> bool:
+        name = _norm(name)
+        return bool(name) and _archive_key(name) in self.names
+
+    def find(self, name: str, venue: str, start_date: str) -> str | None:
+        name = _norm(name)
+        if name and _archive_key(name) in self.names:
+            return self.names[_archive_key(name)]
+        venue = _norm(venue)
+        if venue and start_date:
+            return self.venue_dates.get(_archive_key(venue, start_date))
+        return None
+
+
+class _Catalog:
+    def __init__(self):
+        self.events: dict[str, dict] = {}
+        self.event_paths: dict[str, str] = {}
+        self.events_by_partition: dict[str, list[str]] = {}
+        self.event_by_name: dict[str, str] = {}
+        self.event_by_venue_date: dict[tuple[str, str], str] = {}
+        self.event_names = TrigramIndex()
+        self.articles: dict[str, dict] = {}
+        self.article_paths: dict[str, str] = {}
+        self.article_languages: dict[str, set[str]] = {}
+        self.articles_by_event: dict[str, list[str]] = {}
+        self.covered_names: dict[str, set[str]] = {}
+        self.covered_venue_dates: dict[tuple[str, str], set[str]] = {}
+        self.articles_by_written_at: list[tuple[str, str]] = []
+        self.reflections: dict[str, dict] = {}
+
+    def add_event(self, ev: dict, rel: str):
+        event_id = ev["id"]
+        if event_id not in self.events:
+            self.events_by_partition.setdefault(_event_partition(ev), []).append(
+                event_id
+            )
+        self.events[event_id] = ev
+        self.event_paths[event_id] = rel
+        name = _norm(ev.get("name"))
+        if name:
+            self.event_by_name.setdefault(name, event_id)
+        self.event_names.add(event_id, name)
+        venue = _norm(ev.get("venue"))
+        start_date = ev.get("start_date") or ""
+        if venue and start_date:
+            self.event_by_venue_date.setdefault((venue, start_date), event_id)
+
+    def add_article(self, article: dict, rel: str):
+        slug = article.get("slug", "")
+        self.articles[slug] = article
+        self.article_paths[slug] = rel
+        language = article.get("language", "")
+        self.article_languages.setdefault(article.get("event_id"), set()).add(language)
+        self.articles_by_event.setdefault(article.get("event_id"), []).append(slug)
+        event = article.get("event") or {}
+        self.covered_names.setdefault(_norm(event.get("name")), set()).add(language)
+        venue_date = (_norm(event.get("venue")), event.get("start_date"))
+        self.covered_venue_dates.setdefault(venue_date, set()).add(language)
+        bisect.insort(
+            self.articles_by_written_at, (article.get("written_at", ""), slug)
+        )
+
+    def add_reflection(self, reflection: dict):
+        self.reflections[reflection.get("slug", "")] = reflection
+
+    def events_from(self, partition: str) -> Iterator[str]:
+        for key, event_ids in self.events_by_partition.items():
+            if key == UNDATED_PARTITION or key >= partition:
+                yield from event_ids
+
+    def articles_written_after(self, cutoff: str) -> list[dict]:
+        idx = bisect.bisect_right(self.articles_by_written_at, (cutoff, "\uffff"))
+        return [self.articles[slug] for _, slug in self.articles_by_written_at[idx:]]
+
+
+def open_storage(
+    data_dir: Path,
+    backend: str = "json",
+    layout: str = "flat",
+    trace_compression: str = "none",
+) -> "EventStorage":
+    if backend == "sqlite":
+        from sqlite_storage import SqliteEventStorage
+
+        return SqliteEventStorage(
+            data_dir, layout=layout, trace_compression=trace_compression
+        )
+    return EventStorage(data_dir, layout=layout, trace_compression=trace_compression)
+
+
 class EventStorage:
-    def __init__(self, data_dir: Path):
+    def __init__(
+        self, data_dir: Path, layout: str = "flat", trace_compression: str = "none"
+    ):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown storage layout '{layout}'")
+        if trace_compression not in TRACE_COMPRESSIONS:
+            raise ValueError(f"Unknown trace compression '{trace_compression}'")
         self.data_dir = data_dir
+        self.layout = layout
+        self.trace_compression = trace_compression
         self.events_dir = data_dir / "events"
         self.articles_dir = data_dir / "articles"
         self.reflections_dir = data_dir / "reflections"
         self.events_dir.mkdir(parents=True, exist_ok=True)
         self.articles_dir.mkdir(parents=True, exist_ok=True)
         self.reflections_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_dir = data_dir / "archive" / "events"
+        self.archive_keys_path = self.archive_dir / "keys.json"
+        self.trace_research_dir = data_dir / "traces" / "research"
+        self.research_dir = data_dir / "research"
+        self.index_path = data_dir / ".index.json"
+        self.index_journal_path = data_dir / ".index.journal"
+        self.stats_path = data_dir / ".stats.json"
+        self._catalog: _Catalog | None = None
+        self._daily_stats: dict | None = None
+        self._stats_sources: dict | None = None
+        self._index_files: dict | None = None
+        self._archive_keys: _ArchiveKeys | None = None
+
+    @property
+    def catalog(self) -> _Catalog:
+        if self._catalog is None:
+            self._catalog = self._build_catalog()
+        return self._catalog
+
+    @property
+    def archive_keys(self) -> _ArchiveKeys:
+        if self._archive_keys is None:
+            try:
+                data = json.loads(self.archive_keys_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and data.get("version") == ARCHIVE_KEYS_VERSION:
+                self._archive_keys = _ArchiveKeys(
+                    data.get("names"), data.get("venue_dates")
+                )
+            else:
+                self._archive_keys = _ArchiveKeys()
+        return self._archive_keys
+
+    @property
+    def event_name_index(self) -> TrigramIndex:
+        return self.catalog.event_names
+
+    @property
+    def daily_stats(self) -> dict[str, dict[str, dict]]:
+        if self._daily_stats is None:
+            buckets, sources = self._read_stats()
+            if self._refresh_stats(buckets, sources):
+                self._write_stats(buckets, sources)
+            self._daily_stats = buckets
+            self._stats_sources = sources
+        return self._daily_stats
+
+    def _read_stats(self) -> tuple[dict, dict]:
+        try:
+            data = json.loads(self.stats_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}, {}
+        if not isinstance(data, dict) or data.get("version") != STATS_VERSION:
+            return {}, {}
+        return data.get("days", {}), data.get("sources", {})
+
+    def _write_stats(self, buckets: dict, sources: dict):
+        try:
+            self._write_json(
+                self.stats_path,
+                {"version": STATS_VERSION, "days": buckets, "sources": sources},
+                compact=True,
+            )
+        except OSError as e:
+            logger.warning("Could not write article stats: %s", e)
+
+    def _article_files(self) -> dict[str, tuple[int, int]]:
+        files = {}
+        for dirpath, _, names in os.walk(self.articles_dir):
+            for name in names:
+                path = Path(dirpath) / name
+                stat = path.stat()
+                files[self._rel(path)] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def _article_sources(self, slug: str, files: Mapping) -> list[str]:
+        rel = self._rel(self._article_path(slug))
+        stem = rel.removesuffix(".json")
+        return [rel, *(f"{stem}{s}" for s in TRACE_SUFFIXES if f"{stem}{s}" in files)]
+
+    def _fingerprint(self, rels: list[str]) -> dict:
+        fingerprint = {}
+        for rel in rels:
+            path = self.data_dir / rel
+            stat = path.stat()
+            fingerprint[rel] = [
+                stat.st_size,
+                stat.st_mtime_ns,
+                _blob_id(path.read_bytes()),
+            ]
+        return fingerprint
+
+    def _refresh_stats(self, buckets: dict, sources: dict) -> bool:
+        current = {
+            a["slug"]: (a.get("written_at", "")[:10], a.get("language", ""))
+            for a in self.iter_article_meta(("slug", "written_at", "language"))
+        }
+        counted = {
+            slug: (day, language)
+            for day, languages in buckets.items()
+            for language, bucket in languages.items()
+            for slug in bucket["slugs"]
+        }
+        files = self._article_files()
+        blobs = None
+        changed = False
+        stale = {key for slug, key in counted.items() if current.get(slug) != key}
+        for slug, key in current.items():
+            if slug not in counted:
+                stale.add(key)
+                continue
+            # An article or trace edited in place keeps its slug, so the
+            # files behind it are compared too, by stat or by git blob id.
+            fingerprint = sources.get(slug, {})
+            if set(fingerprint) != set(self._article_sources(slug, files)):
+                stale.add(key)
+                continue
+            for rel, entry in fingerprint.items():
+                if tuple(entry[:2]) == files[rel]:
+                    continue
+                if blobs is None:
+                    blobs = _git_blob_ids(self.data_dir)
+                if blobs.get(rel) == entry[2]:
+                    entry[:2] = files[rel]
+                    changed = True
+                else:
+                    stale.add(key)
+                    break
+        for slug in set(sources) - set(current):
+            del sources[slug]
+            changed = True
+        if not stale:
+            return changed
+
+        for day, language in stale:
+            buckets.get(day, {}).pop(language, None)
+        for article in self.iter_article_meta():
+            slug = article["slug"]
+            if current[slug] in stale:
+                self._count_article(buckets, article, self.get_trace(slug))
+                sources[slug] = self._fingerprint(self._article_sources(slug, files))
+        for day in [day for day, languages in buckets.items() if not languages]:
+            del buckets[day]
+        return True
+
+    def _count_article(self, buckets: dict, article: Mapping, trace: dict | None):
+        day = article.get("written_at", "")[:10]
+        languages = buckets.setdefault(day, {})
+        bucket = languages.setdefault(article.get("language", ""), empty_bucket())
+        add_article(bucket, article, trace)
+
+    def _article_counted(self, data: dict, trace: dict | None):
+        buckets, sources = self._daily_stats, self._stats_sources
+        if buckets is None or sources is None:
+            buckets, sources = self._read_stats()
+        self._count_article(buckets, data, trace)
+        slug = data["slug"]
+        article_path = self._article_path(slug)
+        rels = [self._rel(article_path)]
+        trace_path = self._trace_path(article_path)
+        if trace_path is not None:
+            rels.append(self._rel(trace_path))
+        sources[slug] = self._fingerprint(rels)
+        self._write_stats(buckets, sources)
+
+    def _period_buckets(self, start: str, end: str) -> Iterator[tuple[str, dict]]:
+        for day, languages in sorted(self.daily_stats.items()):
+            if start <= day <= end:
+                yield from languages.items()
+
+    def get_period_stats(
+        self, start: str, end: str, language: str | None = None
+    ) -> dict:
+        return merge_buckets(
+            bucket
+            for lang, bucket in self._period_buckets(start, end)
+            if not language or lang == language
+        )
+
+    def get_period_stats_by_language(self, start: str, end: str) -> dict[str, dict]:
+        by_language: dict[str, list[dict]] = {}
+        for lang, bucket in self._period_buckets(start, end):
+            by_language.setdefault(lang, []).append(bucket)
+        return {lang: merge_buckets(b) for lang, b in by_language.items()}
+
+    def _build_catalog(self) -> _Catalog:
+        cached = self._read_index()
+        journaled = self.index_journal_path.exists()
+        blobs = None
+        files = {}
+        for kind, directory, project in (
+            ("events", self.events_dir, dict),
+            ("articles", self.articles_dir, _article_meta),
+            ("reflections", self.reflections_dir, _reflection_meta),
+        ):
+            for entry in _scan_json(directory):
+                rel = Path(entry.path).relative_to(self.data_dir).as_posix()
+                stat = entry.stat()
+                hit = cached.get(rel)
+                if (
+                    hit
+                    and hit.get("size") == stat.st_size
+                    and hit.get("mtime_ns") == stat.st_mtime_ns
+                ):
+                    files[rel] = hit
+                    continue
+                if blobs is None:
+                    blobs = _git_blob_ids(self.data_dir)
+                blob = blobs.get(rel)
+                if hit and blob and hit.get("blob") == blob:
+                    record = hit["record"]
+                else:
+                    record = project(self._read_json(Path(entry.path)))
+                files[rel] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "blob": blob,
+                    "record": record,
+                }
+
+        self._index_files = files
+        if files != cached or journaled:
+            self._write_index()
+
+        catalog = _Catalog()
+        articles = []
+        for rel, entry in files.items():
+            kind = rel.split("/", 1)[0]
+            if kind == "events":
+                catalog.add_event(entry["record"], rel)
+            elif kind == "articles":
+                articles.append((entry["record"], rel))
+            else:
+                catalog.add_reflection(entry["record"])
+        articles.sort(key=lambda a: a[0].get("written_at", ""))
+        for article, rel in articles:
+            catalog.add_article(article, rel)
+        return catalog
+
+    def _read_index(self) -> dict:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            index = {}
+        files = index.get("files", {})
+        try:
+            lines = self.index_journal_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                rel, entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry is None:
+                files.pop(rel, None)
+            else:
+                files[rel] = entry
+        return files
+
+    def _write_index(self):
+        try:
+            self._write_json(
+                self.index_path,
+                {"version": INDEX_VERSION, "files": self._index_files},
+                compact=True,
+            )
+            self.index_journal_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not write storage index: %s", e)
+
+    def _append_index(self, changes: list[tuple[str, dict | None]]):
+        # Saves append to a journal that the next catalog build folds into
+        # the index, so a save does not rewrite the whole index.
+        lines = "".join(
+            json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for change in changes
+        )
+        try:
+            with open(self.index_journal_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning("Could not write storage index: %s", e)
+
+    def _index_entry(self, rel: str, path: Path, record: dict) -> tuple[str, dict]:
+        stat = path.stat()
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blob": _blob_id(path.read_bytes()),
+            "record": record,
+        }
+        self._index_files[rel] = entry
+        return rel, entry
+
+    def _index_files_saved(self, saved: list[tuple[str, Path, dict]]):
+        if self._index_files is None:
+            return
+        self._append_index(
+            [self._index_entry(rel, path, record) for rel, path, record in saved]
+        )
+
+    def _events_saved(self, saved: list[tuple[Path, dict]]):
+        catalog = self.catalog
+        indexed = []
+        for path, data in saved:
+            rel = self._rel(path)
+            catalog.add_event(data, rel)
+            indexed.append((rel, path, data))
+        self._index_files_saved(indexed)
+
+    def _article_saved(self, path: Path, data: dict):
+        rel = self._rel(path)
+        meta = _article_meta(data)
+        self.catalog.add_article(meta, rel)
+        self._index_files_saved([(rel, path, meta)])
+
+    def _reflection_saved(self, path: Path, data: dict):
+        meta = _reflection_meta(data)
+        self.catalog.add_reflection(meta)
+        self._index_files_saved([(self._rel(path), path, meta)])
+
+    def _events_archived(self, paths: list[Path]):
+        if self._index_files is not None:
+            removed = [self._rel(path) for path in paths]
+            for rel in removed:
+                self._index_files.pop(rel, None)
+            self._append_index([(rel, None) for rel in removed])
+        self._catalog = None
 
-    def _write_json(self, path: Path, data: dict):
-        content = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.data_dir).as_posix()
+
+    def _event_file(self, event_id: str) -> Path:
+        return self.data_dir / self.catalog.event_paths[event_id]
+
+    def _event_path(self, ev: dict) -> Path:
+        if self.layout == "partitioned":
+            return self.events_dir / _event_partition(ev) / f"{ev['id']}.json"
+        return self.events_dir / f"{ev['id']}.json"
+
+    def _new_article_path(self, article: dict) -> Path:
+        name = f"{article['slug']}.json"
+        if self.layout == "partitioned":
+            return self.articles_dir / _article_partition(article) / name
+        return self.articles_dir / name
+
+    def _article_path(self, slug: str) -> Path:
+        rel = self.catalog.article_paths.get(slug)
+        if rel:
+            return self.data_dir / rel
+        return self.articles_dir / f"{slug}.json"
+
+    def get_article(self, slug: str) -> dict | None:
+        path = self._article_path(slug)
+        if not path.exists():
+            return None
+        return self._read_json(path)
+
+    def migrate_layout(self, layout: str) -> int:
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown storage layout '{layout}'")
+        catalog = self.catalog
+        self.layout = layout
+        moves = []
+        for event_id, ev in catalog.events.items():
+            moves.append(
+                (self.data_dir / catalog.event_paths[event_id], self._event_path(ev))
+            )
+        for slug, meta in catalog.articles.items():
+            moves.append((self._article_path(slug), self._new_article_path(meta)))
+
+        moved = 0
+        renamed = {}
+        for src, dst in moves:
+            if src == dst:
+                continue
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(src, dst)
+            renamed[self._rel(src)] = self._rel(dst)
+            for suffix in TRACE_SUFFIXES:
+                trace_src = src.with_name(f"{src.stem}{suffix}")
+                if trace_src.exists():
+                    trace_dst = dst.with_name(f"{dst.stem}{suffix}")
+                    os.replace(trace_src, trace_dst)
+                    renamed[self._rel(trace_src)] = self._rel(trace_dst)
+            self._index_files[self._rel(dst)] = self._index_files.pop(self._rel(src))
+            moved += 1
+
+        for directory in (self.events_dir, self.articles_dir):
+            for root, dirs, files in os.walk(directory, topdown=False):
+                if Path(root) != directory and not os.listdir(root):
+                    os.rmdir(root)
+
+        if moved:
+            self._write_index()
+            self._catalog = None
+            self._stats_moved(renamed)
+        return moved
+
+    def _stats_moved(self, renamed: dict[str, str]):
+        buckets, sources = self._daily_stats, self._stats_sources
+        if buckets is None or sources is None:
+            buckets, sources = self._read_stats()
+        if not sources:
+            return
+        for fingerprint in sources.values():
+            for rel in [rel for rel in fingerprint if rel in renamed]:
+                fingerprint[renamed[rel]] = fingerprint.pop(rel)
+        self._write_stats(buckets, sources)
+
+    def _article_slug_taken(self, slug: str) -> bool:
+        return slug in self.catalog.articles
+
+    def _reflection_slug_taken(self, slug: str) -> bool:
+        return slug in self.catalog.reflections
+
+    def _read_json(self, path: Path) -> dict:
+        if path.suffix == ".gz":
+            return json.loads(gzip.decompress(path.read_bytes()))
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write_json(self, path: Path, data: dict, compact: bool = False):
+        if compact:
+            content = json.dumps(
+                data, ensure_ascii=False, separators=(",", ":"), default=str
+            )
+        else:
+            content = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+        encoded = content.encode("utf-8")
+        if path.suffix == ".gz":
+            encoded = gzip.compress(encoded, mtime=0)
+        path.parent.mkdir(parents=True, exist_ok=True)
         fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(content)
+            with os.fdopen(fd, "wb") as f:
+                f.write(encoded)
             os.replace(tmp, path)
         except:
             if os.path.exists(tmp):
                 os.unlink(tmp)
             raise
 
-    def _load_all_events(self) -> list[dict]:
-        results = []
-        for p in self.events_dir.glob("*.json"):
-            results.append(json.loads(p.read_text(encoding="utf-8")))
-        return results
-
-    def _load_all_articles(self) -> list[dict]:
-        results = []
-        for p in self.articles_dir.glob("*.json"):
-            results.append(json.loads(p.read_text(encoding="utf-8")))
-        return results
+    def _write_json_batch(self, items: list[tuple[Path, dict]]):
+        staged = []
+        try:
+            for path, data in items:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                staged.append(tmp)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+            for tmp, (path, _) in zip(staged, items):
+                os.replace(tmp, path)
+        except:
+            for tmp in staged:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            raise
+        for directory in {path.parent for path, _ in items}:
+            _fsync_dir(directory)
 
     def find_existing_event(self, name: str, venue: str, start_date: str) -> str | None:
-        name_norm = name.strip().lower()
-        venue_norm = venue.strip().lower()
-        for ev in self._load_all_events():
-            if ev.get("name", "").strip().lower() == name_norm:
-                return ev["id"]
-            if (
-                venue_norm
-                and start_date
-                and ev.get("venue", "").strip().lower() == venue_norm
-                and ev.get("start_date") == start_date
-            ):
-                return ev["id"]
-        return None
+        catalog = self.catalog
+        existing_id = catalog.event_by_name.get(_norm(name))
+        if existing_id:
+            return existing_id
+        venue_norm = _norm(venue)
+        if venue_norm and start_date:
+            existing_id = catalog.event_by_venue_date.get((venue_norm, start_date))
+            if existing_id:
+                return existing_id
+        return self.archive_keys.find(name, venue, start_date)
 
     def event_exists(self, name: str) -> bool:
-        name_norm = name.strip().lower()
-        for ev in self._load_all_events():
-            if ev.get("name", "").strip().lower() == name_norm:
-                return True
-        return False
+        return _norm(name) in self.catalog.event_by_name or self.archive_keys.has_name(
+            name
+        )
+
+    def find_similar_event(
+        self, name: str, start_date: str = "", end_date: str = ""
+    ) -> str | None:
+        for event_id, _ in self.event_name_index.query(name):
+            ev = self.get_event(event_id)
+            if ev and _dates_overlap(
+                (start_date, end_date), (ev.get("start_date"), ev.get("end_date"))
+            ):
+                return event_id
+        return None
 
     def get_all_event_names(self) -> list[str]:
-        return [ev.get("name", "") for ev in self._load_all_events() if ev.get("name")]
+        return [ev["name"] for ev in self.catalog.events.values() if ev.get("name")]
+
+    def get_all_event_categories(self) -> list[str]:
+        return [
+            ev["category"] for ev in self.catalog.events.values() if ev.get("category")
+        ]
 
     def save_event(self, event: EventCandidate) -> str:
-        existing_id = self.find_existing_event(
-            event.name, event.venue, event.start_date
-        )
-        if existing_id:
+        [(event_id, _)] = self.save_events([event])
+        return event_id
+
+    def save_events(self, events: Iterable[EventCandidate]) -> list[tuple[str, bool]]:
+        results = []
+        batch = _Catalog()
+        pending = []
+        for event in events:
+            existing_id = self.find_existing_event(
+                event.name, event.venue, event.start_date
+            ) or self._find_in_batch(batch, event)
+            if existing_id:
+                results.append((existing_id, True))
+                continue
+
+            data = self._event_data(event)
+            path = self._event_path(data)
+            batch.add_event(data, self._rel(path))
+            pending.append((path, data))
+            results.append((data["id"], False))
+
+        if pending:
+            self._write_json_batch(pending)
+            self._events_saved(pending)
+        return results
+
+    def _find_in_batch(self, batch: _Catalog, event: EventCandidate) -> str | None:
+        existing_id = batch.event_by_name.get(_norm(event.name))
+        if existing_id or not (_norm(event.venue) and event.start_date):
             return existing_id
+        return batch.event_by_venue_date.get((_norm(event.venue), event.start_date))
 
-        event_id = str(uuid.uuid4())
-        data = {
-            "id": event_id,
+    def _event_data(self, event: EventCandidate) -> dict:
+        return {
+            "id": str(uuid.uuid4()),
             "name": event.name,
             "start_date": event.start_date,
             "end_date": event.end_date,
@@ -136,8 +912,6 @@ class EventStorage:
             "event_url": event.event_url,
             "scouted_at": datetime.now().isoformat(),
         }
-        self._write_json(self.events_dir / f"{event_id}.json", data)
-        return event_id
 
     def save_article(self, event_id: str, article: ArticleOutput) -> tuple[str, str]:
         article_id = str(uuid.uuid4())
@@ -156,90 +930,176 @@ class EventStorage:
             "written_at": datetime.now().isoformat(),
             "event": event_data,
         }
-        self._write_json(self.articles_dir / f"{slug}.json", data)
+        path = self._new_article_path(data)
+        self._write_json(path, data)
+        self._article_saved(path, data)
 
+        trace_data = None
         if article.trace:
             trace_data = article.trace.model_dump(mode="json")
-            if trace_data.get("research_context"):
-                trace_data["research_context"] = {
-                    k: v[:500] if isinstance(v, str) else v
-                    for k, v in trace_data["research_context"].items()
-                }
-            self._write_json(self.articles_dir / f"{slug}.trace.json", trace_data)
+            self._write_trace(path, trace_data, article.body)
+        self._article_counted(data, trace_data)
 
         return article_id, slug
 
+    def compact_events(self, today: str | None = None) -> int:
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        expired = [
+            ev
+            for ev in self.iter_events()
+            if not _is_active(ev, today)
+            and next(self.iter_articles(event_id=ev["id"]), None) is None
+        ]
+        if not expired:
+            return 0
+
+        by_month: dict[str, list[dict]] = {}
+        for ev in expired:
+            by_month.setdefault(_event_partition(ev), []).append(ev)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        for partition, events in by_month.items():
+            path = self.archive_dir / f"{partition.replace('/', '-')}.jsonl.gz"
+            # A run that crashed after appending but before unlinking leaves
+            # these events in both places, so they are not appended twice.
+            archived = {ev.get("id") for ev in self._read_archive(path)}
+            lines = "".join(
+                json.dumps(ev, ensure_ascii=False, default=str) + "\n"
+                for ev in events
+                if ev["id"] not in archived
+            )
+            if not lines:
+                continue
+            with open(path, "ab") as f:
+                f.write(gzip.compress(lines.encode("utf-8")))
+                f.flush()
+                os.fsync(f.fileno())
+
+        keys = self.archive_keys
+        for ev in expired:
+            keys.add(ev)
+        self._write_json(
+            self.archive_keys_path,
+            {
+                "version": ARCHIVE_KEYS_VERSION,
+                "names": keys.names,
+                "venue_dates": keys.venue_dates,
+            },
+            compact=True,
+        )
+
+        paths = [self._event_file(ev["id"]) for ev in expired]
+        for path in paths:
+            path.unlink(missing_ok=True)
+        self._events_archived(paths)
+        return len(expired)
+
+    def iter_archived_events(self) -> Iterator[dict]:
+        if not self.archive_dir.exists():
+            return
+        for path in sorted(self.archive_dir.glob("*.jsonl.gz")):
+            yield from self._read_archive(path)
+
+    def _read_archive(self, path: Path) -> Iterator[dict]:
+        if not path.exists():
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
     def is_already_covered(
         self, name: str, venue: str, start_date: str, language: str = ""
     ) -> bool:
-        for article in self._load_all_articles():
-            if language and article.get("language") != language:
-                continue
-            event = article.get("event", {})
-            name_match = event.get("name", "").lower() == name.lower()
-            venue_date_match = (
-                event.get("venue", "").lower() == venue.lower()
-                and event.get("start_date") == start_date
-            )
-            if name_match or venue_date_match:
+        catalog = self.catalog
+        for languages in (
+            catalog.covered_names.get(_norm(name)),
+            catalog.covered_venue_dates.get((_norm(venue), start_date)),
+        ):
+            if languages and (not language or language in languages):
                 return True
         return False
 
     def has_article_in_language(self, event_id: str, language: str) -> bool:
-        for article in self._load_all_articles():
-            if (
-                article.get("event_id") == event_id
-                and article.get("language") == language
-            ):
-                return True
-        return False
+        matches = self.iter_articles(event_id=event_id, language=language)
+        return next(matches, None) is not None
+
+    def iter_events(
+        self, active_on: str | None = None, category: str | None = None
+    ) -> Iterator[dict]:
+        catalog = self.catalog
+        partition = _month_partition(active_on)
+        if active_on and partition != UNDATED_PARTITION:
+            event_ids = catalog.events_from(partition)
+        else:
+            event_ids = iter(catalog.events)
+        for event_id in event_ids:
+            ev = catalog.events[event_id]
+            if category and ev.get("category") != category:
+                continue
+            if active_on and not _is_active(ev, active_on):
+                continue
+            yield dict(ev)
+
+    def iter_articles(
+        self,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        event_id: str | None = None,
+    ) -> Iterator[ArticleRecord]:
+        catalog = self.catalog
+        if event_id is not None:
+            slugs = catalog.articles_by_event.get(event_id, [])
+        else:
+            by_written_at = catalog.articles_by_written_at
+            lo = bisect.bisect_left(by_written_at, (since, "")) if since else 0
+            hi = (
+                bisect.bisect_right(by_written_at, (until + "\uffff", ""))
+                if until
+                else len(by_written_at)
+            )
+            slugs = [slug for _, slug in by_written_at[lo:hi]]
+
+        for slug in slugs:
+            meta = catalog.articles[slug]
+            if language and meta.get("language") != language:
+                continue
+            written_at = meta.get("written_at", "")
+            if since and written_at < since:
+                continue
+            if until and written_at[:10] > until:
+                continue
+            yield self._article_record(slug)
 
     def get_available_events(
         self, today: str | None = None, language: str = ""
     ) -> list[dict]:
         today = today or datetime.now().strftime("%Y-%m-%d")
-        all_events = self._load_all_events()
-        all_articles = self._load_all_articles()
-
-        covered_ids = set()
-        for article in all_articles:
-            if language and article.get("language") != language:
-                continue
-            covered_ids.add(article.get("event_id"))
+        catalog = self.catalog
 
         results = []
-        for ev in all_events:
-            if ev["id"] in covered_ids:
+        for ev in self.iter_events(active_on=today):
+            languages = catalog.article_languages.get(ev["id"])
+            if languages and (not language or language in languages):
                 continue
-            end = ev.get("end_date", "")
-            start = ev.get("start_date", "")
-            if end and end >= today:
-                results.append(ev)
-            elif start and start >= today:
-                results.append(ev)
-            elif not start and not end:
-                results.append(ev)
+            results.append(ev)
 
         results.sort(key=lambda e: e.get("scouted_at", ""), reverse=True)
         return results
 
     def get_recent_categories(self, days: int = 7) -> list[str]:
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        articles = self._load_all_articles()
-        recent = [a for a in articles if a.get("written_at", "") > cutoff]
-        recent.sort(key=lambda a: a.get("written_at", ""), reverse=True)
+        recent = self.catalog.articles_written_after(cutoff)
         categories = []
-        for a in recent:
-            cat = a.get("event", {}).get("category", "")
+        for a in reversed(recent):
+            cat = (a.get("event") or {}).get("category", "")
             if cat:
                 categories.append(cat)
         return categories
 
     def get_event(self, event_id: str) -> dict | None:
-        path = self.events_dir / f"{event_id}.json"
-        if not path.exists():
-            return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        ev = self.catalog.events.get(event_id)
+        return dict(ev) if ev is not None else None
 
     def event_to_candidate(self, row: dict) -> EventCandidate:
         return EventCandidate(
@@ -254,14 +1114,28 @@ class EventStorage:
             event_url=row["event_url"] or "",
         )
 
-    def get_articles_in_period(self, start: str, end: str, language: str) -> list[dict]:
-        articles = self._load_all_articles()
-        return [
-            a
-            for a in articles
-            if a.get("language") == language
-            and start <= a.get("written_at", "")[:10] <= end
-        ]
+    def get_articles_in_period(
+        self, start: str, end: str, language: str
+    ) -> list[ArticleRecord]:
+        return list(self.iter_articles(language=language, since=start, until=end))
+
+    def iter_article_meta(
+        self, fields: Iterable[str] | None = None
+    ) -> Iterator[ArticleRecord]:
+        for _, slug in self.catalog.articles_by_written_at:
+            yield self._article_record(slug, fields)
+
+    def _article_record(
+        self, slug: str, fields: Iterable[str] | None = None
+    ) -> ArticleRecord:
+        meta = self.catalog.articles[slug]
+        if fields is not None:
+            meta = {k: meta[k] for k in fields if k in meta}
+        return ArticleRecord(
+            meta,
+            lambda: self._read_json(self._article_path(slug)),
+            lambda: self.get_trace(slug),
+        )
 
     def save_reflection(self, reflection: ReflectionOutput) -> tuple[str, str]:
         reflection_id = str(uuid.uuid4())
@@ -281,48 +1155,152 @@ class EventStorage:
             "model_used": reflection.model_used,
             "written_at": datetime.now().isoformat(),
         }
-        self._write_json(self.reflections_dir / f"{slug}.json", data)
+        path = self.reflections_dir / f"{slug}.json"
+        self._write_json(path, data)
+        self._reflection_saved(path, data)
         return reflection_id, slug
 
     def get_latest_reflection(self, language: str) -> dict | None:
-        reflections = [
-            r for r in self._load_all_reflections() if r.get("language") == language
-        ]
-        if not reflections:
-            return None
-        reflections.sort(key=lambda r: r.get("written_at", ""), reverse=True)
-        return reflections[0]
+        return self.get_latest_reflections([language])[language]
 
-    def _load_all_reflections(self) -> list[dict]:
-        results = []
-        for p in self.reflections_dir.glob("*.json"):
-            results.append(json.loads(p.read_text(encoding="utf-8")))
-        return results
+    def get_latest_reflections(
+        self, languages: Iterable[str], days: int | None = None
+    ) -> dict[str, dict | None]:
+        latest: dict[str, dict | None] = dict.fromkeys(languages)
+        for r in self.catalog.reflections.values():
+            lang = r.get("language")
+            if lang not in latest or (days and _period_days(r) != days):
+                continue
+            if latest[lang] is None or r.get("written_at", "") > latest[lang].get(
+                "written_at", ""
+            ):
+                latest[lang] = r
+        return {
+            lang: self._read_json(self.reflections_dir / f"{r['slug']}.json")
+            if r
+            else None
+            for lang, r in latest.items()
+        }
 
     def _unique_reflection_slug(self, base: str, reflection_id: str) -> str:
         if not base:
             base = f"reflection-{reflection_id}"
-        existing = {p.stem for p in self.reflections_dir.glob("*.json")}
         slug = base
         n = 2
-        while slug in existing:
+        while self._reflection_slug_taken(slug):
             slug = f"{base}-{n}"
             n += 1
         return slug
 
+    def _trace_path(self, article_path: Path) -> Path | None:
+        for suffix in TRACE_SUFFIXES:
+            path = article_path.with_name(f"{article_path.stem}{suffix}")
+            if path.exists():
+                return path
+        return None
+
+    def _research_path(self, key: str) -> Path:
+        suffix = ".json.gz" if self.trace_compression == "gzip" else ".json"
+        return self.trace_research_dir / f"{key}{suffix}"
+
+    def _store_research(self, key: str, research: dict):
+        if not any(
+            (self.trace_research_dir / f"{key}{suffix}").exists()
+            for suffix in (".json.gz", ".json")
+        ):
+            self._write_json(self._research_path(key), research, compact=True)
+
+    def _write_trace(self, article_path: Path, trace: dict, body: str):
+        packed, research = pack_trace(trace, body)
+        if research is not None:
+            self._store_research(packed["research_ref"], research)
+        if self.trace_compression == "gzip":
+            path = article_path.with_name(f"{article_path.stem}.trace.json.gz")
+            self._write_json(path, packed, compact=True)
+        else:
+            path = article_path.with_name(f"{article_path.stem}.trace.json")
+            self._write_json(path, packed)
+        for suffix in TRACE_SUFFIXES:
+            stale = article_path.with_name(f"{article_path.stem}{suffix}")
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+    def _read_research(self, key: str) -> dict | None:
+        for suffix in (".json.gz", ".json"):
+            path = self.trace_research_dir / f"{key}{suffix}"
+            if path.exists():
+                return self._read_json(path)
+        return None
+
+    def save_research(self, event_id: str, context: ResearchContext):
+        research = context.model_dump(mode="json", exclude={"stages"})
+        key = research_key(research)
+        self._store_research(key, research)
+        self._write_json(
+            self.research_dir / f"{event_id}.json",
+            {
+                "event_id": event_id,
+                "researched_at": datetime.now().isoformat(),
+                "research_ref": key,
+                "sources": len(context.raw_sources),
+            },
+        )
+
+    def get_research(
+        self, event_id: str, max_age_days: float | None = None
+    ) -> ResearchContext | None:
+        path = self.research_dir / f"{event_id}.json"
+        if not path.exists():
+            return None
+        record = self._read_json(path)
+        if max_age_days is not None:
+            age = datetime.now() - datetime.fromisoformat(record["researched_at"])
+            if age > timedelta(days=max_age_days):
+                return None
+        research = self._read_research(record["research_ref"])
+        if research is None:
+            return None
+        # Reused research was paid for by an earlier run; its stages are not
+        # carried into new traces.
+        research.pop("stages", None)
+        return ResearchContext(**research)
+
     def get_trace(self, slug: str) -> dict | None:
-        trace_path = self.articles_dir / f"{slug}.trace.json"
-        if not trace_path.exists():
+        article_path = self._article_path(slug)
+        trace_path = self._trace_path(article_path)
+        if trace_path is None:
             return None
-        return json.loads(trace_path.read_text(encoding="utf-8"))
+        trace = self._read_json(trace_path)
+        if trace.get("format") != TRACE_FORMAT:
+            return trace
+        body = self._read_json(article_path).get("body", "")
+        research = None
+        if trace.get("research_ref"):
+            research = self._read_research(trace["research_ref"])
+        return unpack_trace(trace, body, research)
+
+    def pack_traces(self) -> int:
+        packed = 0
+        for article in list(self.iter_article_meta(("slug",))):
+            slug = article["slug"]
+            article_path = self._article_path(slug)
+            trace_path = self._trace_path(article_path)
+            if trace_path is None:
+                continue
+            trace = self._read_json(trace_path)
+            if trace.get("format") == TRACE_FORMAT:
+                continue
+            body = self._read_json(article_path).get("body", "")
+            self._write_trace(article_path, trace, body)
+            packed += 1
+        return packed
 
     def _unique_slug(self, base: str, article_id: str) -> str:
         if not base:
             base = f"article-{article_id}"
-        existing = {p.stem for p in self.articles_dir.glob("*.json")}
         slug = base
         n = 2
-        while slug in existing:
+        while self._article_slug_taken(slug):
             slug = f"{base}-{n}"
             n += 1
         return slug
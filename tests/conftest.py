@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+
+from models import ArticleOutput, PipelineTrace
+
+
+@pytest.fixture
+def make_article():
+    def make(event, title="T", language="en", word_count=50, **fields):
+        values = {
+            "title": title,
+            "lead": "Lead",
+            "body": "Body " * word_count,
+            "event": event,
+            "language": language,
+            "word_count": word_count,
+            "model_used": "test",
+            "generated_at": datetime.now(),
+            "trace": PipelineTrace(draft_text="draft", draft_word_count=40),
+        }
+        values.update(fields)
+        return ArticleOutput(**values)
+
+    return make
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    def count(storage):
+        parsed = []
+        original = storage._read_json
+        monkeypatch.setattr(
+            storage, "_read_json", lambda p: parsed.append(p.name) or original(p)
+        )
+        return parsed
+
+    return count
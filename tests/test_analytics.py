@@ -0,0 +1,69 @@
+import random
+import statistics
+
+from analytics import add_article, empty_bucket, median_words, merge_buckets
+
+
+def _article(slug, word_count, venue="V", category="music", event_id="e1"):
+    return {
+        "slug": slug,
+        "title": slug.title(),
+        "word_count": word_count,
+        "event_id": event_id,
+        "event": {"venue": venue, "category": category},
+    }
+
+
+def _trace(research_seconds=0.0):
+    research = [{"stage": "research:artist", "seconds": research_seconds}]
+    return {
+        "critique_issues": [{}, {}],
+        "draft_word_count": 100,
+        "research_context": {"stages": research if research_seconds else []},
+        "stages": [{"stage": "draft", "seconds": 10.0, "cost_usd": 0.1}],
+    }
+
+
+class TestMedian:
+    def test_matches_statistics_median(self):
+        rng = random.Random(1)
+        for n in range(1, 40):
+            values = [rng.randint(200, 260) for _ in range(n)]
+            bucket = empty_bucket()
+            for i, wc in enumerate(values):
+                add_article(bucket, _article(f"a{i}", wc), None)
+            assert median_words(bucket["word_counts"]) == int(statistics.median(values))
+
+    def test_empty(self):
+        assert median_words({}) == 0
+
+
+class TestMergeBuckets:
+    def test_counts_add_up(self):
+        first, second = empty_bucket(), empty_bucket()
+        add_article(first, _article("a", 100, venue="Berghain"), _trace(1.0))
+        add_article(second, _article("b", 150, venue="Berghain"), _trace(1.0))
+        add_article(second, _article("c", 80, category="film", event_id="e2"), None)
+
+        merged = merge_buckets([first, second])
+        assert merged["article_count"] == 3
+        assert merged["total_words"] == 330
+        assert merged["categories"] == {"music": 2, "film": 1}
+        assert merged["venues"] == {"Berghain": 2, "V": 1}
+        assert merged["traced"] == 2
+        assert merged["critique_issues"] == 4
+        assert merged["word_growth_sum"] == 50.0
+        assert merged["stages"]["draft"]["count"] == 2
+        assert list(merged["research"]) == ["e1"]
+        assert merged["longest"]["slug"] == "b"
+        assert merged["shortest"]["slug"] == "c"
+
+    def test_ties_follow_written_order(self):
+        buckets = []
+        for slug in ["a", "b", "c"]:
+            bucket = empty_bucket()
+            add_article(bucket, _article(slug, 100), None)
+            buckets.append(bucket)
+        merged = merge_buckets(buckets)
+        assert merged["longest"]["slug"] == "c"
+        assert merged["shortest"]["slug"] == "a"
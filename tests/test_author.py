@@ -1,7 +1,20 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
 import pytest
 
-from models import EventCandidate, ResearchContext
-from agents.author import _build_user_message, _build_critic_message, LANGUAGE_NOTES
+import agents.author
+from models import EventCandidate, ResearchContext, StageMetrics
+from agents.author import (
+    _build_user_message,
+    _build_critic_message,
+    _build_language_instructions,
+    _load_author_prompt,
+    _StreamedWordCount,
+    write_article,
+    LANGUAGE_NOTES,
+)
 
 
 @pytest.fixture
@@ -62,31 +75,80 @@ class TestBuildUserMessage:
         assert "Research context" not in msg
 
 
+def _text(blocks):
+    return "\n".join(b["text"] for b in blocks)
+
+
 class TestBuildCriticMessage:
     def test_contains_draft(self, event):
-        msg = _build_critic_message(
-            "This is the draft essay.", event, ResearchContext()
+        msg = _text(
+            _build_critic_message("This is the draft essay.", event, ResearchContext())
         )
         assert "This is the draft essay." in msg
 
     def test_contains_event_for_fact_checking(self, event, context):
-        msg = _build_critic_message("Draft.", event, context)
+        msg = _text(_build_critic_message("Draft.", event, context))
         assert "Ryoji Ikeda" in msg
         assert "Martin-Gropius-Bau" in msg
         assert "exhibition" in msg
 
     def test_contains_research_context(self, event, context):
-        msg = _build_critic_message("Draft.", event, context)
+        msg = _text(_build_critic_message("Draft.", event, context))
         assert "Artist background" in msg
         assert "Venue context" in msg
 
     def test_truncates_long_context(self, event):
         long_ctx = ResearchContext(artist_background="x" * 5000)
-        msg = _build_critic_message("Draft.", event, long_ctx)
+        msg = _text(_build_critic_message("Draft.", event, long_ctx))
         x_count = msg.count("x")
         assert x_count <= 1010
         assert x_count < 5000
 
+    def test_sources_cached_before_draft(self, event, context):
+        blocks = _build_critic_message("Draft.", event, context)
+        assert "cache_control" in blocks[0]
+        assert "Draft." not in blocks[0]["text"]
+        assert "Draft." in blocks[-1]["text"]
+        assert "cache_control" not in blocks[-1]
+
+
+class TestPromptCaching:
+    def test_system_prompt_is_language_neutral(self):
+        prompt = _load_author_prompt()
+        assert "{language" not in prompt
+        assert all(note not in prompt for note in LANGUAGE_NOTES.values())
+
+    def test_language_instructions(self):
+        assert "Write in German." in _build_language_instructions("de")
+        assert LANGUAGE_NOTES["ru"] in _build_language_instructions("ru")
+
+    def test_stable_prefix_is_cached(self, event, context, monkeypatch):
+        client = FakeAsyncClient()
+        monkeypatch.setattr(agents.author, "get_anthropic_client", lambda: client)
+        asyncio.run(write_article(event, language="de", context=context))
+
+        draft = client.requests[0]
+        assert "cache_control" in draft["system"][-1]
+        research, language = draft["messages"][0]["content"]
+        assert "cache_control" in research
+        assert "Ryoji Ikeda is a Japanese artist" in research["text"]
+        assert "cache_control" not in language
+        assert "Write in German." in language["text"]
+
+        critique = client.requests[1]
+        assert "cache_control" in critique["system"][-1]
+
+    def test_cache_usage_recorded(self, event, context, monkeypatch):
+        client = FakeAsyncClient(
+            usage=SimpleNamespace(
+                cache_read_input_tokens=1500, cache_creation_input_tokens=200
+            )
+        )
+        monkeypatch.setattr(agents.author, "get_anthropic_client", lambda: client)
+        article = asyncio.run(write_article(event, language="en", context=context))
+        assert article.trace.cache_read_tokens == 3000
+        assert article.trace.cache_write_tokens == 400
+
 
 class TestLanguageNotes:
     def test_all_languages_present(self):
@@ -104,3 +166,207 @@ class TestLanguageNotes:
         assert (
             "Eigennamen" in LANGUAGE_NOTES["de"] or "Original" in LANGUAGE_NOTES["de"]
         )
+
+
+class FakeStream:
+    def __init__(self, client, response, chunk_size):
+        self.client = client
+        self.response = response
+        self.chunk_size = chunk_size
+
+    async def __aenter__(self):
+        self.client.active += 1
+        self.client.peak = max(self.client.peak, self.client.active)
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.client.active -= 1
+
+    async def __aiter__(self):
+        block = self.response.content[0]
+        if block.type == "text":
+            raw, field = block.text, "text"
+            kind = "text_delta"
+        else:
+            raw, field = json.dumps(block.input), "partial_json"
+            kind = "input_json_delta"
+        for i in range(0, len(raw), self.chunk_size):
+            await asyncio.sleep(0.001)
+            delta = SimpleNamespace(type=kind, **{field: raw[i : i + self.chunk_size]})
+            yield SimpleNamespace(type="content_block_delta", delta=delta)
+
+    async def get_final_message(self):
+        return self.response
+
+
+class FakeAsyncClient:
+    def __init__(self, critique=None, body_words=500, usage=None):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.requests = []
+        self.usage = usage
+        self.messages = self
+        self.with_raw_response = SimpleNamespace(create=self._create_raw)
+        self.critique = critique or {
+            "overall_assessment": "fine",
+            "issues": [],
+            "title": "Title",
+            "lead": "Lede",
+            "revised_text": "word " * 500,
+        }
+        self.bodies = body_words if isinstance(body_words, list) else [body_words]
+
+    def _respond(self, kwargs):
+        tool = kwargs["tools"][0]["name"] if kwargs.get("tools") else None
+        self.calls.append(tool or "text")
+        self.requests.append(kwargs)
+        if tool == "submit_critique":
+            block = SimpleNamespace(type="tool_use", name=tool, input=self.critique)
+        elif tool == "submit_headline":
+            block = SimpleNamespace(
+                type="tool_use",
+                name=tool,
+                input={"title": '"Fallback"', "lead": "Fallback lede"},
+            )
+        else:
+            words = self.bodies.pop(0) if len(self.bodies) > 1 else self.bodies[0]
+            block = SimpleNamespace(type="text", text="word " * words)
+        return SimpleNamespace(content=[block], usage=self.usage)
+
+    async def create(self, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return self._respond(kwargs)
+
+    async def _create_raw(self, **kwargs):
+        response = await self.create(**kwargs)
+        return SimpleNamespace(parse=lambda: response, retries_taken=0)
+
+    def stream(self, **kwargs):
+        return FakeStream(self, self._respond(kwargs), chunk_size=50)
+
+
+class TestAsyncGeneration:
+    def test_languages_overlap_on_shared_client(self, event, context, monkeypatch):
+        client = FakeAsyncClient()
+        monkeypatch.setattr(agents.author, "get_anthropic_client", lambda: client)
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    write_article(event, language=lang, context=context)
+                    for lang in ["en", "de", "ru"]
+                )
+            )
+
+        articles = asyncio.run(run())
+        assert [a.language for a in articles] == ["en", "de", "ru"]
+        assert all(a.title == "Title" for a in articles)
+        assert client.peak == 3
+
+
+class TestHeadline:
+    def _write(self, client, event, context, monkeypatch):
+        monkeypatch.setattr(agents.author, "get_anthropic_client", lambda: client)
+        return asyncio.run(write_article(event, language="en", context=context))
+
+    def test_critic_supplies_title_and_lead(self, event, context, monkeypatch):
+        client = FakeAsyncClient()
+        article = self._write(client, event, context, monkeypatch)
+        assert (article.title, article.lead) == ("Title", "Lede")
+        assert client.calls == ["text", "submit_critique"]
+
+    def test_single_headline_call_when_critic_fails(self, event, context, monkeypatch):
+        client = FakeAsyncClient(critique={"revised_text": "too short"})
+        article = self._write(client, event, context, monkeypatch)
+        assert (article.title, article.lead) == ("Fallback", "Fallback lede")
+        assert client.calls == ["text", "submit_critique", "submit_headline"]
+
+    def test_lead_regenerated_after_expansion(self, event, context, monkeypatch):
+        critique = {
+            "overall_assessment": "fine",
+            "issues": [],
+            "title": "Title",
+            "lead": "Stale lede",
+            "revised_text": "word " * 100,
+        }
+        client = FakeAsyncClient(critique=critique, body_words=900)
+        article = self._write(client, event, context, monkeypatch)
+        assert article.title == "Title"
+        assert article.lead != "Stale lede"
+        assert article.trace.expanded
+        assert client.calls == ["text", "submit_critique", "text", "text"]
+
+
+class TestStreaming:
+    def _write(self, client, event, context, monkeypatch):
+        monkeypatch.setattr(agents.author, "get_anthropic_client", lambda: client)
+        return asyncio.run(write_article(event, language="en", context=context))
+
+    def test_word_count_from_partial_json(self):
+        counter = _StreamedWordCount("revised_text")
+        assert counter.feed('{"title": "T", "revi') == 0
+        assert counter.feed('sed_text": "one two') == 2
+        assert counter.feed(" three\\n\\nfour") == 4
+        assert counter.feed("th fi") == 5
+        assert counter.feed('ve \\"six\\"", "lede": "not counted at all') == 6
+        assert counter.feed(" more words") == 6
+
+    def test_stages_recorded(self, event, context, monkeypatch):
+        article = self._write(FakeAsyncClient(), event, context, monkeypatch)
+        stages = article.trace.stages
+        assert [s.stage for s in stages] == ["draft", "critique"]
+        assert all(s.time_to_first_token is not None for s in stages)
+        assert all(s.model for s in stages)
+
+    def test_short_draft_expands_alongside_critic(self, event, context, monkeypatch):
+        critique = {
+            "overall_assessment": "fine",
+            "issues": [],
+            "title": "Title",
+            "lead": "Lede",
+            "revised_text": "word " * 120,
+        }
+        client = FakeAsyncClient(critique=critique, body_words=[100, 900])
+        article = self._write(client, event, context, monkeypatch)
+        assert article.trace.expanded
+        assert article.word_count == 900
+        assert client.calls.count("submit_critique") == 1
+        assert client.calls.count("text") == 3
+        assert client.calls.index("submit_critique") < 2
+        assert "expansion" in [s.stage for s in article.trace.stages]
+
+    def test_long_revision_cancels_expansion(self, event, context, monkeypatch):
+        client = FakeAsyncClient(body_words=[100, 5000])
+        article = self._write(client, event, context, monkeypatch)
+        assert not article.trace.expanded
+        assert article.word_count == 500
+        assert client.calls.count("text") == 2
+        assert "expansion" not in [s.stage for s in article.trace.stages]
+
+    def test_failed_unneeded_expansion_is_ignored(self, event, context, monkeypatch):
+        async def fail(*args):
+            raise RuntimeError("overloaded")
+
+        monkeypatch.setattr(agents.author, "_expand", fail)
+        client = FakeAsyncClient(body_words=100)
+        article = self._write(client, event, context, monkeypatch)
+        assert article.word_count == 500
+        assert not article.trace.expanded
+
+    def test_finished_unneeded_expansion_is_recorded(self, event, context, monkeypatch):
+        async def expand(*args):
+            return None, StageMetrics(stage="expansion", output_tokens=900)
+
+        monkeypatch.setattr(agents.author, "_expand", expand)
+        client = FakeAsyncClient(body_words=100)
+        article = self._write(client, event, context, monkeypatch)
+        assert not article.trace.expanded
+        discarded = [
+            s for s in article.trace.stages if s.stage == "expansion_discarded"
+        ]
+        assert discarded[0].output_tokens == 900
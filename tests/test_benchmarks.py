@@ -0,0 +1,110 @@
+import asyncio
+from collections import Counter
+from datetime import date
+
+from benchmarks import storage_scale
+from benchmarks.corpus import generate_corpus
+from benchmarks.pipeline import DEFAULT_CASSETTE, run_benchmark
+from benchmarks.replay import Cassette, ReplayAnthropic, request_key
+from storage import EventStorage, generate_slug
+
+PROFILE = {
+    "categories": Counter({"music": 3, "exhibition": 1}),
+    "venues": Counter({"Berghain": 2, "Martin-Gropius-Bau": 1}),
+    "languages": Counter({"en": 1, "de": 1, "ru": 1}),
+    "articles_per_event": 2.6,
+    "covered_share": 0.6,
+    "word_count_mean": 300,
+    "word_count_stdev": 50,
+    "title_words": {
+        "en": ["Night", "Sound", "Room"],
+        "de": ["Über", "Straße", "Klang"],
+        "ru": ["Ночь", "Звук", "Берлин"],
+    },
+    "body_words": {"en": ["word"], "de": ["Wort"], "ru": ["слово"]},
+}
+
+
+def _message(tool_input):
+    return {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "model": "m",
+        "content": [
+            {"type": "tool_use", "id": "toolu_1", "name": "t", "input": tool_input}
+        ],
+        "stop_reason": "tool_use",
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+
+
+class TestReplay:
+    def test_request_key(self):
+        assert request_key({"tool_choice": {"name": "choose_event"}}) == "choose_event"
+        assert request_key({"max_tokens": 512}) == "text:512"
+
+    def test_dates_shifted_to_today(self):
+        cassette = Cassette(
+            {
+                "recorded_at": "2026-01-01",
+                "anthropic": {
+                    "submit_events": [
+                        _message({"events": [{"start_date": "2026-01-03"}]})
+                    ]
+                },
+            }
+        )
+        client = ReplayAnthropic(cassette, today=date(2026, 2, 1))
+        message = asyncio.run(client.create(tool_choice={"name": "submit_events"}))
+        assert message.content[0].input["events"][0]["start_date"] == "2026-02-03"
+
+    def test_choice_points_at_offered_event(self):
+        offered = "123e4567-e89b-12d3-a456-426614174000"
+        cassette = Cassette(
+            {"anthropic": {"choose_event": [_message({"chosen_event_id": "gone"})]}}
+        )
+        client = ReplayAnthropic(cassette)
+        message = asyncio.run(
+            client.create(
+                tool_choice={"name": "choose_event"},
+                messages=[{"role": "user", "content": f'[{{"id": "{offered}"}}]'}],
+            )
+        )
+        assert message.content[0].input["chosen_event_id"] == offered
+
+
+class TestPipelineBenchmark:
+    def test_replays_full_pipeline(self):
+        report = asyncio.run(
+            run_benchmark(Cassette.load(DEFAULT_CASSETTE), ["en", "de"])
+        )
+        assert list(report["phases"]) == ["scout", "curate", "author", "reflect"]
+        assert report["llm_calls"]["submit_critique"] == 2
+        assert report["phases"]["author"]["storage_io"]["writes"] > 0
+        assert report["event_loop"]["max_lag_ms"] >= 0
+
+
+class TestCorpus:
+    def test_generates_loadable_corpus(self, tmp_path):
+        summary = generate_corpus(
+            tmp_path, 60, years=1, layout="partitioned", profile=PROFILE
+        )
+        storage = EventStorage(tmp_path, layout="partitioned")
+        articles = list(storage.iter_article_meta())
+        assert len(articles) == summary["articles"] == 60
+        assert len(list(storage.iter_events())) == summary["events"]
+        assert all(a["slug"] == generate_slug(a["slug"]) for a in articles)
+
+        per_event = {}
+        for a in articles:
+            per_event.setdefault(a["event_id"], []).append(a["language"])
+        assert all(len(set(langs)) == len(langs) for langs in per_event.values())
+
+    def test_storage_report(self, monkeypatch):
+        monkeypatch.setattr(storage_scale, "load_profile", lambda _: PROFILE)
+        report = storage_scale.run([40], years=1, repeat=1)
+        results = report["sizes"]["40"]["results"]
+        for name in ["open_cold", "find_similar_event", "save_article", "cli_compact"]:
+            assert results[name]["seconds"] >= 0
+        assert results["iter_article_meta"]["result_size"] == 40
@@ -0,0 +1,114 @@
+from datetime import date
+
+from models import EventCandidate
+from sources.candidate_filter import (
+    candidate_dates,
+    extract_dates,
+    is_non_event,
+    select_candidates,
+    source_credibility,
+    strip_boilerplate,
+)
+
+TODAY = date(2026, 2, 10)
+
+
+def _candidate(name, url, snippet=""):
+    return EventCandidate(
+        name=name,
+        venue="",
+        category="",
+        description="",
+        source_url=url,
+        raw_snippet=snippet,
+    )
+
+
+class TestExtractDates:
+    def test_formats(self):
+        text = "2026-02-12, 14.02.2026, 15.2., 16. Februar, Feb 17th, 18 March 2026"
+        assert extract_dates(text, TODAY) == [
+            date(2026, 2, 12),
+            date(2026, 2, 14),
+            date(2026, 2, 15),
+            date(2026, 2, 16),
+            date(2026, 2, 17),
+            date(2026, 3, 18),
+        ]
+
+    def test_year_rolls_over(self):
+        assert extract_dates("January 5", date(2026, 12, 20)) == [date(2027, 1, 5)]
+
+    def test_ignores_invalid(self):
+        assert extract_dates("31.02.2026 version 3.5 of 2026", TODAY) == []
+
+    def test_candidate_dates_read_name_and_snippet(self):
+        candidate = _candidate(
+            "Berlinale 2027", "https://berlinale.de", "11.02.2027 – 21.02.2027"
+        )
+        assert candidate_dates(candidate, TODAY) == [
+            date(2027, 2, 11),
+            date(2027, 2, 21),
+        ]
+
+
+class TestClassification:
+    def test_non_event_urls(self):
+        assert is_non_event("https://en.wikipedia.org/wiki/Berghain")
+        assert is_non_event("https://www.tip-berlin.de/news/politik")
+        assert not is_non_event("https://www.tip-berlin.de/events/konzert")
+
+    def test_source_credibility(self):
+        assert source_credibility("https://ra.co/events/1") == 0.0
+        assert source_credibility("https://www.residentadvisor.net/events/1") == 2.0
+        assert source_credibility("https://www.exberliner.com/whats-on/") == 1.0
+        assert source_credibility("https://notexberliner.com/") == 0.0
+
+
+class TestStripBoilerplate:
+    def test_removes_navigation_and_links(self):
+        markdown = (
+            "[Skip to content](#main)\n"
+            "![logo](https://x/logo.png)\n"
+            "# Menu\n"
+            "Accept all cookies\n"
+            "## Geordie Greep live at [Gretchen](https://gretchen.de)\n"
+            "Geordie Greep live at Gretchen\n"
+            "Doors 20:00, tickets 25 EUR https://tickets.example/1\n"
+            "© 2026 Example GmbH\n"
+        )
+        assert strip_boilerplate(markdown) == (
+            "Geordie Greep live at Gretchen\nDoors 20:00, tickets 25 EUR"
+        )
+
+    def test_keeps_words_containing_boilerplate(self):
+        markdown = "Menuett für Streichquartett\nDie Cookie-Jar Sessions\nMenü"
+        assert strip_boilerplate(markdown) == "Menuett für Streichquartett"
+
+
+class TestSelectCandidates:
+    def test_ranks_and_drops(self):
+        candidates = [
+            _candidate("Blog", "https://blog.example/post", "On 14.02.2026"),
+            _candidate("Old show", "https://blog.example/old", "12.01.2026"),
+            _candidate("Wiki", "https://de.wikipedia.org/wiki/Berlin", "14.02.2026"),
+            _candidate("RA", "https://residentadvisor.net/e/1", "Feb 14"),
+            _candidate("Undated", "https://exberliner.com/x"),
+            _candidate("Far", "https://blog.example/far", "1 June 2026"),
+        ]
+        selected = select_candidates(candidates, days_ahead=14, today=TODAY)
+        assert [c.name for c in selected] == ["RA", "Blog", "Undated", "Far"]
+
+    def test_token_budget_and_limit(self):
+        candidates = [
+            _candidate(f"E{i}", f"https://blog.example/{i}", "x" * 400)
+            for i in range(10)
+        ]
+        selected = select_candidates(
+            candidates, days_ahead=14, token_budget=400, today=TODAY
+        )
+        assert [c.name for c in selected] == ["E0", "E1", "E2"]
+        selected = select_candidates(
+            candidates, days_ahead=14, max_candidates=2, today=TODAY
+        )
+        assert len(selected) == 2
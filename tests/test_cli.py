@@ -0,0 +1,245 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import cli
+from models import ArticleOutput, EventCandidate, ResearchContext
+from sources import research
+from storage import EventStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return EventStorage(tmp_path)
+
+
+@pytest.fixture
+def event():
+    return EventCandidate(
+        name="Ryoji Ikeda: data-verse",
+        start_date="2026-03-01",
+        venue="Martin-Gropius-Bau",
+        category="exhibition",
+        description="Audiovisual installation",
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_notifications(monkeypatch):
+    monkeypatch.setattr(cli.config, "TELEGRAM_BOT_TOKEN", "")
+    monkeypatch.setattr(cli.config, "RESEND_API_KEY", "")
+
+
+def _fake_writer(running, peak, fail=(), started=None, contexts=None):
+    async def write_article(event, language, context, on_prefix_cached=None):
+        if contexts is not None:
+            contexts.append(context)
+        if started is not None:
+            started.append(language)
+        running.append(language)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        if on_prefix_cached is not None:
+            on_prefix_cached()
+        await asyncio.sleep(0.01)
+        running.remove(language)
+        if language in fail:
+            raise RuntimeError(f"{language} broke")
+        return ArticleOutput(
+            title=f"{event.name} {language}",
+            body="Body",
+            event=event,
+            language=language,
+            word_count=1,
+            model_used="test",
+            generated_at=datetime.now(),
+        )
+
+    return write_article
+
+
+class TestWriteForLanguages:
+    def _run(self, storage, event, concurrency, **kwargs):
+        eid = storage.save_event(event)
+        asyncio.run(
+            cli._write_for_languages(
+                storage,
+                eid,
+                event,
+                ["en", "de", "ru"],
+                skip_research=True,
+                concurrency=concurrency,
+                **kwargs,
+            )
+        )
+        return eid
+
+    def test_languages_run_concurrently(self, storage, event, monkeypatch):
+        peak = []
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], peak))
+        eid = self._run(storage, event, concurrency=3)
+        assert max(peak) == 3
+        for lang in ["en", "de", "ru"]:
+            assert storage.has_article_in_language(eid, lang)
+
+    def test_concurrency_cap(self, storage, event, monkeypatch):
+        peak = []
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], peak))
+        self._run(storage, event, concurrency=1)
+        assert max(peak) == 1
+
+    def test_first_draft_primes_cache(self, storage, event, monkeypatch):
+        started, peak = [], []
+        monkeypatch.setattr(
+            cli, "write_article", _fake_writer([], peak, started=started)
+        )
+        self._run(storage, event, concurrency=3)
+        assert started[0] == "en"
+        assert peak[:2] == [1, 2]
+
+    def test_failed_first_language_releases_others(self, storage, event, monkeypatch):
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], [], fail={"en"}))
+        eid = storage.save_event(event)
+        with pytest.raises(RuntimeError):
+            self._run(storage, event, concurrency=3)
+        assert storage.has_article_in_language(eid, "de")
+        assert storage.has_article_in_language(eid, "ru")
+
+    def test_failed_language_saves_others_then_raises(
+        self, storage, event, monkeypatch, capsys
+    ):
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], [], fail={"de"}))
+        eid = storage.save_event(event)
+        with pytest.raises(RuntimeError, match="1 of 3 languages failed"):
+            self._run(storage, event, concurrency=3)
+        assert storage.has_article_in_language(eid, "en")
+        assert storage.has_article_in_language(eid, "ru")
+        assert not storage.has_article_in_language(eid, "de")
+        assert "[de] Failed: de broke" in capsys.readouterr().err
+
+    def test_all_failed_raises(self, storage, event, monkeypatch):
+        monkeypatch.setattr(
+            cli, "write_article", _fake_writer([], [], fail={"en", "de", "ru"})
+        )
+        with pytest.raises(RuntimeError, match="3 of 3 languages failed"):
+            self._run(storage, event, concurrency=3)
+
+    def test_skips_research_when_all_written(self, storage, event, monkeypatch):
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], []))
+        eid = self._run(storage, event, concurrency=3)
+
+        async def fail_research(*args, **kwargs):
+            raise AssertionError("research should not run")
+
+        monkeypatch.setattr(cli, "get_event_research", fail_research)
+        asyncio.run(
+            cli._write_for_languages(storage, eid, event, ["en", "de"], concurrency=2)
+        )
+
+    def test_reuses_stored_research(self, storage, event, monkeypatch):
+        eid = storage.save_event(event)
+        stored = ResearchContext(artist_background="Stored", raw_sources=["https://a"])
+        storage.save_research(eid, stored)
+
+        async def fail_research(event):
+            raise AssertionError("research should not run")
+
+        contexts = []
+        monkeypatch.setattr(research, "research_event", fail_research)
+        monkeypatch.setattr(
+            cli, "write_article", _fake_writer([], [], contexts=contexts)
+        )
+        asyncio.run(cli._write_for_languages(storage, eid, event, ["en", "de"]))
+        assert contexts == [stored, stored]
+
+    def test_refresh_research(self, storage, event, monkeypatch):
+        eid = storage.save_event(event)
+        storage.save_research(eid, ResearchContext(artist_background="Old"))
+        fresh = ResearchContext(artist_background="New", raw_sources=["https://b"])
+
+        async def fake_research(event):
+            return fresh
+
+        monkeypatch.setattr(research, "research_event", fake_research)
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], []))
+        asyncio.run(
+            cli._write_for_languages(storage, eid, event, ["en"], refresh_research=True)
+        )
+        assert storage.get_research(eid) == fresh
+
+
+class TestWriteCurated:
+    def test_prefetches_runners_up(self, storage, event, monkeypatch):
+        chosen = storage.save_event(event)
+        others = [
+            storage.save_event(
+                event.model_copy(update={"name": f"Other {i}", "venue": f"V{i}"})
+            )
+            for i in range(2)
+        ]
+        researched = []
+
+        async def fake_research(event):
+            researched.append(event.name)
+            return ResearchContext(artist_background=event.name, raw_sources=["u"])
+
+        monkeypatch.setattr(research, "research_event", fake_research)
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], []))
+        asyncio.run(
+            cli._write_curated(storage, chosen, event, ["en"], [chosen, *others])
+        )
+
+        assert sorted(researched) == sorted([event.name, "Other 0", "Other 1"])
+        for event_id in others:
+            assert storage.get_research(event_id) is not None
+
+        researched.clear()
+        asyncio.run(cli._write_curated(storage, others[0], event, ["en"], others))
+        assert researched == []
+
+    def test_prefetch_budget(self, storage, event, monkeypatch):
+        chosen = storage.save_event(event)
+        others = [
+            storage.save_event(
+                event.model_copy(update={"name": f"Other {i}", "venue": f"V{i}"})
+            )
+            for i in range(2)
+        ]
+        storage.save_research(chosen, ResearchContext(raw_sources=["u"]))
+        researched = []
+
+        async def fake_research(event):
+            researched.append(event.name)
+            return ResearchContext(raw_sources=["u"])
+
+        monkeypatch.setattr(research, "research_event", fake_research)
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], []))
+        shortlist = [chosen, *others]
+        asyncio.run(
+            cli._write_curated(storage, chosen, event, ["en"], shortlist, prefetch=1)
+        )
+        assert researched == ["Other 0"]
+
+        researched.clear()
+        asyncio.run(
+            cli._write_curated(storage, chosen, event, ["de"], shortlist, prefetch=0)
+        )
+        assert researched == []
+
+    def test_skip_research_skips_prefetch(self, storage, event, monkeypatch):
+        chosen = storage.save_event(event)
+        other = storage.save_event(
+            event.model_copy(update={"name": "Other", "venue": "Elsewhere"})
+        )
+
+        async def fail_research(event):
+            raise AssertionError("research should not run")
+
+        monkeypatch.setattr(research, "research_event", fail_research)
+        monkeypatch.setattr(cli, "write_article", _fake_writer([], []))
+        asyncio.run(
+            cli._write_curated(
+                storage, chosen, event, ["en"], [chosen, other], skip_research=True
+            )
+        )
@@ -3,9 +3,14 @@ import json
 from datetime import datetime
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
+import config
 from models import EventCandidate, ArticleOutput
+from notifiers.email import send_article_email
+from notifiers.http import close_http_client, get_http_client
+from notifiers.telegram import send_article_to_telegram
 from storage import EventStorage
 
 
@@ -113,3 +118,42 @@ class TestArticleJsonStructure:
             assert "category" in data["event"]
             assert "venue" in data["event"]
             assert "start_date" in data["event"]
+
+
+class TestSharedHttpClient:
+    def test_reused_until_closed(self):
+        async def run():
+            client = get_http_client()
+            assert get_http_client() is client
+            await close_http_client()
+            assert client.is_closed
+            fresh = get_http_client()
+            assert fresh is not client
+            await close_http_client()
+
+        asyncio.run(run())
+
+    def test_notifiers_use_injected_client(self, monkeypatch):
+        monkeypatch.setattr(config, "TELEGRAM_BOT_TOKEN", "token")
+        monkeypatch.setattr(config, "TELEGRAM_CHAT_ID", "chat")
+        monkeypatch.setattr(config, "RESEND_API_KEY", "key")
+        monkeypatch.setattr(config, "RESEND_SEGMENT_EN", "segment")
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.host)
+            return httpx.Response(200, json={"id": "broadcast"})
+
+        async def run():
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as client:
+                await send_article_to_telegram("T", "L", "slug", client=client)
+                await send_article_email("T", "L", "slug", "en", "music", client=client)
+
+        asyncio.run(run())
+        assert requests == [
+            "api.telegram.org",
+            "api.resend.com",
+            "api.resend.com",
+        ]
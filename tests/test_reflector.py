@@ -0,0 +1,196 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from agents import reflector
+from agents.reflector import _compute_process_stats, write_reflections
+from models import (
+    ArticleOutput,
+    EventCandidate,
+    PipelineTrace,
+    ReflectionOutput,
+    ResearchContext,
+    StageMetrics,
+)
+from storage import EventStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return EventStorage(tmp_path)
+
+
+def _save(storage, event_id, event, language, stages, research):
+    article = ArticleOutput(
+        title=f"Title {language}",
+        body="word " * 500,
+        event=event,
+        language=language,
+        word_count=500,
+        model_used="test",
+        generated_at=datetime.now(),
+        trace=PipelineTrace(
+            draft_word_count=500,
+            research_context=ResearchContext(stages=research),
+            stages=stages,
+        ),
+    )
+    storage.save_article(event_id, article)
+
+
+class TestProcessStats:
+    def test_aggregates_stages(self, storage):
+        event = EventCandidate(
+            name="Concert", venue="V", category="music", description="D"
+        )
+        event_id = storage.save_event(event)
+        research = [
+            StageMetrics(
+                stage="research:artist", model="tavily", seconds=1.0, cost_usd=0.016
+            ),
+            StageMetrics(
+                stage="research:venue", model="tavily", seconds=2.0, cached=True
+            ),
+        ]
+        for lang in ["en", "de"]:
+            _save(
+                storage,
+                event_id,
+                event,
+                lang,
+                [
+                    StageMetrics(
+                        stage="draft",
+                        seconds=60.0,
+                        input_tokens=3000,
+                        output_tokens=1500,
+                        cost_usd=0.05,
+                    ),
+                    StageMetrics(
+                        stage="critique", seconds=90.0, retries=1, cost_usd=0.1
+                    ),
+                ],
+                research,
+            )
+
+        stats = _compute_process_stats(
+            storage.get_period_stats("2000-01-01", "2100-01-01")
+        )
+
+        stages = stats["stages"]
+        assert stages["draft"]["count"] == 2
+        assert stages["draft"]["output_tokens"] == 3000
+        assert stages["draft"]["avg_seconds"] == 60.0
+        assert stages["critique"]["retries"] == 2
+        assert stages["research"]["count"] == 2
+        assert stages["research"]["seconds"] == 3.0
+        assert stats["total_cost_usd"] == round(0.016 + 2 * 0.15, 4)
+        assert stats["total_seconds"] == 303.0
+
+    def test_old_traces_have_no_stages(self, storage):
+        event = EventCandidate(
+            name="Concert", venue="V", category="music", description="D"
+        )
+        event_id = storage.save_event(event)
+        _save(storage, event_id, event, "en", [], [])
+        stats = _compute_process_stats(
+            storage.get_period_stats("2000-01-01", "2100-01-01", "en")
+        )
+        assert stats["articles_with_traces"] == 1
+        assert "stages" not in stats
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = self
+        self.running = 0
+        self.peak = 0
+        self.prompts = []
+
+    async def create(self, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        text = kwargs["messages"][0]["content"]
+        if kwargs["max_tokens"] == 128:
+            return SimpleNamespace(content=[SimpleNamespace(text="A Title")])
+        self.prompts.append(text)
+        return SimpleNamespace(content=[SimpleNamespace(text="Body text here")])
+
+
+class TestWriteReflections:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        client = FakeClient()
+        monkeypatch.setattr(reflector, "get_anthropic_client", lambda: client)
+        return client
+
+    def _populate(self, storage, languages):
+        event = EventCandidate(
+            name="Concert", venue="V", category="music", description="D"
+        )
+        event_id = storage.save_event(event)
+        for lang in languages:
+            _save(storage, event_id, event, lang, [], [])
+
+    def test_one_scan_for_all_languages_and_windows(self, storage, client, monkeypatch):
+        self._populate(storage, ["en", "de"])
+        scans = []
+        original = storage.iter_articles
+        monkeypatch.setattr(
+            storage,
+            "iter_articles",
+            lambda **kw: scans.append(kw) or original(**kw),
+        )
+
+        results = asyncio.run(write_reflections(storage, ["en", "de", "ru"], [7, 30]))
+
+        assert len(scans) == 1
+        assert [(lang, days) for lang, days, _ in results] == [
+            ("en", 7),
+            ("de", 7),
+            ("ru", 7),
+            ("en", 30),
+            ("de", 30),
+            ("ru", 30),
+        ]
+        assert isinstance(results[2][2], ValueError)
+        written = [r for _, _, r in results if isinstance(r, ReflectionOutput)]
+        assert len(written) == 4
+        assert written[0].analysis["article_count"] == 1
+        assert client.peak == 4
+
+        month_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        assert written[2].period_start == month_ago
+
+    def test_previous_matches_window_length(self, storage, client):
+        self._populate(storage, ["en"])
+        today = datetime.now()
+        for days in [7, 30]:
+            storage.save_reflection(
+                ReflectionOutput(
+                    title=f"Previous {days}",
+                    body="B",
+                    language="en",
+                    period_start=(today - timedelta(days=days)).strftime("%Y-%m-%d"),
+                    period_end=today.strftime("%Y-%m-%d"),
+                    analysis={},
+                    word_count=1,
+                    model_used="test",
+                    generated_at=today,
+                )
+            )
+
+        asyncio.run(write_reflections(storage, ["en"], [7, 30]))
+        assert "Title: Previous 7" in client.prompts[0]
+        assert "Title: Previous 30" in client.prompts[1]
+
+    def test_long_windows_list_a_spread(self):
+        articles = [{"slug": str(i)} for i in range(100)]
+        listed = reflector._listed_articles(articles)
+        assert len(listed) == reflector.MAX_LISTED_ARTICLES
+        assert listed[0] is articles[0]
+        assert listed[-1] is articles[-1]
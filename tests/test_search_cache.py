@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from sources.search_cache import SearchCache, cache_key, normalize_query
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, **params):
+        self.calls.append(params)
+        return {"results": [{"url": f"https://example.com/{len(self.calls)}"}]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(tmp_path, ttls={"artist": 3600, "scout": 60})
+
+
+class TestCacheKey:
+    def test_normalizes_query(self):
+        assert normalize_query("  Ryoji   IKEDA\tbiography ") == "ryoji ikeda biography"
+        assert cache_key({"query": "Ryoji Ikeda"}) == cache_key(
+            {"query": "ryoji  ikeda"}
+        )
+
+    def test_domain_order_does_not_matter(self):
+        a = cache_key({"query": "q", "include_domains": ["a.de", "b.de"]})
+        b = cache_key({"query": "q", "include_domains": ["b.de", "a.de"]})
+        assert a == b
+
+    def test_params_are_part_of_key(self):
+        assert cache_key({"query": "q", "max_results": 5}) != cache_key(
+            {"query": "q", "max_results": 7}
+        )
+
+
+class TestSearchCache:
+    def test_hit_after_miss(self, cache):
+        client = FakeClient()
+        first = asyncio.run(cache.search(client, "artist", query="Ryoji Ikeda"))
+        second = asyncio.run(cache.search(client, "artist", query="ryoji ikeda "))
+        assert first == second
+        assert len(client.calls) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "expired": 0, "evictions": 0}
+
+    def test_ttl_per_kind(self, cache, monkeypatch):
+        cache.put("scout", {"query": "q"}, {"results": []})
+        cache.put("artist", {"query": "a"}, {"results": []})
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 600)
+        assert cache.get("scout", {"query": "q"}) is None
+        assert cache.get("artist", {"query": "a"}) == {"results": []}
+        assert cache.expired == 1
+
+    def test_unknown_kind_is_not_served(self, cache):
+        cache.put("other", {"query": "q"}, {"results": []})
+        assert cache.get("other", {"query": "q"}) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = SearchCache(tmp_path, ttls={"artist": 3600}, max_bytes=1000)
+        payload = {"results": ["x" * 200]}
+        for i in range(3):
+            cache.put("artist", {"query": f"q{i}"}, payload)
+            path = cache._path(cache_key({"query": f"q{i}"}))
+            os.utime(path, (i, i))
+        cache.get("artist", {"query": "q0"})
+
+        for i in range(3, 5):
+            cache.put("artist", {"query": f"q{i}"}, payload)
+
+        assert cache.evictions > 0
+        assert cache.size() <= 1000
+        assert cache.get("artist", {"query": "q0"}) is not None
+        assert cache.get("artist", {"query": "q1"}) is None
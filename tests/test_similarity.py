@@ -0,0 +1,54 @@
+from similarity import TrigramIndex, jaccard, normalize_text, trigrams
+
+
+class TestNormalize:
+    def test_strips_punctuation_and_accents(self):
+        assert normalize_text("  Raül Refree — LIVE! ") == "raul refree live"
+
+    def test_keeps_cyrillic(self):
+        assert normalize_text("Кино БЕРЛИН") == "кино берлин"
+
+    def test_empty(self):
+        assert trigrams("") == frozenset()
+        assert trigrams("—") == frozenset()
+
+
+class TestJaccard:
+    def test_identical(self):
+        assert jaccard(trigrams("Austra"), trigrams("austra!")) == 1.0
+
+    def test_empty_is_zero(self):
+        assert jaccard(frozenset(), trigrams("Austra")) == 0.0
+
+
+class TestTrigramIndex:
+    def test_finds_variants(self):
+        index = TrigramIndex()
+        index.add("a", "Geordie Greep")
+        index.add("b", "Godspeed You! Black Emperor")
+        matches = index.query("Geordie Greep — live")
+        assert [key for key, _ in matches] == ["a"]
+        assert matches[0][1] >= index.threshold
+
+    def test_ignores_unrelated(self):
+        index = TrigramIndex()
+        index.add("a", "Berlin Short Film Festival")
+        assert index.query("Berlin Independent Film Festival (BIFF)") == []
+        assert index.query("") == []
+
+    def test_orders_by_score(self):
+        index = TrigramIndex(threshold=0.3)
+        index.add("loose", "Schall & Rausch Festival 2026")
+        index.add("close", "Schall & Rausch Festival")
+        keys = [key for key, _ in index.query("Schall und Rausch Festival")]
+        assert keys == ["close", "loose"]
+
+    def test_readd_and_remove(self):
+        index = TrigramIndex()
+        index.add("a", "Austra")
+        index.add("a", "Mari Boine")
+        assert index.query("Austra") == []
+        assert [key for key, _ in index.query("Mari Boine")] == ["a"]
+        index.remove("a")
+        assert index.query("Mari Boine") == []
+        assert len(index) == 0
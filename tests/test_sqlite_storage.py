@@ -0,0 +1,230 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from models import EventCandidate, ReflectionOutput
+from sqlite_storage import SqliteEventStorage
+from storage import EventStorage, open_storage
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SqliteEventStorage(tmp_path)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def sample_event():
+    return EventCandidate(
+        name="Ryoji Ikeda: data-verse",
+        start_date="2099-03-01",
+        end_date="2099-03-15",
+        venue="Martin-Gropius-Bau",
+        city="Berlin",
+        category="exhibition",
+        description="Audiovisual installation",
+        source_url="https://example.com",
+    )
+
+
+class TestSqliteEventStorage:
+    def test_open_storage_selects_backend(self, tmp_path):
+        assert type(open_storage(tmp_path)) is EventStorage
+        storage = open_storage(tmp_path, "sqlite")
+        assert isinstance(storage, SqliteEventStorage)
+        storage.close()
+
+    def test_wal_mode(self, sqlite_storage):
+        (mode,) = sqlite_storage.db.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_event_dedup(self, sqlite_storage, sample_event):
+        eid = sqlite_storage.save_event(sample_event)
+        assert sqlite_storage.save_event(sample_event) == eid
+        assert sqlite_storage.event_exists(sample_event.name.upper())
+        assert (
+            sqlite_storage.find_existing_event(
+                "Other", "martin-gropius-bau", "2099-03-01"
+            )
+            == eid
+        )
+        assert sqlite_storage.find_existing_event("X", "Y", "2099-01-01") is None
+        assert sqlite_storage.get_all_event_names() == [sample_event.name]
+        assert sqlite_storage.get_all_event_categories() == ["exhibition"]
+
+    def test_save_events_batch(self, sqlite_storage, sample_event):
+        other = EventCandidate(
+            name="Other", venue="HAU", category="theater", description="D"
+        )
+        saved = sqlite_storage.save_events([sample_event, other, sample_event])
+        assert [was_existing for _, was_existing in saved] == [False, False, True]
+        assert saved[2][0] == saved[0][0]
+        (count,) = sqlite_storage.db.execute("SELECT COUNT(*) FROM events").fetchone()
+        assert count == 2
+
+    def test_find_similar_event(self, sqlite_storage, sample_event):
+        eid = sqlite_storage.save_event(sample_event)
+        similar = sqlite_storage.find_similar_event(
+            "Ryoji Ikeda – Data Verse", "2099-03-10"
+        )
+        assert similar == eid
+        assert sqlite_storage.find_similar_event("Ryoji Ikeda – Data Verse") is None
+        sqlite_storage.save_event(
+            EventCandidate(
+                name="Austra",
+                start_date="2026-04-02",
+                venue="V",
+                category="music",
+                description="D",
+            )
+        )
+        assert (
+            sqlite_storage.find_similar_event("AUSTRA live", "2026-04-02") is not None
+        )
+        assert sqlite_storage.find_similar_event("Mari Boine") is None
+
+    def test_writes_json_source_of_truth(
+        self, sqlite_storage, sample_event, make_article
+    ):
+        eid = sqlite_storage.save_event(sample_event)
+        _, slug = sqlite_storage.save_article(eid, make_article(sample_event))
+        assert (sqlite_storage.events_dir / f"{eid}.json").exists()
+        data = json.loads(
+            (sqlite_storage.articles_dir / f"{slug}.json").read_text(encoding="utf-8")
+        )
+        assert data["event"]["name"] == sample_event.name
+
+    def test_article_queries(self, sqlite_storage, sample_event, make_article):
+        eid = sqlite_storage.save_event(sample_event)
+        assert len(sqlite_storage.get_available_events()) == 1
+        sqlite_storage.save_article(eid, make_article(sample_event))
+
+        assert sqlite_storage.has_article_in_language(eid, "en")
+        assert not sqlite_storage.has_article_in_language(eid, "de")
+        assert sqlite_storage.is_already_covered(
+            sample_event.name, "", "", language="en"
+        )
+        assert not sqlite_storage.is_already_covered(
+            sample_event.name, "", "", language="de"
+        )
+        assert sqlite_storage.get_available_events(language="en") == []
+        assert len(sqlite_storage.get_available_events(language="de")) == 1
+        assert sqlite_storage.get_recent_categories() == ["exhibition"]
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        (article,) = sqlite_storage.get_articles_in_period(today, today, "en")
+        assert article["body"].startswith("Body")
+
+    def test_unique_slug(self, sqlite_storage, sample_event, make_article):
+        eid = sqlite_storage.save_event(sample_event)
+        _, slug1 = sqlite_storage.save_article(eid, make_article(sample_event, "Same"))
+        _, slug2 = sqlite_storage.save_article(
+            eid, make_article(sample_event, "Same", "de")
+        )
+        assert (slug1, slug2) == ("same", "same-2")
+
+    def test_latest_reflection(self, sqlite_storage):
+        for title in ["First", "Second"]:
+            sqlite_storage.save_reflection(
+                ReflectionOutput(
+                    title=title,
+                    body="B",
+                    language="en",
+                    period_start="2026-01-01",
+                    period_end="2026-01-07",
+                    analysis={"article_count": 1},
+                    word_count=1,
+                    model_used="test",
+                    generated_at=datetime.now(),
+                )
+            )
+        latest = sqlite_storage.get_latest_reflection("en")
+        assert latest["title"] == "Second"
+        assert latest["analysis"] == {"article_count": 1}
+        assert sqlite_storage.get_latest_reflection("de") is None
+
+    def test_latest_reflections_by_window(self, sqlite_storage):
+        for title, start in [("Week", "2026-01-01"), ("Month", "2025-12-08")]:
+            sqlite_storage.save_reflection(
+                ReflectionOutput(
+                    title=title,
+                    body="B",
+                    language="en",
+                    period_start=start,
+                    period_end="2026-01-07",
+                    analysis={},
+                    word_count=1,
+                    model_used="test",
+                    generated_at=datetime.now(),
+                )
+            )
+        weekly = sqlite_storage.get_latest_reflections(["en", "de"], 6)
+        assert weekly["en"]["title"] == "Week"
+        assert weekly["de"] is None
+        monthly = sqlite_storage.get_latest_reflections(["en"], 30)
+        assert monthly["en"]["title"] == "Month"
+        json_storage = EventStorage(sqlite_storage.data_dir)
+        assert json_storage.get_latest_reflections(["en"], 30) == monthly
+
+    def test_import_picks_up_json_changes(self, tmp_path, sample_event):
+        EventStorage(tmp_path).save_event(sample_event)
+        storage = SqliteEventStorage(tmp_path)
+        assert storage.event_exists(sample_event.name)
+        assert storage.import_json() == 0
+
+        (path,) = storage.events_dir.glob("*.json")
+        path.unlink()
+        assert storage.import_json() == 1
+        assert not storage.event_exists(sample_event.name)
+        storage.close()
+
+    def test_export_restores_json(self, sqlite_storage, sample_event):
+        eid = sqlite_storage.save_event(sample_event)
+        path = sqlite_storage.events_dir / f"{eid}.json"
+        original = json.loads(path.read_text(encoding="utf-8"))
+        path.unlink()
+        assert sqlite_storage.export_json() == 1
+        assert json.loads(path.read_text(encoding="utf-8")) == original
+        assert sqlite_storage.export_json() == 0
+
+    def test_article_meta_is_lazy(self, sqlite_storage, sample_event, make_article):
+        eid = sqlite_storage.save_event(sample_event)
+        sqlite_storage.save_article(eid, make_article(sample_event))
+        (record,) = sqlite_storage.iter_article_meta()
+        assert "body" not in record._fields
+        assert record["event"]["category"] == "exhibition"
+        assert record["body"].startswith("Body")
+
+    def test_iterators(self, sqlite_storage, sample_event, make_article):
+        eid = sqlite_storage.save_event(sample_event)
+        sqlite_storage.save_article(eid, make_article(sample_event, "A", "en"))
+        sqlite_storage.save_article(eid, make_article(sample_event, "B", "de"))
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        assert len(list(sqlite_storage.iter_events(active_on=today))) == 1
+        assert list(sqlite_storage.iter_events(active_on="2999-01-01")) == []
+        assert list(sqlite_storage.iter_events(category="music")) == []
+        assert [a["slug"] for a in sqlite_storage.iter_articles(language="de")] == ["b"]
+        assert len(list(sqlite_storage.iter_articles(event_id=eid))) == 2
+        assert list(sqlite_storage.iter_articles(until="2000-01-01")) == []
+
+    def test_period_stats(self, sqlite_storage, sample_event, make_article):
+        eid = sqlite_storage.save_event(sample_event)
+        sqlite_storage.save_article(eid, make_article(sample_event, "A", "en"))
+        sqlite_storage.stats_path.unlink()
+        sqlite_storage.save_article(eid, make_article(sample_event, "B", "de"))
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        stats = sqlite_storage.get_period_stats(today, today)
+        assert sorted(stats["slugs"]) == ["a", "b"]
+        assert stats["categories"] == {"exhibition": 2}
+
+    def test_compact_events(self, sqlite_storage, sample_event):
+        eid = sqlite_storage.save_event(sample_event)
+        assert sqlite_storage.compact_events(today="2100-01-01") == 1
+        assert sqlite_storage.get_event(eid) is None
+        assert sqlite_storage.find_existing_event(sample_event.name, "", "") == eid
+        assert sqlite_storage.event_exists(sample_event.name)
+        assert [e["id"] for e in sqlite_storage.iter_archived_events()] == [eid]
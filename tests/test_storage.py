@@ -1,8 +1,20 @@
+import gzip
+import json
+import os
+import subprocess
+from pathlib import Path
+
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from models import EventCandidate, ArticleOutput
-from storage import EventStorage, generate_slug
+from models import (
+    ArticleOutput,
+    EventCandidate,
+    PipelineTrace,
+    ResearchContext,
+    StageMetrics,
+)
+from storage import ArticleRecord, EventStorage, generate_slug
 
 
 @pytest.fixture
@@ -69,6 +81,41 @@ class TestEventStorage:
         eid2 = tmp_storage.save_event(upper)
         assert eid1 == eid2
 
+    def test_save_events_batch(self, tmp_storage, sample_event, monkeypatch):
+        existing_id = tmp_storage.save_event(sample_event)
+        same_slot = EventCandidate(
+            name="Renamed",
+            start_date="2026-03-01",
+            venue="martin-gropius-bau",
+            category="exhibition",
+            description="D",
+        )
+        new = EventCandidate(
+            name="New", venue="HAU", category="theater", description="D"
+        )
+        index_writes = []
+        append_index = tmp_storage._append_index
+        monkeypatch.setattr(
+            tmp_storage,
+            "_append_index",
+            lambda changes: index_writes.append(append_index(changes)),
+        )
+
+        saved = tmp_storage.save_events([sample_event, same_slot, new, new])
+
+        assert saved[:2] == [(existing_id, True), (existing_id, True)]
+        new_id, was_existing = saved[2]
+        assert not was_existing
+        assert saved[3] == (new_id, True)
+        assert len(index_writes) == 1
+        assert (tmp_storage.events_dir / f"{new_id}.json").exists()
+        assert not list(tmp_storage.events_dir.glob("*.tmp"))
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert sorted(fresh.get_all_event_names()) == ["New", sample_event.name]
+
+    def test_save_events_empty(self, tmp_storage):
+        assert tmp_storage.save_events([]) == []
+
     def test_get_event(self, tmp_storage, sample_event):
         eid = tmp_storage.save_event(sample_event)
         row = tmp_storage.get_event(eid)
@@ -102,6 +149,28 @@ class TestEventStorage:
         )
         assert found == eid
 
+    def test_find_similar_event(self, tmp_storage):
+        eid = tmp_storage.save_event(
+            EventCandidate(
+                name="Schall & Rausch Festival",
+                start_date="2026-02-12",
+                end_date="2026-02-15",
+                venue="CANK",
+                category="music",
+                description="D",
+            )
+        )
+        assert tmp_storage.find_similar_event("Schall & Rausch", "2026-02-14") == eid
+        assert tmp_storage.find_similar_event("Schall und Rausch Festival") is None
+        assert (
+            tmp_storage.find_similar_event(
+                "Schall & Rausch Festival 2027", "2027-02-13"
+            )
+            is None
+        )
+        assert tmp_storage.find_similar_event("Schall & Rausch", "2026-03-01") is None
+        assert tmp_storage.find_similar_event("Mari Boine") is None
+
     def test_find_existing_event_not_found(self, tmp_storage, sample_event):
         tmp_storage.save_event(sample_event)
         assert tmp_storage.find_existing_event("X", "Y", "2099-01-01") is None
@@ -269,3 +338,707 @@ class TestEventStorage:
         tmp_storage.save_article(eid, article)
         cats = tmp_storage.get_recent_categories(days=7)
         assert "exhibition" in cats
+
+    def test_get_articles_in_period(self, tmp_storage, sample_event):
+        eid = tmp_storage.save_event(sample_event)
+        for lang in ["en", "de"]:
+            article = ArticleOutput(
+                title=f"T {lang}",
+                body="B",
+                event=sample_event,
+                language=lang,
+                word_count=1,
+                model_used="test",
+                generated_at=datetime.now(),
+            )
+            tmp_storage.save_article(eid, article)
+        today = datetime.now().strftime("%Y-%m-%d")
+        found = tmp_storage.get_articles_in_period(today, today, "en")
+        assert [a["title"] for a in found] == ["T en"]
+        assert (
+            tmp_storage.get_articles_in_period("2000-01-01", "2000-12-31", "en") == []
+        )
+
+
+class TestCatalog:
+    def test_fresh_instance_sees_saved_data(self, tmp_path, sample_event):
+        writer = EventStorage(tmp_path)
+        eid = writer.save_event(sample_event)
+        article = ArticleOutput(
+            title="T",
+            body="B",
+            event=sample_event,
+            language="en",
+            word_count=1,
+            model_used="test",
+            generated_at=datetime.now(),
+        )
+        writer.save_article(eid, article)
+
+        reader = EventStorage(tmp_path)
+        assert reader.event_exists(sample_event.name)
+        assert reader.has_article_in_language(eid, "en")
+        assert reader.get_recent_categories() == ["exhibition"]
+
+    def test_loads_files_once(self, tmp_storage, sample_event, monkeypatch):
+        tmp_storage.save_event(sample_event)
+        fresh = EventStorage(tmp_storage.data_dir)
+        calls = []
+        original = fresh._build_catalog
+        monkeypatch.setattr(
+            fresh, "_build_catalog", lambda: calls.append(1) or original()
+        )
+        for _ in range(5):
+            fresh.event_exists(sample_event.name)
+            fresh.find_existing_event("X", "Y", "2099-01-01")
+        assert len(calls) == 1
+
+    def test_trace_files_are_not_articles(self, tmp_storage, sample_event):
+        eid = tmp_storage.save_event(sample_event)
+        article = ArticleOutput(
+            title="Traced",
+            body="B",
+            event=sample_event,
+            language="en",
+            word_count=1,
+            model_used="test",
+            generated_at=datetime.now(),
+            trace=PipelineTrace(draft_text="draft"),
+        )
+        tmp_storage.save_article(eid, article)
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert list(fresh.catalog.articles) == ["traced"]
+        assert fresh.get_trace("traced")["draft_text"] == "draft"
+
+
+class TestIndexFile:
+    def test_index_written_on_save(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        files = tmp_storage._read_index()
+        assert f"events/{eid}.json" in files
+        record = files["articles/t.json"]["record"]
+        assert record["event_id"] == eid
+        assert "body" not in record
+
+    def test_saves_append_to_journal(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        _ = EventStorage(tmp_storage.data_dir).catalog
+        written = tmp_storage.index_path.stat().st_mtime_ns
+        tmp_storage.save_article(eid, make_article(sample_event))
+        assert tmp_storage.index_path.stat().st_mtime_ns == written
+        assert tmp_storage.index_journal_path.exists()
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert fresh.has_article_in_language(eid, "en")
+        assert not fresh.index_journal_path.exists()
+        index = json.loads(fresh.index_path.read_text(encoding="utf-8"))
+        assert "articles/t.json" in index["files"]
+
+    def test_checkout_recognised_by_git_blob(
+        self, tmp_storage, sample_event, make_article, count_parses
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        other = tmp_storage.save_event(
+            sample_event.model_copy(update={"name": "Other", "venue": "HAU"})
+        )
+        _ = EventStorage(tmp_storage.data_dir).catalog
+        data_dir = tmp_storage.data_dir
+        subprocess.run(["git", "init", "-q"], cwd=data_dir, check=True)
+        subprocess.run(["git", "add", "events", "articles"], cwd=data_dir, check=True)
+        for path in [*data_dir.glob("events/*.json"), *data_dir.glob("articles/*")]:
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        changed = data_dir / "events" / f"{other}.json"
+        changed.write_text(
+            changed.read_text(encoding="utf-8").replace('"Other"', '"Edited"'),
+            encoding="utf-8",
+        )
+
+        fresh = EventStorage(data_dir)
+        parsed = count_parses(fresh)
+        assert fresh.has_article_in_language(eid, "en")
+        assert fresh.event_exists("Edited")
+        assert parsed == [f"{other}.json"]
+
+    def test_unchanged_files_are_not_reparsed(
+        self, tmp_storage, sample_event, make_article, count_parses
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        parsed = count_parses(fresh)
+        assert fresh.has_article_in_language(eid, "en")
+        assert fresh.event_exists(sample_event.name)
+        assert parsed == []
+
+    def test_changed_file_is_reparsed(self, tmp_storage, sample_event, count_parses):
+        eid = tmp_storage.save_event(sample_event)
+        path = tmp_storage.events_dir / f"{eid}.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["name"] = "Renamed On Checkout"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        parsed = count_parses(fresh)
+        assert fresh.event_exists("Renamed On Checkout")
+        assert not fresh.event_exists(sample_event.name)
+        assert parsed == [f"{eid}.json"]
+
+    def test_deleted_and_added_files(self, tmp_storage, sample_event):
+        eid = tmp_storage.save_event(sample_event)
+        (tmp_storage.events_dir / f"{eid}.json").unlink()
+        other = {"id": "manual", "name": "Dropped In By Git", "venue": "V"}
+        (tmp_storage.events_dir / "manual.json").write_text(
+            json.dumps(other), encoding="utf-8"
+        )
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert not fresh.event_exists(sample_event.name)
+        assert fresh.event_exists("Dropped In By Git")
+        index = json.loads(fresh.index_path.read_text(encoding="utf-8"))
+        assert list(index["files"]) == ["events/manual.json"]
+
+    def test_corrupt_index_is_rebuilt(self, tmp_storage, sample_event):
+        tmp_storage.save_event(sample_event)
+        tmp_storage.index_path.write_text("{not json", encoding="utf-8")
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert fresh.event_exists(sample_event.name)
+        index = json.loads(fresh.index_path.read_text(encoding="utf-8"))
+        assert index["version"] == 1
+
+    def test_period_query_returns_full_articles(
+        self, tmp_storage, sample_event, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        today = datetime.now().strftime("%Y-%m-%d")
+        fresh = EventStorage(tmp_storage.data_dir)
+        (article,) = fresh.get_articles_in_period(today, today, "en")
+        assert article["body"].startswith("Body")
+        assert article["event"]["description"] == sample_event.description
+
+
+class TestDailyStats:
+    def test_save_updates_buckets_without_scanning(
+        self, tmp_storage, sample_event, monkeypatch, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        traces = []
+        monkeypatch.setattr(fresh, "get_trace", traces.append)
+        fresh.save_article(eid, make_article(sample_event, "De", "de", 70))
+        today = datetime.now().strftime("%Y-%m-%d")
+        stats = fresh.get_period_stats(today, today)
+
+        assert traces == []
+        assert stats["article_count"] == 2
+        assert stats["total_words"] == 120
+        assert stats["venues"] == {"Martin-Gropius-Bau": 2}
+        assert stats["traced"] == 2
+        assert stats["longest"]["slug"] == "de"
+        assert fresh.get_period_stats(today, today, "de")["article_count"] == 1
+
+    def test_missing_file_is_rebuilt(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        tmp_storage.stats_path.unlink()
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        today = datetime.now().strftime("%Y-%m-%d")
+        stats = fresh.get_period_stats(today, today, "en")
+        assert stats["article_count"] == 1
+        assert stats["word_growth_count"] == 1
+        assert tmp_storage.stats_path.exists()
+
+    def test_deleted_article_drops_out(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event, "One"))
+        tmp_storage.save_article(eid, make_article(sample_event, "Two", "de"))
+        (tmp_storage.articles_dir / "one.json").unlink()
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        today = datetime.now().strftime("%Y-%m-%d")
+        stats = fresh.get_period_stats(today, today)
+        assert stats["slugs"] == ["two"]
+
+    def test_article_edited_in_place_is_recounted(
+        self, tmp_storage, sample_event, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        path = tmp_storage.articles_dir / "t.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["word_count"] = 80
+        data["event"]["category"] = "cinema"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        today = datetime.now().strftime("%Y-%m-%d")
+        stats = fresh.get_period_stats(today, today)
+        assert stats["total_words"] == 80
+        assert stats["categories"] == {"cinema": 1}
+
+    def test_checkout_recognised_by_git_blob(
+        self, tmp_storage, sample_event, monkeypatch, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        data_dir = tmp_storage.data_dir
+        subprocess.run(["git", "init", "-q"], cwd=data_dir, check=True)
+        subprocess.run(["git", "add", "events", "articles"], cwd=data_dir, check=True)
+        for path in data_dir.glob("articles/*"):
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        fresh = EventStorage(data_dir)
+        traces = []
+        monkeypatch.setattr(fresh, "get_trace", traces.append)
+        today = datetime.now().strftime("%Y-%m-%d")
+        assert fresh.get_period_stats(today, today)["article_count"] == 1
+        assert traces == []
+
+    def test_window_excludes_other_days(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        stats = tmp_storage.get_period_stats("2000-01-01", "2000-12-31")
+        assert stats["article_count"] == 0
+        assert stats["longest"] is None
+
+
+class TestTraceStore:
+    def _trace(self):
+        return PipelineTrace(
+            draft_text="The first body text.",
+            revised_text="The final body text.",
+            research_context=ResearchContext(artist_background="Shared"),
+        )
+
+    def test_research_shared_across_languages(
+        self, tmp_storage, sample_event, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        for lang in ["en", "de", "ru"]:
+            tmp_storage.save_article(
+                eid,
+                make_article(sample_event, f"Title {lang}", lang, trace=self._trace()),
+            )
+
+        assert len(list(tmp_storage.trace_research_dir.iterdir())) == 1
+        trace = tmp_storage.get_trace("title-de")
+        assert trace["draft_text"] == "The first body text."
+        assert trace["revised_text"] == "The final body text."
+        assert trace["research_context"]["artist_background"] == "Shared"
+
+    def test_gzip_store(self, tmp_path, sample_event, make_article):
+        storage = EventStorage(tmp_path, trace_compression="gzip")
+        eid = storage.save_event(sample_event)
+        storage.save_article(
+            eid, make_article(sample_event, "Title en", "en", trace=self._trace())
+        )
+
+        path = storage.articles_dir / "title-en.trace.json.gz"
+        assert json.loads(gzip.decompress(path.read_bytes()))["format"] == 2
+        assert not (storage.articles_dir / "title-en.trace.json").exists()
+        assert storage.get_trace("title-en")["draft_text"] == "The first body text."
+
+    def test_pack_legacy_traces(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(
+            eid, make_article(sample_event, "Title en", "en", trace=None)
+        )
+        legacy = self._trace().model_dump(mode="json")
+        (tmp_storage.articles_dir / "title-en.trace.json").write_text(
+            json.dumps(legacy), encoding="utf-8"
+        )
+        assert tmp_storage.get_trace("title-en") == legacy
+
+        assert tmp_storage.pack_traces() == 1
+        assert tmp_storage.pack_traces() == 0
+        path = tmp_storage.articles_dir / "title-en.trace.json"
+        assert json.loads(path.read_text(encoding="utf-8"))["format"] == 2
+        assert tmp_storage.get_trace("title-en") == legacy
+
+    def test_research_not_truncated(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        trace = self._trace()
+        trace.research_context.artist_background = "x" * 2000
+        tmp_storage.save_article(
+            eid, make_article(sample_event, "Title en", "en", trace=trace)
+        )
+        research = tmp_storage.get_trace("title-en")["research_context"]
+        assert len(research["artist_background"]) == 2000
+
+
+class TestResearchStore:
+    def test_round_trip(self, tmp_storage):
+        context = ResearchContext(artist_background="Bio", raw_sources=["https://a"])
+        tmp_storage.save_research("e1", context)
+        assert tmp_storage.get_research("e1") == context
+        assert tmp_storage.get_research("e2") is None
+
+    def test_reused_research_drops_stages(self, tmp_storage, sample_event):
+        stage = StageMetrics(stage="research:artist", model="tavily", cost_usd=0.016)
+        context = ResearchContext(artist_background="Bio", stages=[stage])
+        tmp_storage.save_research("e1", context)
+        assert tmp_storage.get_research("e1").stages == []
+
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(
+            eid,
+            ArticleOutput(
+                title="Title",
+                body="Body",
+                event=sample_event,
+                language="en",
+                word_count=1,
+                model_used="test",
+                generated_at=datetime.now(),
+                trace=PipelineTrace(research_context=context),
+            ),
+        )
+        trace = tmp_storage.get_trace("title")
+        assert trace["research_context"]["stages"][0]["cost_usd"] == 0.016
+        assert len(list(tmp_storage.trace_research_dir.iterdir())) == 1
+
+    def test_stale_research_ignored(self, tmp_storage):
+        tmp_storage.save_research("e1", ResearchContext(artist_background="Bio"))
+        path = tmp_storage.research_dir / "e1.json"
+        record = json.loads(path.read_text(encoding="utf-8"))
+        record["researched_at"] = (datetime.now() - timedelta(days=20)).isoformat()
+        path.write_text(json.dumps(record), encoding="utf-8")
+
+        assert tmp_storage.get_research("e1", max_age_days=14) is None
+        assert tmp_storage.get_research("e1", max_age_days=30) is not None
+        assert tmp_storage.get_research("e1") is not None
+
+    def test_shares_blob_with_traces(self, tmp_storage, sample_event):
+        context = ResearchContext(artist_background="Shared")
+        tmp_storage.save_research("e1", context)
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(
+            eid,
+            ArticleOutput(
+                title="Title",
+                body="Body",
+                event=sample_event,
+                language="en",
+                word_count=1,
+                model_used="test",
+                generated_at=datetime.now(),
+                trace=PipelineTrace(research_context=context),
+            ),
+        )
+        assert len(list(tmp_storage.trace_research_dir.iterdir())) == 1
+
+
+class TestArticleRecords:
+    def test_meta_does_not_load_body(
+        self, tmp_storage, sample_event, make_article, count_parses
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        fresh = EventStorage(tmp_storage.data_dir)
+        _ = fresh.catalog
+        parsed = count_parses(fresh)
+
+        (record,) = fresh.iter_article_meta()
+        assert record["title"] == "T"
+        assert record.get("lead") == "Lead"
+        assert record["event"]["category"] == "exhibition"
+        assert parsed == []
+
+        assert record["body"].startswith("Body")
+        assert parsed == ["t.json"]
+
+    def test_fields_projection(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        (record,) = tmp_storage.iter_article_meta(fields=["slug", "language"])
+        assert record._fields == {"slug": "t", "language": "en"}
+        assert record["title"] == "T"
+
+    def test_nested_event_falls_back_to_full_document(
+        self, tmp_storage, sample_event, make_article
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        (record,) = tmp_storage.iter_article_meta()
+        assert record["event"]["description"] == sample_event.description
+        assert record["event"].get("missing", "default") == "default"
+
+    def test_trace_loaded_on_access(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        (record,) = tmp_storage.iter_article_meta()
+        assert record.trace["draft_text"] == "draft"
+
+    def test_period_records_are_lazy(self, tmp_storage, sample_event, make_article):
+        eid = tmp_storage.save_event(sample_event)
+        tmp_storage.save_article(eid, make_article(sample_event))
+        today = datetime.now().strftime("%Y-%m-%d")
+        (record,) = tmp_storage.get_articles_in_period(today, today, "en")
+        assert isinstance(record, ArticleRecord)
+        assert dict(record)["body"].startswith("Body")
+
+
+class TestIterators:
+    @pytest.fixture
+    def populated(self, tmp_storage):
+        future = EventCandidate(
+            name="Future",
+            start_date="2099-01-01",
+            venue="V",
+            category="music",
+            description="D",
+        )
+        past = EventCandidate(
+            name="Past",
+            start_date="2020-01-01",
+            venue="V",
+            category="cinema",
+            description="D",
+        )
+        eid = tmp_storage.save_event(future)
+        tmp_storage.save_event(past)
+        for lang in ["en", "de", "ru"]:
+            article = ArticleOutput(
+                title=f"Future {lang}",
+                body="B",
+                event=future,
+                language=lang,
+                word_count=1,
+                model_used="test",
+                generated_at=datetime.now(),
+            )
+            tmp_storage.save_article(eid, article)
+        return tmp_storage, eid
+
+    def test_iter_events_filters(self, populated):
+        storage, _ = populated
+        assert {e["name"] for e in storage.iter_events()} == {"Future", "Past"}
+        assert [e["name"] for e in storage.iter_events(active_on="2030-01-01")] == [
+            "Future"
+        ]
+        assert [e["name"] for e in storage.iter_events(category="cinema")] == ["Past"]
+
+    def test_iter_articles_filters(self, populated):
+        storage, eid = populated
+        today = datetime.now().strftime("%Y-%m-%d")
+        assert len(list(storage.iter_articles())) == 3
+        assert [a["language"] for a in storage.iter_articles(language="de")] == ["de"]
+        assert len(list(storage.iter_articles(since=today, until=today))) == 3
+        assert list(storage.iter_articles(until="2000-01-01")) == []
+        assert list(storage.iter_articles(since="2999-01-01")) == []
+        assert len(list(storage.iter_articles(event_id=eid))) == 3
+        assert list(storage.iter_articles(event_id="other")) == []
+
+    def test_iter_articles_is_lazy(self, populated, monkeypatch):
+        storage, eid = populated
+        fresh = EventStorage(storage.data_dir)
+        _ = fresh.catalog
+        parsed = []
+        monkeypatch.setattr(fresh, "_read_json", lambda p: parsed.append(p))
+        articles = fresh.iter_articles(language="en")
+        assert next(articles)["title"] == "Future en"
+        assert fresh.has_article_in_language(eid, "ru")
+        assert parsed == []
+
+
+class TestPartitionedLayout:
+    @pytest.fixture
+    def article(self, sample_event):
+        return ArticleOutput(
+            title="Data Verse",
+            body="Body",
+            event=sample_event,
+            language="en",
+            word_count=1,
+            model_used="test",
+            generated_at=datetime(2026, 3, 2, 12, 0),
+        )
+
+    def test_unknown_layout_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            EventStorage(tmp_path, layout="nested")
+
+    def test_saves_into_month_directories(self, tmp_path, sample_event, article):
+        storage = EventStorage(tmp_path, layout="partitioned")
+        eid = storage.save_event(sample_event)
+        article.trace = PipelineTrace(draft_text="D")
+        _, slug = storage.save_article(eid, article)
+
+        assert (tmp_path / "events" / "2026" / "03" / f"{eid}.json").exists()
+        article_dir = tmp_path / "articles" / datetime.now().strftime("%Y/%m")
+        assert (article_dir / f"{slug}.json").exists()
+        assert (article_dir / f"{slug}.trace.json").exists()
+        assert storage.get_trace(slug)["draft_text"] == "D"
+        assert storage.get_article(slug)["body"] == "Body"
+
+        fresh = EventStorage(tmp_path, layout="partitioned")
+        assert fresh.event_exists(sample_event.name)
+        assert fresh.has_article_in_language(eid, "en")
+
+    def test_migrate_round_trip(self, tmp_storage, sample_event, article):
+        eid = tmp_storage.save_event(sample_event)
+        article.trace = PipelineTrace(draft_text="D")
+        _, slug = tmp_storage.save_article(eid, article)
+        tmp_storage.save_event(
+            EventCandidate(name="Undated", venue="V", category="music", description="D")
+        )
+
+        assert tmp_storage.migrate_layout("partitioned") == 3
+        assert not (tmp_storage.events_dir / f"{eid}.json").exists()
+        assert (tmp_storage.events_dir / "2026" / "03" / f"{eid}.json").exists()
+        assert len(list((tmp_storage.events_dir / "undated").glob("*.json"))) == 1
+        assert tmp_storage.get_trace(slug)["draft_text"] == "D"
+
+        fresh = EventStorage(tmp_storage.data_dir, layout="partitioned")
+        assert fresh.get_event(eid)["name"] == sample_event.name
+        assert fresh.get_article(slug)["title"] == "Data Verse"
+
+        assert tmp_storage.migrate_layout("flat") == 3
+        assert sorted(p.name for p in tmp_storage.articles_dir.iterdir()) == [
+            f"{slug}.json",
+            f"{slug}.trace.json",
+        ]
+        assert [p.name for p in tmp_storage.events_dir.iterdir() if p.is_dir()] == []
+
+    def test_migrate_keeps_stats_fingerprints(
+        self, tmp_storage, sample_event, article, monkeypatch
+    ):
+        eid = tmp_storage.save_event(sample_event)
+        article.trace = PipelineTrace(draft_text="D")
+        tmp_storage.save_article(eid, article)
+        tmp_storage.migrate_layout("partitioned")
+
+        fresh = EventStorage(tmp_storage.data_dir, layout="partitioned")
+        traces = []
+        monkeypatch.setattr(fresh, "get_trace", traces.append)
+        today = datetime.now().strftime("%Y-%m-%d")
+        assert fresh.get_period_stats(today, today)["article_count"] == 1
+        assert traces == []
+
+    def test_iter_events_skips_past_partitions(self, tmp_path, sample_event):
+        storage = EventStorage(tmp_path, layout="partitioned")
+        storage.save_event(sample_event)
+        storage.save_event(
+            EventCandidate(
+                name="Later",
+                start_date="2026-05-01",
+                venue="V",
+                category="music",
+                description="D",
+            )
+        )
+        _ = storage.catalog
+        seen = []
+        original = storage._catalog.events_from
+        storage._catalog.events_from = lambda p: seen.append(p) or original(p)
+        names = [e["name"] for e in storage.iter_events(active_on="2026-04-10")]
+        assert names == ["Later"]
+        assert seen == ["2026/04"]
+
+
+class TestCompaction:
+    @pytest.fixture
+    def populated(self, tmp_storage, sample_event):
+        expired_id = tmp_storage.save_event(sample_event)
+        covered = EventCandidate(
+            name="Covered",
+            start_date="2026-02-01",
+            venue="HAU",
+            category="theater",
+            description="D",
+        )
+        covered_id = tmp_storage.save_event(covered)
+        tmp_storage.save_article(
+            covered_id,
+            ArticleOutput(
+                title="Covered",
+                body="B",
+                event=covered,
+                language="en",
+                word_count=1,
+                model_used="test",
+                generated_at=datetime.now(),
+            ),
+        )
+        live_id = tmp_storage.save_event(
+            EventCandidate(
+                name="Live",
+                start_date="2026-05-01",
+                venue="V",
+                category="music",
+                description="D",
+            )
+        )
+        return tmp_storage, expired_id, covered_id, live_id
+
+    def test_archives_only_expired_uncovered(self, populated):
+        storage, expired_id, covered_id, live_id = populated
+        assert storage.compact_events(today="2026-04-01") == 1
+
+        assert not (storage.events_dir / f"{expired_id}.json").exists()
+        assert (storage.archive_dir / "2026-03.jsonl.gz").exists()
+        assert storage.get_event(expired_id) is None
+        assert storage.get_event(covered_id) is not None
+        assert storage.get_event(live_id) is not None
+        assert sorted(storage.get_all_event_names()) == ["Covered", "Live"]
+        assert [e["id"] for e in storage.iter_archived_events()] == [expired_id]
+        assert storage.compact_events(today="2026-04-01") == 0
+
+    def test_archive_still_dedups(self, populated, sample_event):
+        storage, expired_id, _, _ = populated
+        storage.compact_events(today="2026-04-01")
+
+        fresh = EventStorage(storage.data_dir)
+        assert fresh.event_exists(sample_event.name.upper())
+        assert fresh.find_existing_event("Other", "martin-gropius-bau", "2026-03-01")
+        assert fresh.save_event(sample_event) == expired_id
+        assert not any(fresh.events_dir.glob(f"{expired_id}.json"))
+
+        index = json.loads(fresh.index_path.read_text(encoding="utf-8"))
+        assert f"events/{expired_id}.json" not in index["files"]
+
+    def test_appends_to_existing_month(self, tmp_storage, sample_event):
+        tmp_storage.save_event(sample_event)
+        tmp_storage.compact_events(today="2026-04-01")
+        tmp_storage.save_event(
+            EventCandidate(
+                name="Second",
+                start_date="2026-03-20",
+                venue="V",
+                category="music",
+                description="D",
+            )
+        )
+        tmp_storage.compact_events(today="2026-04-01")
+        names = [e["name"] for e in tmp_storage.iter_archived_events()]
+        assert names == [sample_event.name, "Second"]
+
+    def test_rerun_after_crash_does_not_duplicate(
+        self, tmp_storage, sample_event, monkeypatch
+    ):
+        tmp_storage.save_event(sample_event)
+
+        def crash(*args, **kwargs):
+            raise OSError("crashed")
+
+        with monkeypatch.context() as m:
+            m.setattr(Path, "unlink", crash)
+            with pytest.raises(OSError):
+                tmp_storage.compact_events(today="2026-04-01")
+
+        fresh = EventStorage(tmp_storage.data_dir)
+        assert fresh.compact_events(today="2026-04-01") == 1
+        names = [e["name"] for e in fresh.iter_archived_events()]
+        assert names == [sample_event.name]
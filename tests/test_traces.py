@@ -0,0 +1,61 @@
+import random
+
+from traces import diff_text, pack_trace, patch_text, research_key, unpack_trace
+
+BODY = "First paragraph here.\n\nSecond  paragraph\twith tabs and nbsp.\n"
+
+
+class TestTextDiff:
+    def test_round_trip(self):
+        draft = "First paragraph.\n\nSecond  paragraph\twith more tabs.\n\nThird."
+        ops = diff_text(draft, BODY)
+        assert patch_text(ops, BODY) == draft
+        assert any(isinstance(op, list) for op in ops)
+
+    def test_identical_text_is_one_span(self):
+        assert diff_text(BODY, BODY) == [[0, 8]]
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        words = BODY.split(" ")
+        for _ in range(50):
+            edited = [w for w in words if rng.random() > 0.2]
+            edited.insert(rng.randint(0, len(edited)), "inserted\r\n")
+            text = " ".join(edited)
+            assert patch_text(diff_text(text, BODY), BODY) == text
+
+    def test_empty(self):
+        assert diff_text("", BODY) == []
+        assert patch_text([], BODY) == ""
+
+
+class TestPackTrace:
+    def test_round_trip(self):
+        trace = {
+            "draft_text": "First draft.",
+            "draft_word_count": 2,
+            "revised_text": BODY,
+            "research_context": {"artist_background": "A", "raw_sources": []},
+            "stages": [],
+        }
+        packed, research = pack_trace(trace, BODY)
+        assert "draft_text" not in packed
+        assert packed["research_ref"] == research_key(research)
+        assert unpack_trace(packed, BODY, research) == trace
+
+    def test_research_stages_stay_in_trace(self):
+        stages = [{"stage": "research:artist", "seconds": 1.0}]
+        trace = {"research_context": {"artist_background": "A", "stages": stages}}
+        packed, research = pack_trace(trace, BODY)
+        assert research == {"artist_background": "A"}
+        assert packed["research_stages"] == stages
+        assert unpack_trace(packed, BODY, research) == trace
+
+    def test_key_ignores_order(self):
+        assert research_key({"a": 1, "b": 2}) == research_key({"b": 2, "a": 1})
+
+    def test_missing_research(self):
+        trace = {"draft_text": "", "revised_text": "", "research_context": None}
+        packed, research = pack_trace(trace, BODY)
+        assert research is None
+        assert unpack_trace(packed, BODY, None) == trace
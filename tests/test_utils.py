@@ -1,7 +1,15 @@
+import asyncio
+
 import pytest
 from types import SimpleNamespace
 
-from utils import extract_tool_input
+from utils import (
+    close_anthropic_client,
+    create_message,
+    estimate_cost,
+    extract_tool_input,
+    get_anthropic_client,
+)
 
 
 def _make_response(tool_name, tool_input):
@@ -43,3 +51,51 @@ class TestExtractToolInput:
         resp = SimpleNamespace(content=[])
         with pytest.raises(RuntimeError):
             extract_tool_input(resp, "submit_events")
+
+
+class TestAnthropicClient:
+    def test_shared_until_closed(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+        client = get_anthropic_client()
+        assert get_anthropic_client() is client
+        asyncio.run(close_anthropic_client())
+        assert get_anthropic_client() is not client
+        asyncio.run(close_anthropic_client())
+
+
+class TestStageMetrics:
+    def test_estimate_cost(self, monkeypatch):
+        monkeypatch.setattr("config.MODEL_PRICES", {"m": (5.0, 25.0)})
+        assert estimate_cost("m", 1_000_000, 0) == 5.0
+        assert estimate_cost("m", 0, 1_000_000) == 25.0
+        assert estimate_cost("m", 0, 0, cache_read_tokens=1_000_000) == 0.5
+        assert estimate_cost("m", 0, 0, cache_write_tokens=1_000_000) == 6.25
+        assert estimate_cost("unknown", 1000, 1000) == 0.0
+
+    def test_create_message_records_usage_and_retries(self, monkeypatch):
+        monkeypatch.setattr("config.MODEL_PRICES", {"m": (5.0, 25.0)})
+        usage = SimpleNamespace(
+            input_tokens=100,
+            output_tokens=50,
+            cache_read_input_tokens=1000,
+            cache_creation_input_tokens=None,
+        )
+        message = SimpleNamespace(content=[], usage=usage)
+
+        async def create(**kwargs):
+            return SimpleNamespace(parse=lambda: message, retries_taken=2)
+
+        client = SimpleNamespace(
+            messages=SimpleNamespace(with_raw_response=SimpleNamespace(create=create))
+        )
+        result, metrics = asyncio.run(
+            create_message(client, "lede", model="m", max_tokens=10)
+        )
+        assert result is message
+        assert metrics.stage == "lede"
+        assert metrics.model == "m"
+        assert (metrics.input_tokens, metrics.output_tokens) == (100, 50)
+        assert metrics.cache_read_tokens == 1000
+        assert metrics.cache_write_tokens == 0
+        assert metrics.retries == 2
+        assert metrics.cost_usd == estimate_cost("m", 100, 50, 1000)
@@ -0,0 +1,74 @@
+import difflib
+import hashlib
+import json
+import re
+
+TRACE_FORMAT = 2
+
+# Explicit whitespace set so web/lib/db.ts splits text into the same tokens.
+_TOKEN = re.compile(r"[^ \t\r\n]+[ \t\r\n]*|[ \t\r\n]+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text)
+
+
+def diff_text(text: str, base: str) -> list:
+    base_tokens, tokens = _tokens(base), _tokens(text)
+    matcher = difflib.SequenceMatcher(None, base_tokens, tokens, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(tokens[j1:j2]))
+    return ops
+
+
+def patch_text(ops: list, base: str) -> str:
+    base_tokens = _tokens(base)
+    return "".join(
+        op if isinstance(op, str) else "".join(base_tokens[op[0] : op[1]]) for op in ops
+    )
+
+
+def research_key(context: dict) -> str:
+    encoded = json.dumps(context, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def pack_trace(trace: dict, body: str) -> tuple[dict, dict | None]:
+    packed = {"format": TRACE_FORMAT}
+    research = None
+    for key, value in trace.items():
+        if key in ("draft_text", "revised_text"):
+            packed[key.replace("_text", "_diff")] = diff_text(value or "", body)
+        elif key == "research_context" and value:
+            # Stage timings belong to the run that did the research, so they
+            # stay in the trace and the shared blob holds only the content.
+            research = {k: v for k, v in value.items() if k != "stages"}
+            packed["research_ref"] = research_key(research)
+            if "stages" in value:
+                packed["research_stages"] = value["stages"]
+        else:
+            packed[key] = value
+    return packed, research
+
+
+def unpack_trace(packed: dict, body: str, research: dict | None) -> dict:
+    trace = {}
+    for key, value in packed.items():
+        if key in ("draft_diff", "revised_diff"):
+            trace[key.replace("_diff", "_text")] = patch_text(value, body)
+        elif key == "research_ref":
+            trace["research_context"] = research
+            if research is not None and "research_stages" in packed:
+                trace["research_context"] = {
+                    **research,
+                    "stages": packed["research_stages"],
+                }
+        elif key == "research_stages":
+            continue
+        elif key != "format":
+            trace[key] = value
+    return trace
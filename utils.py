@@ -1,3 +1,167 @@
+import inspect
+import logging
+import time
+from collections.abc import Callable
+
+import anthropic
+
+import config
+from models import StageMetrics
+
+logger = logging.getLogger(__name__)
+
+STREAM_PROGRESS_CHARS = 2000
+
+_anthropic_client: anthropic.AsyncAnthropic | None = None
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = anthropic.AsyncAnthropic(max_retries=3)
+    return _anthropic_client
+
+
+async def close_anthropic_client():
+    global _anthropic_client
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+        _anthropic_client = None
+
+
+def cached_text(text: str) -> dict:
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    input_price, output_price = config.MODEL_PRICES.get(model, (0.0, 0.0))
+    cost = (
+        input_tokens * input_price
+        + cache_write_tokens * input_price * 1.25
+        + cache_read_tokens * input_price * 0.1
+        + output_tokens * output_price
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+def _stage_metrics(
+    stage: str,
+    model: str,
+    message,
+    started: float,
+    first_token: float | None,
+    retries: int,
+) -> StageMetrics:
+    finished = time.monotonic()
+    usage = getattr(message, "usage", None)
+    input_tokens = getattr(usage, "input_tokens", 0) or 0
+    output_tokens = getattr(usage, "output_tokens", 0) or 0
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    generating = finished - (first_token or started)
+    metrics = StageMetrics(
+        stage=stage,
+        model=model,
+        seconds=round(finished - started, 3),
+        time_to_first_token=(
+            round(first_token - started, 3) if first_token is not None else None
+        ),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        tokens_per_second=(
+            round(output_tokens / generating, 1) if generating > 0 else 0.0
+        ),
+        retries=retries,
+        cost_usd=estimate_cost(
+            model, input_tokens, output_tokens, cache_read, cache_write
+        ),
+    )
+    logger.info(
+        "%s: %d in / %d out tokens in %.1fs (first token %.2fs, %.1f tok/s, $%.4f)",
+        stage,
+        input_tokens + cache_read + cache_write,
+        output_tokens,
+        metrics.seconds,
+        metrics.time_to_first_token or 0.0,
+        metrics.tokens_per_second,
+        metrics.cost_usd,
+    )
+    return metrics
+
+
+def _retries_taken(http_response) -> int:
+    try:
+        return int(http_response.request.headers.get("x-stainless-retry-count", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+async def create_message(
+    client: anthropic.AsyncAnthropic, stage: str, **kwargs
+) -> tuple[anthropic.types.Message, StageMetrics]:
+    started = time.monotonic()
+    raw = await client.messages.with_raw_response.create(**kwargs)
+    # parse() is synchronous on the locked SDK and a coroutine from 1.0 on.
+    message = raw.parse()
+    if inspect.isawaitable(message):
+        message = await message
+    metrics = _stage_metrics(
+        stage, kwargs.get("model", ""), message, started, None, raw.retries_taken
+    )
+    return message, metrics
+
+
+async def stream_message(
+    client: anthropic.AsyncAnthropic,
+    stage: str,
+    on_delta: Callable[[str], None] | None = None,
+    on_first_token: Callable[[], None] | None = None,
+    **kwargs,
+) -> tuple[anthropic.types.Message, StageMetrics]:
+    started = time.monotonic()
+    first_token = None
+    received = 0
+    next_progress = STREAM_PROGRESS_CHARS
+
+    async with client.messages.stream(**kwargs) as stream:
+        async for event in stream:
+            if event.type != "content_block_delta":
+                continue
+            if first_token is None:
+                first_token = time.monotonic()
+                if on_first_token is not None:
+                    on_first_token()
+            chunk = getattr(event.delta, "text", None) or getattr(
+                event.delta, "partial_json", ""
+            )
+            received += len(chunk)
+            if received >= next_progress:
+                logger.debug(
+                    "%s: %d chars after %.1fs",
+                    stage,
+                    received,
+                    time.monotonic() - started,
+                )
+                next_progress += STREAM_PROGRESS_CHARS
+            if on_delta is not None and chunk:
+                on_delta(chunk)
+        message = await stream.get_final_message()
+        retries = _retries_taken(getattr(stream, "response", None))
+
+    metrics = _stage_metrics(
+        stage, kwargs.get("model", ""), message, started, first_token, retries
+    )
+    return message, metrics
+
+
 def extract_tool_input(response, tool_name: str) -> dict:
     for block in response.content:
         if block.type == "tool_use" and block.name == tool_name:
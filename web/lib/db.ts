@@ -1,19 +1,43 @@
 import fs from "fs";
 import path from "path";
+import { gunzipSync } from "zlib";
 import type { ArticleWithEvent, PipelineTrace, Reflection } from "./types";
 import type { Lang } from "./i18n";
 
 const DATA_DIR = path.resolve(process.cwd(), "../data");
 
-function readAllArticleFiles(): ArticleWithEvent[] {
-  const articlesDir = path.join(DATA_DIR, "articles");
-  if (!fs.existsSync(articlesDir)) return [];
+// Articles live either flat in data/articles/ or in data/articles/YYYY/MM/ partitions.
+function walkArticles(dir: string, result: Map<string, string>): void {
+  if (!fs.existsSync(dir)) return;
+
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const fullPath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      walkArticles(fullPath, result);
+    } else if (entry.name.endsWith(".json") && !entry.name.endsWith(".trace.json")) {
+      result.set(entry.name.replace(/\.json$/, ""), fullPath);
+    }
+  }
+}
 
-  const files = fs.readdirSync(articlesDir).filter((f) => f.endsWith(".json") && !f.endsWith(".trace.json"));
+// Walked once per process so a static build does not re-read the tree for
+// every page; the dev server walks again so new articles show up.
+let articlePaths: Map<string, string> | null = null;
+
+function listArticlePaths(): Map<string, string> {
+  if (articlePaths === null || process.env.NODE_ENV === "development") {
+    const result = new Map<string, string>();
+    walkArticles(path.join(DATA_DIR, "articles"), result);
+    articlePaths = result;
+  }
+  return articlePaths;
+}
+
+function readAllArticleFiles(): ArticleWithEvent[] {
   const articles: ArticleWithEvent[] = [];
 
-  for (const file of files) {
-    const raw = fs.readFileSync(path.join(articlesDir, file), "utf-8");
+  for (const filePath of listArticlePaths().values()) {
+    const raw = fs.readFileSync(filePath, "utf-8");
     const data = JSON.parse(raw);
     articles.push({
       id: data.id,
@@ -54,8 +78,8 @@ export function getAllArticlesWithEvents(): ArticleWithEvent[] {
 }
 
 export function getArticleBySlug(slug: string): ArticleWithEvent | null {
-  const filePath = path.join(DATA_DIR, "articles", `${slug}.json`);
-  if (!fs.existsSync(filePath)) return null;
+  const filePath = listArticlePaths().get(slug);
+  if (!filePath) return null;
 
   const raw = fs.readFileSync(filePath, "utf-8");
   const data = JSON.parse(raw);
@@ -99,22 +123,40 @@ export function getAlternateSlugs(eventId: string): Record<string, string> {
 }
 
 export function getAllArticleSlugs(): string[] {
-  const articlesDir = path.join(DATA_DIR, "articles");
-  if (!fs.existsSync(articlesDir)) return [];
+  return [...listArticlePaths().keys()];
+}
 
-  return fs
-    .readdirSync(articlesDir)
-    .filter((f) => f.endsWith(".json") && !f.endsWith(".trace.json"))
-    .map((f) => f.replace(/\.json$/, ""));
+// Traces written since format 2 store draft and revised text as diffs against
+// the article body, optionally gzipped. Tokens must match traces.py.
+const TRACE_TOKEN = /[^ \t\r\n]+[ \t\r\n]*|[ \t\r\n]+/g;
+
+function patchText(ops: (string | [number, number])[], base: string): string {
+  const tokens = base.match(TRACE_TOKEN) ?? [];
+  return ops.map((op) => (typeof op === "string" ? op : tokens.slice(op[0], op[1]).join(""))).join("");
 }
 
-export function getTraceBySlug(slug: string): PipelineTrace | null {
-  const tracePath = path.join(DATA_DIR, "articles", `${slug}.trace.json`);
-  if (!fs.existsSync(tracePath)) return null;
+function readTraceFile(articlePath: string, slug: string): string | null {
+  const dir = path.dirname(articlePath);
+  const packed = path.join(dir, `${slug}.trace.json.gz`);
+  if (fs.existsSync(packed)) return gunzipSync(fs.readFileSync(packed)).toString("utf-8");
+  const plain = path.join(dir, `${slug}.trace.json`);
+  if (fs.existsSync(plain)) return fs.readFileSync(plain, "utf-8");
+  return null;
+}
 
-  const raw = fs.readFileSync(tracePath, "utf-8");
+export function getTraceBySlug(slug: string): PipelineTrace | null {
+  const articlePath = listArticlePaths().get(slug);
+  if (!articlePath) return null;
+  const raw = readTraceFile(articlePath, slug);
+  if (raw === null) return null;
   const data = JSON.parse(raw);
 
+  if (data.format === 2) {
+    const body: string = JSON.parse(fs.readFileSync(articlePath, "utf-8")).body ?? "";
+    data.draft_text = patchText(data.draft_diff ?? [], body);
+    data.revised_text = patchText(data.revised_diff ?? [], body);
+  }
+
   return {
     draft_text: data.draft_text ?? "",
     draft_word_count: data.draft_word_count ?? 0,
@@ -36,6 +36,32 @@ export interface CritiqueIssue {
   fix: string;
 }
 
+export interface StageMetrics {
+  stage: string;
+  model: string;
+  seconds: number;
+  time_to_first_token: number | null;
+  input_tokens: number;
+  output_tokens: number;
+  cache_read_tokens: number;
+  cache_write_tokens: number;
+  tokens_per_second: number;
+  retries: number;
+  cached: boolean;
+  cost_usd: number;
+}
+
+export interface StageTotals {
+  count: number;
+  seconds: number;
+  avg_seconds: number;
+  input_tokens: number;
+  output_tokens: number;
+  cache_read_tokens: number;
+  retries: number;
+  cost_usd: number;
+}
+
 export interface PipelineTrace {
   draft_text: string;
   draft_word_count: number;
@@ -45,6 +71,9 @@ export interface PipelineTrace {
   revision_changed: boolean;
   research_sources_count: number;
   expanded: boolean;
+  cache_read_tokens?: number;
+  cache_write_tokens?: number;
+  stages?: StageMetrics[];
 }
 
 export interface Reflection {
@@ -82,6 +111,9 @@ export interface Reflection {
       avg_word_growth_pct: number;
       total_research_sources: number;
       articles_with_traces: number;
+      stages?: Record<string, StageTotals>;
+      total_seconds?: number;
+      total_cost_usd?: number;
     };
   };
   word_count: number | null;